@@ -1 +1 @@
-from app.api import auth, categories, products, customers, invoices, offers, enquiries, dashboard
+from app.api import auth, categories, products, customers, invoices, offers, enquiries, dashboard, analytics, reports
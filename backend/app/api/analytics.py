@@ -0,0 +1,144 @@
+"""
+Analytics API Routes
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Optional
+from datetime import date
+
+from app.core.database import get_db, get_read_db
+from app.core.security import get_current_user
+from app.models import (
+    User, Customer, Product,
+    RevenueRollup, CustomerRevenueRollup, ProductRevenueRollup
+)
+from app.services.analytics import PERIODS, bucket_start, rebuild_rollups
+from app.services.jobs import job_handler, enqueue, accepted
+
+router = APIRouter()
+
+def _period_range(model, period: str, start_date: Optional[date], end_date: Optional[date]):
+    """Build rollup filters for a period and an optional date range"""
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of: {', '.join(PERIODS)}")
+    filters = [model.period == period]
+    if start_date:
+        filters.append(model.bucket_start >= bucket_start(start_date, period))
+    if end_date:
+        filters.append(model.bucket_start <= end_date)
+    return filters
+
+@router.get("/revenue")
+async def get_revenue(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Get revenue and invoice counts bucketed by day, week or month"""
+    filters = _period_range(RevenueRollup, period, start_date, end_date)
+    rows = db.query(RevenueRollup).filter(*filters).order_by(RevenueRollup.bucket_start).all()
+
+    return [
+        {
+            "bucket_start": row.bucket_start.isoformat(),
+            "invoice_count": row.invoice_count,
+            "billed_amount": float(row.billed_amount),
+            "paid_count": row.paid_count,
+            "revenue": float(row.revenue)
+        }
+        for row in rows
+    ]
+
+@router.get("/top-customers")
+async def get_top_customers(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10
+):
+    """Get customers ranked by paid revenue"""
+    filters = _period_range(CustomerRevenueRollup, period, start_date, end_date)
+    revenue = func.sum(CustomerRevenueRollup.revenue).label("revenue")
+    rows = db.query(
+        CustomerRevenueRollup.customer_id,
+        Customer.contact_person,
+        Customer.company_name,
+        func.sum(CustomerRevenueRollup.invoice_count),
+        revenue
+    ).outerjoin(
+        Customer, Customer.id == CustomerRevenueRollup.customer_id
+    ).filter(*filters).group_by(
+        CustomerRevenueRollup.customer_id, Customer.contact_person, Customer.company_name
+    ).order_by(revenue.desc()).limit(limit).all()
+
+    return [
+        {
+            "customer_id": str(customer_id),
+            "customer_name": contact_person,
+            "company_name": company_name,
+            "invoice_count": int(invoice_count or 0),
+            "revenue": float(total or 0)
+        }
+        for customer_id, contact_person, company_name, invoice_count, total in rows
+    ]
+
+@router.get("/top-products")
+async def get_top_products(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10
+):
+    """Get products ranked by paid revenue"""
+    filters = _period_range(ProductRevenueRollup, period, start_date, end_date)
+    revenue = func.sum(ProductRevenueRollup.revenue).label("revenue")
+    rows = db.query(
+        ProductRevenueRollup.product_id,
+        Product.name,
+        func.sum(ProductRevenueRollup.quantity),
+        revenue
+    ).outerjoin(
+        Product, Product.id == ProductRevenueRollup.product_id
+    ).filter(*filters).group_by(
+        ProductRevenueRollup.product_id, Product.name
+    ).order_by(revenue.desc()).limit(limit).all()
+
+    return [
+        {
+            "product_id": str(product_id),
+            "product_name": name,
+            "quantity": float(quantity or 0),
+            "revenue": float(total or 0)
+        }
+        for product_id, name, quantity, total in rows
+    ]
+
+@job_handler("analytics_rebuild")
+def rebuild_analytics_job(job) -> dict:
+    """Background job: recompute all rollups"""
+    counts = rebuild_rollups(job.db)
+    job.db.commit()
+    return counts
+
+@router.post("/rebuild")
+async def rebuild_analytics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    background: bool = False
+):
+    """Recompute all rollups from invoices, or queue it with background=true (admin only)"""
+    if background:
+        job = enqueue(db, "analytics_rebuild", user_id=current_user.id)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted(job))
+    counts = rebuild_rollups(db)
+    db.commit()
+    return {"message": "Analytics rollups rebuilt", **counts}
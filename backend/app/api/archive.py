@@ -0,0 +1,73 @@
+"""
+Archive API Routes
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import date
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models import User, Invoice, Enquiry, InvoiceArchive, EnquiryArchive
+from app.services.archival import months_before, pending_counts, archive_old_records
+from app.services.jobs import job_handler, enqueue, accepted
+
+router = APIRouter()
+
+@job_handler("archive_records")
+def archive_records_job(job) -> dict:
+    """Background job: move old paid invoices and closed enquiries to the archive"""
+    months = job.payload.get("months", settings.ARCHIVE_AFTER_MONTHS)
+    pending = pending_counts(job.db, months_before(date.today(), months))
+    total = max(1, pending["invoices"] + pending["enquiries"])
+    moved = {"invoices": 0, "enquiries": 0}
+
+    def on_batch(table, count):
+        moved[table] = count
+        job.progress(
+            100 * (moved["invoices"] + moved["enquiries"]) // total,
+            f"Archived {moved['invoices']} invoices, {moved['enquiries']} enquiries"
+        )
+
+    return archive_old_records(job.db, months, settings.ARCHIVE_BATCH_SIZE, on_batch)
+
+@router.get("/stats")
+async def get_archive_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    months: Optional[int] = None
+):
+    """Live, soft-deleted, archived and archivable row counts (admin only)"""
+    months = months or settings.ARCHIVE_AFTER_MONTHS
+    cutoff = months_before(date.today(), months)
+
+    def counts(model, archive):
+        return {
+            "live": db.query(func.count(model.id)).filter(model.deleted_at.is_(None)).scalar(),
+            "deleted": db.query(func.count(model.id)).filter(model.deleted_at.isnot(None)).scalar(),
+            "archived": db.query(func.count(archive.id)).scalar(),
+        }
+
+    pending = pending_counts(db, cutoff)
+    return {
+        "cutoff": cutoff.isoformat(),
+        "invoices": {**counts(Invoice, InvoiceArchive), "archivable": pending["invoices"]},
+        "enquiries": {**counts(Enquiry, EnquiryArchive), "archivable": pending["enquiries"]},
+    }
+
+@router.post("/run")
+async def run_archive(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    months: Optional[int] = None
+):
+    """Queue a job that archives records older than `months` (admin only)"""
+    months = months or settings.ARCHIVE_AFTER_MONTHS
+    if months < 1:
+        raise HTTPException(status_code=400, detail="months must be at least 1")
+    job = enqueue(db, "archive_records", {"months": months}, user_id=current_user.id)
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted(job))
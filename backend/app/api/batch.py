@@ -0,0 +1,113 @@
+"""
+Batch API Routes
+
+Lets the admin SPA fetch several GET endpoints in one round-trip. The
+caller is authenticated once; each sub-request is then dispatched
+in-process (no HTTP) through the whole app with that user attached, so
+metrics, query tracing, read-your-writes and the response cache see it as
+they would a direct call. All sub-requests run concurrently.
+"""
+
+import asyncio
+import json
+import logging
+from urllib.parse import urlencode, urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.core.config import settings
+from app.core.security import get_current_user, BATCH_USER_SCOPE_KEY
+from app.models import User
+from app.schemas import BatchRequest, BatchSubRequest
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Connection-level scope keys a sub-request inherits from the batch request
+INHERITED_SCOPE_KEYS = (
+    "type", "asgi", "http_version", "scheme", "server", "client", "root_path", "state", "extensions",
+)
+DROPPED_HEADERS = {b"content-length", b"content-type"}
+# Long-lived or recursive endpoints that never make sense inside a batch
+UNBATCHABLE_PATHS = ("/api/batch", "/api/dashboard/stream")
+
+def _sub_scope(request: Request, path: str, query: str, user: User) -> dict:
+    scope = {key: request.scope[key] for key in INHERITED_SCOPE_KEYS if key in request.scope}
+    scope.update({
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(name, value) for name, value in request.scope["headers"] if name not in DROPPED_HEADERS],
+        BATCH_USER_SCOPE_KEY: user,
+    })
+    return scope
+
+async def _call_app(request: Request, path: str, query: str, user: User) -> dict:
+    """Send one GET through the app and its middleware, following a trailing-slash redirect once"""
+    for _ in range(2):
+        response = {"status": 500, "headers": [], "body": []}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await request.app(_sub_scope(request, path, query, user), receive, send)
+        location = dict(response["headers"]).get(b"location")
+        if response["status"] not in (307, 308) or not location:
+            return response
+        path = urlsplit(location.decode()).path
+    return response
+
+async def _dispatch(request: Request, sub: BatchSubRequest, user: User) -> dict:
+    """Validate one sub-request, run it and shape its result"""
+    path = sub.path.partition("?")[0]
+    if sub.method.upper() != "GET":
+        return {"id": sub.id, "status": 405, "body": {"detail": "Only GET requests can be batched"}}
+    if not path.startswith("/api/") or path.startswith(UNBATCHABLE_PATHS):
+        return {"id": sub.id, "status": 400, "body": {"detail": "Path cannot be batched"}}
+
+    query = sub.path.partition("?")[2]
+    if sub.params:
+        query = "&".join(part for part in (query, urlencode(sub.params, doseq=True)) if part)
+
+    try:
+        response = await asyncio.wait_for(
+            _call_app(request, path, query, user),
+            settings.BATCH_REQUEST_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        return {"id": sub.id, "status": 504, "body": {"detail": "Sub-request timed out"}}
+    except Exception:
+        logger.exception("Batch sub-request GET %s failed", path)
+        return {"id": sub.id, "status": 500, "body": {"detail": "Internal server error"}}
+
+    content_type = dict(response["headers"]).get(b"content-type", b"")
+    body = b"".join(response["body"])
+    if not content_type.startswith(b"application/json"):
+        return {"id": sub.id, "status": response["status"], "body": body.decode(errors="replace") or None}
+    return {"id": sub.id, "status": response["status"], "body": json.loads(body) if body else None}
+
+@router.post("/")
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Run several GET requests in one call; responses come back in request order"""
+    if not batch.requests:
+        return {"responses": []}
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} requests per batch"
+        )
+    responses = await asyncio.gather(*(_dispatch(request, sub, current_user) for sub in batch.requests))
+    return {"responses": list(responses)}
@@ -0,0 +1,69 @@
+"""
+Business Settings API Routes
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models import Setting, User
+from app.schemas import SettingUpdate, SettingResponse
+from app.services.business_settings import business_settings, bump_version, DEFAULTS, PUBLIC_KEYS, VERSION_KEY
+
+router = APIRouter()
+
+def _save(db: Session, values: Dict[str, Optional[str]]) -> List[Setting]:
+    """Upsert values and bump the version in one transaction"""
+    if VERSION_KEY in values:
+        raise HTTPException(status_code=400, detail=f"{VERSION_KEY} is managed automatically")
+    rows = {row.key: row for row in db.query(Setting).filter(Setting.key.in_(values)).all()}
+    for key, value in values.items():
+        if key not in rows:
+            rows[key] = Setting(key=key, description=DEFAULTS.get(key, (None, None))[1])
+            db.add(rows[key])
+        rows[key].value = value
+    bump_version(db)
+    db.commit()
+    business_settings.invalidate()
+    for row in rows.values():
+        db.refresh(row)
+    return list(rows.values())
+
+@router.get("/public")
+async def get_public_settings():
+    """Business details for the storefront, served from the in-memory snapshot (public)
+
+    Only PUBLIC_KEYS are returned, so new or internal settings are never
+    exposed by accident.
+    """
+    snapshot = business_settings.get()
+    return {key: snapshot[key] for key in PUBLIC_KEYS}
+
+@router.get("/", response_model=List[SettingResponse])
+async def get_settings(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all settings rows (admin only)"""
+    return db.query(Setting).filter(Setting.key != VERSION_KEY).order_by(Setting.key).all()
+
+@router.put("/", response_model=List[SettingResponse])
+async def update_settings(
+    values: Dict[str, Optional[str]],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update several settings at once, e.g. {"invoice_prefix": "NMS"} (admin only)"""
+    return _save(db, values)
+
+@router.put("/{key}", response_model=SettingResponse)
+async def update_setting(
+    key: str,
+    setting_data: SettingUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update a single setting (admin only)"""
+    return _save(db, {key: setting_data.value})[0]
@@ -7,36 +7,45 @@ from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
 from app.models import Category, User
 from app.schemas import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.services.catalogue_snapshot import catalogue_snapshot
 
 router = APIRouter()
 
+def list_categories(db: Session, active_only: bool = False) -> list:
+    query = db.query(Category)
+    if active_only:
+        query = query.filter(Category.is_active == True)
+    return query.order_by(Category.display_order).all()
+
 @router.get("/", response_model=List[CategoryResponse])
 async def get_categories(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     active_only: bool = False
 ):
     """Get all categories (public)"""
-    query = db.query(Category)
-    if active_only:
-        query = query.filter(Category.is_active == True)
-    categories = query.order_by(Category.display_order).all()
-    return categories
+    return list_categories(db, active_only)
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-async def get_category(category_id: UUID, db: Session = Depends(get_db)):
+async def get_category(category_id: UUID, db: Session = Depends(get_read_db)):
     """Get category by ID (public)"""
+    category = await catalogue_snapshot.find("categories", id=category_id)
+    if category is not None:
+        return category
     category = db.query(Category).filter(Category.id == category_id).first()
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
 
 @router.get("/slug/{slug}", response_model=CategoryResponse)
-async def get_category_by_slug(slug: str, db: Session = Depends(get_db)):
+async def get_category_by_slug(slug: str, db: Session = Depends(get_read_db)):
     """Get category by slug (public)"""
+    category = await catalogue_snapshot.find("categories", slug=slug)
+    if category is not None:
+        return category
     category = db.query(Category).filter(Category.slug == slug).first()
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -2,30 +2,114 @@
 Customers API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import List, Optional
 from uuid import UUID
+from datetime import date, datetime, timezone
 
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models import Customer, User
+from app.models import Customer, Invoice, InvoiceArchive, User
 from app.schemas import CustomerCreate, CustomerUpdate, CustomerResponse
+from app.core.metrics import PDF_RENDER
+from app.services.pdf_worker import pdf_workers
+from app.services.jobs import job_handler, JobFailed, enqueue, accepted
 
 router = APIRouter()
 
+# Statuses that appear on a customer statement; drafts and cancelled invoices are not billed
+STATEMENT_STATUSES = ("pending", "paid")
+
+def build_customer_statement(db: Session, customer: Customer, start: Optional[date], end: Optional[date]) -> dict:
+    """Build a customer ledger with opening balance and running balance.
+
+    Each invoice is a debit; paid invoices are settled by an equal credit.
+    Archived (paid) invoices are included so history stays complete.
+    """
+    opening_balance = 0.0
+    if start:
+        opening_balance = float(db.query(func.coalesce(func.sum(Invoice.total_amount), 0)).filter(
+            Invoice.customer_id == customer.id,
+            Invoice.invoice_date < start,
+            Invoice.status == "pending",
+            Invoice.deleted_at.is_(None)
+        ).scalar())
+
+    def statement_rows(model):
+        query = db.query(
+            model.id,
+            model.invoice_number,
+            model.invoice_date,
+            model.due_date,
+            model.status,
+            model.total_amount
+        ).filter(
+            model.customer_id == customer.id,
+            model.status.in_(STATEMENT_STATUSES),
+            model.deleted_at.is_(None)
+        )
+        if start:
+            query = query.filter(model.invoice_date >= start)
+        if end:
+            query = query.filter(model.invoice_date <= end)
+        return query.all()
+
+    rows = statement_rows(Invoice) + statement_rows(InvoiceArchive)
+    rows.sort(key=lambda row: (row.invoice_date, row.invoice_number))
+
+    balance = opening_balance
+    total_debit = 0.0
+    total_credit = 0.0
+    lines = []
+    for row in rows:
+        debit = float(row.total_amount or 0)
+        credit = debit if row.status == "paid" else 0.0
+        balance += debit - credit
+        total_debit += debit
+        total_credit += credit
+        lines.append({
+            "invoice_id": str(row.id),
+            "invoice_number": row.invoice_number,
+            "invoice_date": row.invoice_date.isoformat(),
+            "due_date": row.due_date.isoformat() if row.due_date else None,
+            "status": row.status,
+            "debit": debit,
+            "credit": credit,
+            "balance": round(balance, 2)
+        })
+
+    return {
+        "customer_id": str(customer.id),
+        "customer_name": customer.contact_person,
+        "company_name": customer.company_name,
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None,
+        "opening_balance": round(opening_balance, 2),
+        "total_debit": round(total_debit, 2),
+        "total_credit": round(total_credit, 2),
+        "closing_balance": round(balance, 2),
+        "lines": lines
+    }
+
 @router.get("/", response_model=List[CustomerResponse])
 async def get_customers(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     active_only: bool = False,
+    include_archived: bool = False,
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 100
 ):
-    """Get all customers (admin only)"""
+    """Get all customers (admin only); include_archived adds deleted customers"""
     query = db.query(Customer)
     
+    if not include_archived:
+        query = query.filter(Customer.deleted_at.is_(None))
+    
     if active_only:
         query = query.filter(Customer.is_active == True)
     
@@ -45,14 +129,80 @@ async def get_customers(
 async def get_customer(
     customer_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    include_archived: bool = False
 ):
     """Get customer by ID (admin only)"""
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    query = db.query(Customer).filter(Customer.id == customer_id)
+    if not include_archived:
+        query = query.filter(Customer.deleted_at.is_(None))
+    customer = query.first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
 
+@job_handler("statement_pdf")
+def render_statement_pdf_job(job) -> dict:
+    """Background job: render a customer statement PDF and keep it for download"""
+    customer = job.db.query(Customer).filter(
+        Customer.id == UUID(job.payload["customer_id"]),
+        Customer.deleted_at.is_(None)
+    ).first()
+    if not customer:
+        raise JobFailed("Customer not found")
+    start = date.fromisoformat(job.payload["from"]) if job.payload.get("from") else None
+    end = date.fromisoformat(job.payload["to"]) if job.payload.get("to") else None
+    statement = build_customer_statement(job.db, customer, start, end)
+    from app.services.pdf_generator import generate_statement_pdf
+    with PDF_RENDER.time("statement"):
+        pdf_buffer = generate_statement_pdf(statement, customer)
+    job.attach(pdf_buffer.getvalue(), f"statement_{customer.id}.pdf", "application/pdf")
+    return {"customer_id": str(customer.id), "closing_balance": statement["closing_balance"]}
+
+@router.get("/{customer_id}/statement")
+async def get_customer_statement(
+    customer_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    format: str = "json",
+    background: bool = False
+):
+    """Get customer account statement, optionally as PDF; background=true queues the PDF (admin only)"""
+    if format not in ("json", "pdf"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'pdf'")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    customer = db.query(Customer).filter(Customer.id == customer_id, Customer.deleted_at.is_(None)).first()
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+
+    if format == "pdf" and background:
+        payload = {
+            "customer_id": str(customer.id),
+            "from": start.isoformat() if start else None,
+            "to": end.isoformat() if end else None,
+        }
+        job = enqueue(db, "statement_pdf", payload, user_id=current_user.id)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted(job))
+
+    statement = build_customer_statement(db, customer, start, end)
+
+    if format == "pdf":
+        from app.services.pdf_generator import generate_statement_pdf
+        pdf_buffer = await pdf_workers.render("statement", generate_statement_pdf, statement, customer)
+        return Response(
+            content=pdf_buffer.getvalue(),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename=statement_{customer.id}.pdf"
+            }
+        )
+
+    return statement
+
 @router.post("/", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
 async def create_customer(
     customer_data: CustomerCreate,
@@ -74,7 +224,7 @@ async def update_customer(
     current_user: User = Depends(get_current_user)
 ):
     """Update a customer (admin only)"""
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    customer = db.query(Customer).filter(Customer.id == customer_id, Customer.deleted_at.is_(None)).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
@@ -92,11 +242,11 @@ async def delete_customer(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a customer (admin only)"""
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    """Delete a customer (admin only); the row is kept with deleted_at set"""
+    customer = db.query(Customer).filter(Customer.id == customer_id, Customer.deleted_at.is_(None)).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    db.delete(customer)
+    customer.deleted_at = datetime.now(timezone.utc)
     db.commit()
     return {"message": "Customer deleted successfully"}
@@ -2,105 +2,93 @@
 Dashboard API Routes
 """
 
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models import User, Product, Customer, Invoice, Enquiry, Offer
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.security import get_current_user, get_stream_user
+from app.models import User
+from app.services.dashboard_feed import dashboard_feed, dashboard_stats, recent_invoices, recent_enquiries
+from app.services.events import event_bus, RESYNC
 
 router = APIRouter()
 
+def sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get dashboard statistics"""
-    total_products = db.query(func.count(Product.id)).scalar()
-    active_products = db.query(func.count(Product.id)).filter(Product.is_active == True).scalar()
-    
-    total_customers = db.query(func.count(Customer.id)).scalar()
-    active_customers = db.query(func.count(Customer.id)).filter(Customer.is_active == True).scalar()
-    
-    total_invoices = db.query(func.count(Invoice.id)).scalar()
-    pending_invoices = db.query(func.count(Invoice.id)).filter(Invoice.status == "pending").scalar()
-    paid_invoices = db.query(func.count(Invoice.id)).filter(Invoice.status == "paid").scalar()
-    
-    total_revenue = db.query(func.sum(Invoice.total_amount)).filter(Invoice.status == "paid").scalar() or 0
-    
-    new_enquiries = db.query(func.count(Enquiry.id)).filter(Enquiry.status == "new").scalar()
-    total_enquiries = db.query(func.count(Enquiry.id)).scalar()
-    
-    active_offers = db.query(func.count(Offer.id)).filter(Offer.is_active == True).scalar()
-    
-    return {
-        "products": {
-            "total": total_products,
-            "active": active_products
-        },
-        "customers": {
-            "total": total_customers,
-            "active": active_customers
-        },
-        "invoices": {
-            "total": total_invoices,
-            "pending": pending_invoices,
-            "paid": paid_invoices,
-            "total_revenue": float(total_revenue)
-        },
-        "enquiries": {
-            "total": total_enquiries,
-            "new": new_enquiries
-        },
-        "offers": {
-            "active": active_offers
-        }
-    }
+    return dashboard_stats(db)
 
 @router.get("/recent-invoices")
 async def get_recent_invoices(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     limit: int = 5
 ):
     """Get recent invoices"""
-    invoices = db.query(Invoice).order_by(Invoice.created_at.desc()).limit(limit).all()
-    
-    result = []
-    for invoice in invoices:
-        customer_name = None
-        if invoice.customer:
-            customer_name = invoice.customer.contact_person
-        result.append({
-            "id": str(invoice.id),
-            "invoice_number": invoice.invoice_number,
-            "customer_name": customer_name,
-            "total_amount": float(invoice.total_amount),
-            "status": invoice.status,
-            "invoice_date": invoice.invoice_date.isoformat()
-        })
-    
-    return result
+    return recent_invoices(db, limit)
 
 @router.get("/recent-enquiries")
 async def get_recent_enquiries(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     limit: int = 5
 ):
     """Get recent enquiries"""
-    enquiries = db.query(Enquiry).order_by(Enquiry.created_at.desc()).limit(limit).all()
-    
-    return [
-        {
-            "id": str(e.id),
-            "name": e.name,
-            "phone": e.phone,
-            "subject": e.subject,
-            "status": e.status,
-            "created_at": e.created_at.isoformat()
-        }
-        for e in enquiries
-    ]
+    return recent_enquiries(db, limit)
+
+@router.get("/stream")
+async def dashboard_stream(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_stream_user)
+):
+    """Server-sent events for the admin dashboard
+
+    Starts with a "snapshot" event (stats, recent invoices and enquiries),
+    then pushes invoice.created / invoice.updated / invoice.deleted,
+    enquiry.created / enquiry.updated / enquiry.deleted and refreshed
+    "stats" events. Browsers pass the token as ?access_token=.
+
+    event_bus is in-process: a stream only hears about writes handled by
+    the same worker. With several workers, writes made elsewhere show up
+    in the next "stats" event this worker sends, or on reconnect.
+    """
+    # The stream outlives the request's session; give its connection back now
+    db.close()
+    queue = event_bus.subscribe()
+
+    async def events():
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n"
+            yield sse("snapshot", await dashboard_feed.snapshot())
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                if event == RESYNC:
+                    event, data = "snapshot", await dashboard_feed.snapshot()
+                yield sse(event, data)
+        finally:
+            event_bus.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
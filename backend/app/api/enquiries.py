@@ -2,58 +2,132 @@
 Enquiries API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+import asyncio
+import math
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models import Enquiry, User
+from app.models import Enquiry, EnquiryArchive, User
 from app.schemas import EnquiryCreate, EnquiryUpdate, EnquiryResponse
+from app.services.enquiry_intake import enquiry_intake, insert_enquiries
+from app.services.archival import merge_newest
+from app.services.dashboard_feed import enquiry_summary
+from app.services.events import event_bus
 
 router = APIRouter()
 
+def get_client_ip(request: Request) -> str:
+    """Client address as seen by the outermost of TRUSTED_PROXY_COUNT proxies.
+
+    Each trusted proxy appends the address it received the request from to
+    X-Forwarded-For, so the entry that many hops from the right is the one
+    the client cannot forge; anything further left is client-supplied.
+    """
+    peer = request.client.host if request.client else "unknown"
+    hops = settings.TRUSTED_PROXY_COUNT
+    if hops <= 0:
+        return peer
+    forwarded = [part.strip() for part in ",".join(request.headers.getlist("x-forwarded-for")).split(",") if part.strip()]
+    if len(forwarded) < hops:
+        return peer
+    return forwarded[-hops]
+
 @router.get("/", response_model=List[EnquiryResponse])
 async def get_enquiries(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     status_filter: Optional[str] = None,
+    include_archived: bool = False,
     skip: int = 0,
     limit: int = 100
 ):
-    """Get all enquiries (admin only)"""
-    query = db.query(Enquiry)
+    """Get all enquiries (admin only); include_archived adds deleted and archived enquiries"""
+    def filtered(model):
+        query = db.query(model)
+        if status_filter:
+            query = query.filter(model.status == status_filter)
+        return query.order_by(model.created_at.desc())
     
-    if status_filter:
-        query = query.filter(Enquiry.status == status_filter)
-    
-    enquiries = query.order_by(Enquiry.created_at.desc()).offset(skip).limit(limit).all()
-    return enquiries
+    if include_archived:
+        return merge_newest(
+            filtered(Enquiry).limit(skip + limit).all(),
+            filtered(EnquiryArchive).limit(skip + limit).all(),
+            skip, limit
+        )
+    return filtered(Enquiry).filter(Enquiry.deleted_at.is_(None)).offset(skip).limit(limit).all()
 
 @router.get("/{enquiry_id}", response_model=EnquiryResponse)
 async def get_enquiry(
     enquiry_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    include_archived: bool = False
 ):
     """Get enquiry by ID (admin only)"""
-    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id).first()
+    query = db.query(Enquiry).filter(Enquiry.id == enquiry_id)
+    if not include_archived:
+        query = query.filter(Enquiry.deleted_at.is_(None))
+    enquiry = query.first()
+    if not enquiry and include_archived:
+        enquiry = db.query(EnquiryArchive).filter(EnquiryArchive.id == enquiry_id).first()
     if not enquiry:
         raise HTTPException(status_code=404, detail="Enquiry not found")
     return enquiry
 
-@router.post("/", response_model=EnquiryResponse, status_code=status.HTTP_201_CREATED)
-async def create_enquiry(
-    enquiry_data: EnquiryCreate,
-    db: Session = Depends(get_db)
-):
-    """Create a new enquiry (public - from contact form)"""
-    enquiry = Enquiry(**enquiry_data.model_dump())
-    db.add(enquiry)
-    db.commit()
-    db.refresh(enquiry)
-    return enquiry
+@router.post("/", response_model=EnquiryResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_enquiry(enquiry_data: EnquiryCreate, request: Request):
+    """Create a new enquiry (public - from contact form)
+
+    The enquiry is queued and written in a batch shortly after the response.
+    """
+    fingerprint = enquiry_intake.fingerprint(enquiry_data.phone, enquiry_data.message)
+    duplicate = enquiry_intake.find_duplicate(fingerprint)
+    if duplicate:
+        return duplicate
+
+    for limiter, key in (
+        (enquiry_intake.ip_limiter, get_client_ip(request)),
+        (enquiry_intake.phone_limiter, enquiry_data.phone.strip()),
+    ):
+        retry_after = limiter.acquire(key)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many enquiries, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    now = datetime.now(timezone.utc)
+    row = {
+        **enquiry_data.model_dump(),
+        "id": uuid4(),
+        "status": "new",
+        "notes": None,
+        "created_at": now,
+        "updated_at": now
+    }
+
+    if enquiry_intake.running:
+        try:
+            enquiry_intake.submit(row)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Enquiry service is busy, please try again shortly",
+                headers={"Retry-After": "5"}
+            )
+    else:
+        await asyncio.to_thread(insert_enquiries, [row])
+
+    enquiry_intake.remember(fingerprint, row)
+    event_bus.publish("enquiry.created", enquiry_summary(Enquiry(**row)))
+    return row
 
 @router.put("/{enquiry_id}", response_model=EnquiryResponse)
 async def update_enquiry(
@@ -63,7 +137,7 @@ async def update_enquiry(
     current_user: User = Depends(get_current_user)
 ):
     """Update an enquiry (admin only)"""
-    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id).first()
+    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id, Enquiry.deleted_at.is_(None)).first()
     if not enquiry:
         raise HTTPException(status_code=404, detail="Enquiry not found")
     
@@ -73,6 +147,7 @@ async def update_enquiry(
     
     db.commit()
     db.refresh(enquiry)
+    event_bus.publish("enquiry.updated", enquiry_summary(enquiry))
     return enquiry
 
 @router.delete("/{enquiry_id}")
@@ -81,13 +156,14 @@ async def delete_enquiry(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete an enquiry (admin only)"""
-    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id).first()
+    """Delete an enquiry (admin only); the row is kept with deleted_at set"""
+    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id, Enquiry.deleted_at.is_(None)).first()
     if not enquiry:
         raise HTTPException(status_code=404, detail="Enquiry not found")
     
-    db.delete(enquiry)
+    enquiry.deleted_at = datetime.now(timezone.utc)
     db.commit()
+    event_bus.publish("enquiry.deleted", {"id": str(enquiry_id)})
     return {"message": "Enquiry deleted successfully"}
 
 @router.patch("/{enquiry_id}/status", response_model=EnquiryResponse)
@@ -98,11 +174,12 @@ async def update_enquiry_status(
     current_user: User = Depends(get_current_user)
 ):
     """Update enquiry status (admin only)"""
-    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id).first()
+    enquiry = db.query(Enquiry).filter(Enquiry.id == enquiry_id, Enquiry.deleted_at.is_(None)).first()
     if not enquiry:
         raise HTTPException(status_code=404, detail="Enquiry not found")
     
     enquiry.status = new_status
     db.commit()
     db.refresh(enquiry)
+    event_bus.publish("enquiry.updated", enquiry_summary(enquiry))
     return enquiry
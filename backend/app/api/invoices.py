@@ -2,19 +2,30 @@
 Invoices API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Header
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
 import io
 
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.core.config import settings
-from app.models import Invoice, InvoiceItem, Customer, User
-from app.schemas import InvoiceCreate, InvoiceUpdate, InvoiceResponse
-from app.services.pdf_generator import generate_invoice_pdf
+from app.core.metrics import PDF_RENDER
+from app.models import Invoice, InvoiceItem, InvoiceArchive, Customer, User
+from app.schemas import InvoiceCreate, InvoiceUpdate, InvoicePatch, InvoiceResponse
+from app.services.analytics import snapshot_invoice, apply_invoice_change
+from app.services.archival import merge_newest
+from app.services.pdf_worker import pdf_workers
+from app.services.jobs import job_handler, JobFailed, enqueue, accepted
+from app.services.notifications import dispatcher, message
+from app.services.business_settings import business_settings
+from app.services.dashboard_feed import invoice_summary
+from app.services.events import event_bus
 
 router = APIRouter()
 
@@ -22,13 +33,49 @@ def generate_invoice_number(db: Session) -> str:
     """Generate unique invoice number"""
     current_year = datetime.now().year
     current_month = datetime.now().month
+    prefix = business_settings.get()["invoice_prefix"]
     
     # Get count of invoices this month
     count = db.query(Invoice).filter(
-        Invoice.invoice_number.like(f"NMS-{current_year}{current_month:02d}%")
+        Invoice.invoice_number.like(f"{prefix}-{current_year}{current_month:02d}%")
     ).count()
     
-    return f"NMS-{current_year}{current_month:02d}-{count + 1:04d}"
+    return f"{prefix}-{current_year}{current_month:02d}-{count + 1:04d}"
+
+def invoice_etag(invoice: Invoice) -> str:
+    return f'"{invoice.version}"'
+
+def check_if_match(invoice: Invoice, if_match: Optional[str]):
+    """Reject the write with 412 unless If-Match names the current version (absent means unconditional)"""
+    if not if_match or if_match.strip() == "*":
+        return
+    tags = {tag.strip().removeprefix("W/").strip('"') for tag in if_match.split(",")}
+    if str(invoice.version) not in tags:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Invoice was modified by someone else (current version {invoice.version})"
+        )
+
+def save_invoice_changes(db: Session, invoice: Invoice, before: dict):
+    """Flush, update rollups and commit; a concurrent edit surfaces as 412"""
+    try:
+        db.flush()
+        apply_invoice_change(db, before, snapshot_invoice(db, invoice))
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Invoice was modified by someone else; reload and try again"
+        )
+    db.refresh(invoice)
+
+def invoice_response(invoice: Invoice, response: Response) -> dict:
+    response.headers["ETag"] = invoice_etag(invoice)
+    invoice_dict = InvoiceResponse.model_validate(invoice).model_dump()
+    if invoice.customer:
+        invoice_dict['customer_name'] = invoice.customer.contact_person
+    return invoice_dict
 
 @router.get("/", response_model=List[InvoiceResponse])
 async def get_invoices(
@@ -36,19 +83,27 @@ async def get_invoices(
     current_user: User = Depends(get_current_user),
     customer_id: Optional[UUID] = None,
     status_filter: Optional[str] = None,
+    include_archived: bool = False,
     skip: int = 0,
     limit: int = 100
 ):
-    """Get all invoices (admin only)"""
-    query = db.query(Invoice)
-    
-    if customer_id:
-        query = query.filter(Invoice.customer_id == customer_id)
-    
-    if status_filter:
-        query = query.filter(Invoice.status == status_filter)
+    """Get all invoices (admin only); include_archived adds deleted and archived invoices"""
+    def filtered(model):
+        query = db.query(model)
+        if customer_id:
+            query = query.filter(model.customer_id == customer_id)
+        if status_filter:
+            query = query.filter(model.status == status_filter)
+        return query.order_by(model.created_at.desc())
     
-    invoices = query.order_by(Invoice.created_at.desc()).offset(skip).limit(limit).all()
+    if include_archived:
+        invoices = merge_newest(
+            filtered(Invoice).limit(skip + limit).all(),
+            filtered(InvoiceArchive).limit(skip + limit).all(),
+            skip, limit
+        )
+    else:
+        invoices = filtered(Invoice).filter(Invoice.deleted_at.is_(None)).offset(skip).limit(limit).all()
     
     result = []
     for invoice in invoices:
@@ -62,23 +117,27 @@ async def get_invoices(
 @router.get("/{invoice_id}", response_model=InvoiceResponse)
 async def get_invoice(
     invoice_id: UUID,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    include_archived: bool = False
 ):
-    """Get invoice by ID (admin only)"""
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    """Get invoice by ID (admin only); the ETag header carries its version"""
+    query = db.query(Invoice).filter(Invoice.id == invoice_id)
+    if not include_archived:
+        query = query.filter(Invoice.deleted_at.is_(None))
+    invoice = query.first()
+    if not invoice and include_archived:
+        invoice = db.query(InvoiceArchive).filter(InvoiceArchive.id == invoice_id).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
-    invoice_dict = InvoiceResponse.model_validate(invoice).model_dump()
-    if invoice.customer:
-        invoice_dict['customer_name'] = invoice.customer.contact_person
-    
-    return invoice_dict
+    return invoice_response(invoice, response)
 
 @router.post("/", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED)
 async def create_invoice(
     invoice_data: InvoiceCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -105,26 +164,32 @@ async def create_invoice(
         )
         db.add(item)
     
+    # Keep analytics rollups in step within the same transaction
+    db.flush()
+    apply_invoice_change(db, None, snapshot_invoice(db, invoice))
+    
     db.commit()
     db.refresh(invoice)
+    event_bus.publish("invoice.created", invoice_summary(invoice))
     
-    invoice_dict = InvoiceResponse.model_validate(invoice).model_dump()
-    if invoice.customer:
-        invoice_dict['customer_name'] = invoice.customer.contact_person
-    
-    return invoice_dict
+    return invoice_response(invoice, response)
 
 @router.put("/{invoice_id}", response_model=InvoiceResponse)
 async def update_invoice(
     invoice_id: UUID,
     invoice_data: InvoiceUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    if_match: Optional[str] = Header(None)
 ):
-    """Update an invoice (admin only)"""
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    """Update an invoice, replacing all items when items are given (admin only)"""
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None)).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
+    check_if_match(invoice, if_match)
+    
+    before = snapshot_invoice(db, invoice)
     
     update_data = invoice_data.model_dump(exclude_unset=True, exclude={'items'})
     for field, value in update_data.items():
@@ -142,48 +207,196 @@ async def update_invoice(
                 invoice_id=invoice.id
             )
             db.add(item)
+        # Item-only edits still bump the invoice version
+        invoice.updated_at = datetime.now(timezone.utc)
     
-    db.commit()
-    db.refresh(invoice)
+    save_invoice_changes(db, invoice, before)
+    event_bus.publish("invoice.updated", invoice_summary(invoice))
+    return invoice_response(invoice, response)
+
+@router.patch("/{invoice_id}", response_model=InvoiceResponse)
+async def patch_invoice(
+    invoice_id: UUID,
+    patch: InvoicePatch,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    if_match: Optional[str] = Header(None)
+):
+    """Partially update an invoice: changed fields plus item add/update/remove operations (admin only)"""
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None)).first()
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    check_if_match(invoice, if_match)
     
-    invoice_dict = InvoiceResponse.model_validate(invoice).model_dump()
-    if invoice.customer:
-        invoice_dict['customer_name'] = invoice.customer.contact_person
+    before = snapshot_invoice(db, invoice)
     
-    return invoice_dict
+    update_data = patch.model_dump(exclude_unset=True, exclude={'add_items', 'update_items', 'remove_items'})
+    for field, value in update_data.items():
+        setattr(invoice, field, value)
+    
+    # Only the rows named in the patch are loaded and written
+    touched_ids = {item.id for item in patch.update_items} | set(patch.remove_items)
+    items = {}
+    if touched_ids:
+        items = {
+            item.id: item for item in db.query(InvoiceItem).filter(
+                InvoiceItem.invoice_id == invoice.id,
+                InvoiceItem.id.in_(touched_ids)
+            )
+        }
+    missing = touched_ids - items.keys()
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Items not on this invoice: {', '.join(sorted(str(item_id) for item_id in missing))}"
+        )
+    
+    for item_data in patch.update_items:
+        for field, value in item_data.model_dump(exclude_unset=True, exclude={'id'}).items():
+            setattr(items[item_data.id], field, value)
+    for item_id in patch.remove_items:
+        db.delete(items[item_id])
+    for item_data in patch.add_items:
+        db.add(InvoiceItem(**item_data.model_dump(), invoice_id=invoice.id))
+    
+    if patch.add_items or patch.update_items or patch.remove_items:
+        invoice.updated_at = datetime.now(timezone.utc)
+    
+    save_invoice_changes(db, invoice, before)
+    event_bus.publish("invoice.updated", invoice_summary(invoice))
+    return invoice_response(invoice, response)
 
 @router.delete("/{invoice_id}")
 async def delete_invoice(
     invoice_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    if_match: Optional[str] = Header(None)
 ):
-    """Delete an invoice (admin only)"""
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    """Delete an invoice (admin only); the row is kept with deleted_at set"""
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None)).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
+    check_if_match(invoice, if_match)
     
-    db.delete(invoice)
-    db.commit()
+    apply_invoice_change(db, snapshot_invoice(db, invoice), None)
+    invoice.deleted_at = datetime.now(timezone.utc)
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Invoice was modified by someone else; reload and try again"
+        )
+    event_bus.publish("invoice.deleted", {"id": str(invoice_id)})
     return {"message": "Invoice deleted successfully"}
 
+def invoice_whatsapp_text(invoice_number: str, total_amount) -> str:
+    return f"Your invoice {invoice_number} for Rs. {total_amount} is ready. Contact us for details."
+
+async def send_whatsapp_invoice(invoice: Invoice, phone_number: str) -> dict:
+    """Send an invoice notice through the configured provider (a wa.me link with the mock provider)"""
+    result = await dispatcher.send(message(
+        phone_number,
+        invoice_whatsapp_text(invoice.invoice_number, invoice.total_amount),
+        reference=invoice.invoice_number
+    ))
+    sent = result["status"] == "sent"
+    if result["provider"] == "mock":
+        summary = f"Invoice {invoice.invoice_number} would be sent to {phone_number}"
+    elif sent:
+        summary = f"Invoice {invoice.invoice_number} sent to {phone_number}"
+    else:
+        summary = f"Invoice {invoice.invoice_number} could not be sent to {phone_number}"
+    return {"success": sent, "message": summary, **result}
+
+def pending_invoice_messages(db: Session) -> list:
+    """One message per pending invoice whose customer has a phone number"""
+    rows = db.query(Invoice.invoice_number, Invoice.total_amount, Customer.phone).join(
+        Customer, Customer.id == Invoice.customer_id
+    ).filter(
+        Invoice.status == "pending",
+        Invoice.deleted_at.is_(None),
+        Customer.phone.isnot(None),
+        Customer.phone != ""
+    ).order_by(Invoice.invoice_date).all()
+    return [
+        message(phone, invoice_whatsapp_text(number, total), reference=number)
+        for number, total, phone in rows
+    ]
+
+def _job_invoice(job) -> Invoice:
+    invoice = job.db.query(Invoice).filter(
+        Invoice.id == UUID(job.payload["invoice_id"]),
+        Invoice.deleted_at.is_(None)
+    ).first()
+    if not invoice:
+        raise JobFailed("Invoice not found")
+    return invoice
+
+@job_handler("invoice_pdf")
+def render_invoice_pdf_job(job) -> dict:
+    """Background job: render an invoice PDF and keep it for download"""
+    invoice = _job_invoice(job)
+    job.progress(10, f"Rendering {len(invoice.items)} items")
+    from app.services.pdf_generator import generate_invoice_pdf
+
+    def on_page(page):
+        # The page count is only known once rendering ends
+        job.progress(min(90, 10 + 10 * page), f"Rendering page {page}")
+
+    with PDF_RENDER.time("invoice"):
+        pdf_buffer = generate_invoice_pdf(invoice, invoice.customer, on_page)
+    job.attach(pdf_buffer.getvalue(), f"invoice_{invoice.invoice_number}.pdf", "application/pdf")
+    return {"invoice_number": invoice.invoice_number}
+
+@job_handler("invoice_whatsapp")
+async def send_invoice_whatsapp_job(job) -> dict:
+    """Background job: send an invoice over WhatsApp"""
+    invoice = await asyncio.to_thread(_job_invoice, job)
+    result = await send_whatsapp_invoice(invoice, job.payload["phone_number"])
+    if not result["success"]:
+        raise RuntimeError(result.get("error") or "send failed")
+    return result
+
+@job_handler("invoice_whatsapp_bulk")
+async def send_pending_invoices_job(job) -> dict:
+    """Background job: notify every customer with a pending invoice"""
+    messages = await asyncio.to_thread(pending_invoice_messages, job.db)
+    step = max(1, len(messages) // 20)
+
+    async def on_progress(done, total):
+        if done % step == 0 or done == total:
+            await asyncio.to_thread(job.progress, done * 100 // total, f"{done}/{total} processed")
+
+    # Failed sends are reported in the result rather than retrying the whole batch
+    return await dispatcher.send_many(messages, on_progress)
+
 @router.get("/{invoice_id}/pdf")
 async def get_invoice_pdf(
     invoice_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    background: bool = False
 ):
-    """Generate and download invoice PDF (admin only)"""
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    """Generate and download invoice PDF, or queue it with background=true (admin only)"""
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None)).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
+    if background:
+        job = enqueue(db, "invoice_pdf", {"invoice_id": str(invoice.id)}, user_id=current_user.id)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted(job))
+    
     customer = None
     if invoice.customer:
         customer = invoice.customer
     
-    # Generate PDF
-    pdf_buffer = generate_invoice_pdf(invoice, customer)
+    # Generate PDF (ReportLab is imported on first use to keep cold starts fast)
+    from app.services.pdf_generator import generate_invoice_pdf
+    pdf_buffer = await pdf_workers.render("invoice", generate_invoice_pdf, invoice, customer)
     
     return Response(
         content=pdf_buffer.getvalue(),
@@ -193,22 +406,34 @@ async def get_invoice_pdf(
         }
     )
 
+@router.post("/whatsapp/send-pending", status_code=status.HTTP_202_ACCEPTED)
+async def send_pending_invoices_whatsapp(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue WhatsApp notices for all pending invoices (admin only)"""
+    job = enqueue(db, "invoice_whatsapp_bulk", user_id=current_user.id, max_attempts=1)
+    return accepted(job)
+
 @router.post("/{invoice_id}/send-whatsapp")
 async def send_invoice_whatsapp(
     invoice_id: UUID,
     phone_number: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    background: bool = False
 ):
-    """Mock WhatsApp invoice sending (admin only)"""
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    """Send an invoice over WhatsApp, optionally queued with background=true (admin only)"""
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id, Invoice.deleted_at.is_(None)).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
-    # This is a mock implementation
-    # In production, you would integrate with WhatsApp Business API
-    return {
-        "success": True,
-        "message": f"Invoice {invoice.invoice_number} would be sent to {phone_number}",
-        "whatsapp_link": f"https://wa.me/{phone_number}?text=Your%20invoice%20{invoice.invoice_number}%20for%20Rs.%20{invoice.total_amount}%20is%20ready.%20Contact%20us%20for%20details."
-    }
+    if background:
+        job = enqueue(
+            db, "invoice_whatsapp",
+            {"invoice_id": str(invoice.id), "phone_number": phone_number},
+            user_id=current_user.id
+        )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted(job))
+    
+    return await send_whatsapp_invoice(invoice, phone_number)
@@ -0,0 +1,64 @@
+"""
+Background Jobs API Routes
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session, undefer
+from typing import Optional
+from uuid import UUID
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models import Job, User
+from app.services.jobs import job_status
+
+router = APIRouter()
+
+@router.get("/")
+async def get_jobs(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = 50
+):
+    """List recent background jobs (admin only)"""
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    jobs = query.order_by(Job.created_at.desc()).limit(min(limit, 200)).all()
+    return [job_status(job) for job in jobs]
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a background job's status, progress and result (admin only)"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+@router.get("/{job_id}/download")
+async def download_job_artifact(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download the file a finished job produced (admin only)"""
+    job = db.query(Job).options(undefer(Job.artifact)).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "succeeded" or job.artifact is None:
+        raise HTTPException(status_code=409, detail="Job has no file to download")
+    return Response(
+        content=job.artifact,
+        media_type=job.artifact_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={job.artifact_name}"
+        }
+    )
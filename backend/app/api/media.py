@@ -0,0 +1,66 @@
+"""
+Media API Routes
+
+Serves blob store files. Keys are content hashes, so responses are
+immutable and cached for a year.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models import User
+from app.services.blob_store import blob_store
+from app.services.images import image_workers, largest_jpeg, ImageError
+
+router = APIRouter()
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+
+async def read_upload(upload: UploadFile) -> bytes:
+    """Read an upload, rejecting it once it passes IMAGE_MAX_UPLOAD_MB"""
+    limit = settings.IMAGE_MAX_UPLOAD_MB * 1024 * 1024
+    chunks, size = [], 0
+    while chunk := await upload.read(1024 * 1024):
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image larger than {settings.IMAGE_MAX_UPLOAD_MB} MB"
+            )
+        chunks.append(chunk)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    return b"".join(chunks)
+
+async def upload_variants(upload: UploadFile) -> dict:
+    """Resize an uploaded image on the image pool; 400 if it is not an image"""
+    data = await read_upload(upload)
+    try:
+        return await image_workers.variants(data)
+    except ImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/images", status_code=status.HTTP_201_CREATED)
+async def upload_image(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """Upload an image and get its variant URLs, e.g. for category or offer image_url (admin only)"""
+    variants = await upload_variants(file)
+    return {"image_url": largest_jpeg(variants), "image_variants": variants}
+
+@router.get("/{key}")
+async def get_media(key: str, request: Request):
+    """Serve a stored variant (public)"""
+    path = blob_store.path(key)
+    if path is None or not blob_store.exists(key):
+        raise HTTPException(status_code=404, detail="Not found")
+    etag = f'"{key.split(".")[0]}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    extension = key.rsplit(".", 1)[1]
+    return FileResponse(path, media_type=MEDIA_TYPES.get(extension, "application/octet-stream"), headers=headers)
@@ -2,38 +2,53 @@
 Offers API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
-from app.models import Offer, User
+from app.models import Offer, OfferTarget, Category, Product, User
 from app.schemas import OfferCreate, OfferUpdate, OfferResponse
+from app.services.offer_schedule import offer_schedule, live_offer_filter, business_today
 
 router = APIRouter()
 
+TARGET_FIELDS = {"category_ids", "product_ids"}
+
+def set_targets(db: Session, offer: Offer, category_ids: Optional[List[UUID]], product_ids: Optional[List[UUID]]):
+    """Replace the offer's category and/or product targets (None leaves that kind unchanged)"""
+    for model, ids, label in ((Category, category_ids, "categories"), (Product, product_ids, "products")):
+        if ids and db.query(model).filter(model.id.in_(ids)).count() != len(set(ids)):
+            raise HTTPException(status_code=400, detail=f"Unknown {label} in offer targets")
+    if category_ids is None:
+        category_ids = offer.category_ids
+    if product_ids is None:
+        product_ids = offer.product_ids
+    offer.targets = [OfferTarget(category_id=category_id) for category_id in dict.fromkeys(category_ids)] + [
+        OfferTarget(product_id=product_id) for product_id in dict.fromkeys(product_ids)
+    ]
+
 @router.get("/", response_model=List[OfferResponse])
 async def get_offers(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     active_only: bool = False
 ):
-    """Get all offers (public)"""
+    """Get all offers (public); active_only keeps enabled offers within their dates"""
     query = db.query(Offer)
     if active_only:
-        query = query.filter(Offer.is_active == True)
+        query = query.filter(live_offer_filter(business_today()))
     offers = query.order_by(Offer.display_order).all()
     return offers
 
 @router.get("/active", response_model=List[OfferResponse])
-async def get_active_offers(db: Session = Depends(get_db)):
-    """Get active offers (public)"""
-    offers = db.query(Offer).filter(Offer.is_active == True).order_by(Offer.display_order).all()
-    return offers
+async def get_active_offers():
+    """Get offers live right now, from the in-memory schedule (public)"""
+    return Response(content=await offer_schedule.active_json(), media_type="application/json")
 
 @router.get("/{offer_id}", response_model=OfferResponse)
-async def get_offer(offer_id: UUID, db: Session = Depends(get_db)):
+async def get_offer(offer_id: UUID, db: Session = Depends(get_read_db)):
     """Get offer by ID (public)"""
     offer = db.query(Offer).filter(Offer.id == offer_id).first()
     if not offer:
@@ -47,7 +62,8 @@ async def create_offer(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new offer (admin only)"""
-    offer = Offer(**offer_data.model_dump())
+    offer = Offer(**offer_data.model_dump(exclude=TARGET_FIELDS))
+    set_targets(db, offer, offer_data.category_ids, offer_data.product_ids)
     db.add(offer)
     db.commit()
     db.refresh(offer)
@@ -65,9 +81,11 @@ async def update_offer(
     if not offer:
         raise HTTPException(status_code=404, detail="Offer not found")
     
-    update_data = offer_data.model_dump(exclude_unset=True)
+    update_data = offer_data.model_dump(exclude_unset=True, exclude=TARGET_FIELDS)
     for field, value in update_data.items():
         setattr(offer, field, value)
+    if offer_data.category_ids is not None or offer_data.product_ids is not None:
+        set_targets(db, offer, offer_data.category_ids, offer_data.product_ids)
     
     db.commit()
     db.refresh(offer)
@@ -2,21 +2,25 @@
 Products API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
 from app.models import Product, Category, User
 from app.schemas import ProductCreate, ProductUpdate, ProductResponse
+from app.api.media import upload_variants
+from app.services.images import largest_jpeg
+from app.services.pricing import pricing
+from app.services.catalogue_snapshot import catalogue_snapshot
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ProductResponse])
 async def get_products(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     category_id: Optional[UUID] = None,
     category_slug: Optional[str] = None,
     featured_only: bool = False,
@@ -26,7 +30,7 @@ async def get_products(
     limit: int = 100
 ):
     """Get all products (public)"""
-    query = db.query(Product)
+    query = db.query(Product).options(joinedload(Product.category))
     
     if active_only:
         query = query.filter(Product.is_active == True)
@@ -60,12 +64,11 @@ async def get_products(
             product_dict['category_name'] = product.category.name
         result.append(product_dict)
     
-    return result
+    return await pricing.apply(result)
 
-@router.get("/featured", response_model=List[ProductResponse])
-async def get_featured_products(db: Session = Depends(get_db), limit: int = 8):
-    """Get featured products (public)"""
-    products = db.query(Product).filter(
+def featured_products(db: Session, limit: int = 8) -> list:
+    """Active featured products as ProductResponse dicts (before pricing)"""
+    products = db.query(Product).options(joinedload(Product.category)).filter(
         Product.is_featured == True,
         Product.is_active == True
     ).limit(limit).all()
@@ -79,9 +82,17 @@ async def get_featured_products(db: Session = Depends(get_db), limit: int = 8):
     
     return result
 
+@router.get("/featured", response_model=List[ProductResponse])
+async def get_featured_products(db: Session = Depends(get_read_db), limit: int = 8):
+    """Get featured products (public)"""
+    return await pricing.apply(featured_products(db, limit))
+
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: UUID, db: Session = Depends(get_db)):
+async def get_product(product_id: UUID, db: Session = Depends(get_read_db)):
     """Get product by ID (public)"""
+    product_dict = await catalogue_snapshot.find("products", id=product_id)
+    if product_dict is not None:
+        return (await pricing.apply([product_dict]))[0]
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -90,11 +101,14 @@ async def get_product(product_id: UUID, db: Session = Depends(get_db)):
     if product.category:
         product_dict['category_name'] = product.category.name
     
-    return product_dict
+    return (await pricing.apply([product_dict]))[0]
 
 @router.get("/slug/{slug}", response_model=ProductResponse)
-async def get_product_by_slug(slug: str, db: Session = Depends(get_db)):
+async def get_product_by_slug(slug: str, db: Session = Depends(get_read_db)):
     """Get product by slug (public)"""
+    product_dict = await catalogue_snapshot.find("products", slug=slug)
+    if product_dict is not None:
+        return (await pricing.apply([product_dict]))[0]
     product = db.query(Product).filter(Product.slug == slug).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -103,7 +117,7 @@ async def get_product_by_slug(slug: str, db: Session = Depends(get_db)):
     if product.category:
         product_dict['category_name'] = product.category.name
     
-    return product_dict
+    return (await pricing.apply([product_dict]))[0]
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
@@ -125,7 +139,7 @@ async def create_product(
     if product.category:
         product_dict['category_name'] = product.category.name
     
-    return product_dict
+    return (await pricing.apply([product_dict]))[0]
 
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
@@ -150,7 +164,31 @@ async def update_product(
     if product.category:
         product_dict['category_name'] = product.category.name
     
-    return product_dict
+    return (await pricing.apply([product_dict]))[0]
+
+@router.post("/{product_id}/image", response_model=ProductResponse)
+async def upload_product_image(
+    product_id: UUID,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Upload a product image; resized WebP/JPEG variants replace image_url (admin only)"""
+    product = db.query(Product).filter(Product.id == product_id).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    variants = await upload_variants(file)
+    product.image_variants = variants
+    product.image_url = largest_jpeg(variants)
+    db.commit()
+    db.refresh(product)
+    
+    product_dict = ProductResponse.model_validate(product).model_dump()
+    if product.category:
+        product_dict['category_name'] = product.category.name
+    
+    return (await pricing.apply([product_dict]))[0]
 
 @router.delete("/{product_id}")
 async def delete_product(
@@ -0,0 +1,144 @@
+"""
+Reports API Routes
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse, JSONResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select
+from typing import Optional
+from datetime import date, timedelta
+import csv
+import io
+
+from app.core.database import get_db, get_read_db
+from app.core.security import get_current_user
+from app.models import Invoice, Customer, User
+from app.services.jobs import job_handler, enqueue, accepted
+
+router = APIRouter()
+
+# Invoices that still carry a balance; matches idx_invoices_unpaid_due
+OUTSTANDING_STATUS = "pending"
+
+AGEING_BUCKETS = ("current", "days_0_30", "days_31_60", "days_61_90", "days_90_plus")
+AGEING_CSV_CHUNK_ROWS = 500
+
+def _ageing_query(as_of: date):
+    """Build the grouped ageing query: one row per customer with bucket totals"""
+    # Invoices without a due date are aged from their invoice date
+    due = func.coalesce(Invoice.due_date, Invoice.invoice_date)
+    amount = func.coalesce(Invoice.total_amount, 0)
+
+    def bucket(condition):
+        return func.sum(case((condition, amount), else_=0))
+
+    aged = select(
+        Invoice.customer_id.label("customer_id"),
+        # count(*) rather than count(id): id is not in the covering index
+        func.count().label("invoice_count"),
+        bucket(due > as_of).label("current"),
+        bucket(due.between(as_of - timedelta(days=30), as_of)).label("days_0_30"),
+        bucket(due.between(as_of - timedelta(days=60), as_of - timedelta(days=31))).label("days_31_60"),
+        bucket(due.between(as_of - timedelta(days=90), as_of - timedelta(days=61))).label("days_61_90"),
+        bucket(due < as_of - timedelta(days=90)).label("days_90_plus"),
+        func.sum(amount).label("total"),
+    ).where(
+        Invoice.status == OUTSTANDING_STATUS,
+        Invoice.deleted_at.is_(None)
+    ).group_by(Invoice.customer_id).subquery()
+
+    return select(
+        aged,
+        Customer.contact_person,
+        Customer.company_name,
+    ).outerjoin(
+        Customer, Customer.id == aged.c.customer_id
+    ).order_by(aged.c.total.desc())
+
+def _ageing_csv(rows, as_of: date, on_chunk=None):
+    """Yield the ageing report as CSV text chunks; on_chunk(rows_written) follows each full chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["as_of", "customer_id", "customer_name", "company_name", "invoice_count", *AGEING_BUCKETS, "total"])
+    for index, row in enumerate(rows, 1):
+        writer.writerow([
+            as_of.isoformat(),
+            str(row.customer_id) if row.customer_id else "",
+            row.contact_person or "",
+            row.company_name or "",
+            row.invoice_count,
+            *[f"{float(getattr(row, name) or 0):.2f}" for name in AGEING_BUCKETS],
+            f"{float(row.total or 0):.2f}",
+        ])
+        if index % AGEING_CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            if on_chunk:
+                on_chunk(index)
+    yield buffer.getvalue()
+
+@job_handler("ageing_export")
+def export_ageing_job(job) -> dict:
+    """Background job: build the ageing report as a CSV file"""
+    as_of = date.fromisoformat(job.payload["as_of"])
+    job.progress(0, "Ageing outstanding invoices")
+    rows = job.db.execute(_ageing_query(as_of)).all()
+    job.progress(10, f"0/{len(rows)} customers written")
+
+    def on_chunk(written):
+        job.progress(10 + 90 * written // len(rows), f"{written}/{len(rows)} customers written")
+
+    content = "".join(_ageing_csv(rows, as_of, on_chunk)).encode()
+    job.attach(content, f"ageing_{as_of.isoformat()}.csv", "text/csv")
+    return {"as_of": as_of.isoformat(), "customers": len(rows)}
+
+@router.get("/ageing")
+async def get_ageing_report(
+    db: Session = Depends(get_read_db),
+    primary_db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    as_of: Optional[date] = None,
+    format: str = "json",
+    background: bool = False
+):
+    """Accounts-receivable ageing per customer; background=true queues a CSV export (admin only)"""
+    if format not in ("json", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'csv'")
+
+    as_of = as_of or date.today()
+    if background:
+        job = enqueue(primary_db, "ageing_export", {"as_of": as_of.isoformat()}, user_id=current_user.id)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted(job))
+
+    rows = db.execute(_ageing_query(as_of)).all()
+
+    if format == "csv":
+        return StreamingResponse(
+            _ageing_csv(rows, as_of),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=ageing_{as_of.isoformat()}.csv"
+            }
+        )
+
+    totals = {name: 0.0 for name in (*AGEING_BUCKETS, "total")}
+    customers = []
+    for row in rows:
+        entry = {
+            "customer_id": str(row.customer_id) if row.customer_id else None,
+            "customer_name": row.contact_person,
+            "company_name": row.company_name,
+            "invoice_count": row.invoice_count,
+        }
+        for name in (*AGEING_BUCKETS, "total"):
+            entry[name] = float(getattr(row, name) or 0)
+            totals[name] += entry[name]
+        customers.append(entry)
+
+    return {
+        "as_of": as_of.isoformat(),
+        "totals": totals,
+        "customers": customers
+    }
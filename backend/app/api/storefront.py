@@ -0,0 +1,102 @@
+"""
+Storefront API Routes
+
+One round-trip for the public home page. The three sections are read
+concurrently, each on its own read session, and the serialised (and
+gzipped) payload is shared by every visitor for STOREFRONT_CACHE_SECONDS,
+until the live offers change or until a catalogue write in any worker.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+
+from fastapi import APIRouter, Request, Response
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import read_session
+from app.core.metrics import record_cache
+from app.schemas import CategoryResponse, ProductResponse
+from app.services.offer_schedule import offer_schedule
+from app.services.pricing import pricing
+from app.api.categories import list_categories
+from app.api.products import featured_products
+
+router = APIRouter()
+
+FEATURED_LIMIT = 8
+
+def _with_session(func, *args):
+    with read_session() as db:
+        return func(db, *args)
+
+def _categories(db) -> list:
+    return [CategoryResponse.model_validate(category).model_dump(mode="json") for category in list_categories(db, True)]
+
+class HomePayload:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entry = None  # (built_at, offer_version, etag, body, gzipped)
+        self._lock = asyncio.Lock()
+
+    def _fresh(self):
+        entry = self._entry
+        if entry and time.monotonic() - entry[0] < self.ttl and entry[1] == offer_schedule.version:
+            return entry
+        return None
+
+    async def get(self):
+        entry = self._fresh()
+        if entry:
+            record_cache("storefront_home", True)
+            return entry
+        async with self._lock:
+            entry = self._fresh()
+            if entry:
+                record_cache("storefront_home", True)
+                return entry
+            record_cache("storefront_home", False)
+            categories, products, offers = await asyncio.gather(
+                asyncio.to_thread(_with_session, _categories),
+                asyncio.to_thread(_with_session, featured_products, FEATURED_LIMIT),
+                offer_schedule.active(),
+            )
+            payload = {
+                "categories": categories,
+                "featured_products": [
+                    ProductResponse.model_validate(product).model_dump(mode="json")
+                    for product in await pricing.apply(products)
+                ],
+                "offers": offers,
+            }
+            body = json.dumps(payload).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            self._entry = (time.monotonic(), offer_schedule.version, etag, body, gzip.compress(body, 6))
+            return self._entry
+
+    async def invalidate(self):
+        self._entry = None
+
+
+home_payload = HomePayload(settings.STOREFRONT_CACHE_SECONDS)
+cache.on_invalidate("products", home_payload.invalidate)
+cache.on_invalidate("categories", home_payload.invalidate)
+
+@router.get("/home")
+async def get_home(request: Request):
+    """Active categories, featured products (with effective prices) and live offers (public)"""
+    _, _, etag, body, gzipped = await home_payload.get()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={int(settings.STOREFRONT_CACHE_SECONDS)}",
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = gzipped
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,298 @@
+"""
+Shared Cache
+
+Byte values with a TTL, grouped into namespaces ("products", "auth", ...).
+Invalidating a namespace bumps its generation counter in the backend and
+announces the new generation on a pub/sub channel, so every worker stops
+reading the old entries at once; those then age out by TTL. The
+invalidating worker runs its own hooks before invalidate() returns and
+skips them when its announcement comes back; other workers run theirs as
+the announcement arrives.
+
+CACHE_BACKEND=memory keeps everything in this process (one worker,
+development, and the local stand-in for tests). CACHE_BACKEND=redis
+shares entries and invalidations across workers over the Redis protocol
+(Redis, Valkey, KeyDB, ...) at CACHE_URL.
+
+The cache is an optimisation only: backend errors are logged and
+treated as misses.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_MAX_SECONDS = 30.0
+
+
+class MemoryBackend:
+    """In-process backend: an LRU of entries plus local pub/sub"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._counters = {}
+        self._listeners = set()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def publish(self, message: str):
+        for queue in self._listeners:
+            queue.put_nowait(message)
+
+    async def listen(self):
+        """Yield None once subscribed, then every published message"""
+        queue = asyncio.Queue()
+        self._listeners.add(queue)
+        try:
+            yield None
+            while True:
+                yield await queue.get()
+        finally:
+            self._listeners.discard(queue)
+
+    async def close(self):
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Redis-protocol backend; keys and the channel share CACHE_KEY_PREFIX"""
+
+    def __init__(self, url: str, prefix: str):
+        # redis is only imported when this backend is configured
+        import redis.asyncio as redis
+        self._client = redis.from_url(url)
+        self.prefix = prefix
+        self.channel = f"{prefix}invalidate"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str):
+        await self._client.delete(self.prefix + key)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(self.prefix + key)
+
+    async def counter(self, key: str) -> int:
+        return int(await self._client.get(self.prefix + key) or 0)
+
+    async def publish(self, message: str):
+        await self._client.publish(self.channel, message)
+
+    async def listen(self):
+        """Yield None once subscribed, then every published message"""
+        pubsub = self._client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            yield None
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"].decode()
+        finally:
+            await pubsub.aclose()
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight call and its result"""
+
+    def __init__(self):
+        self._calls = {}
+
+    def in_flight(self, key) -> bool:
+        return key in self._calls
+
+    async def do(self, key, func):
+        """Await func() (a coroutine function), or join the call already running for key.
+
+        A waiter that is cancelled (say, its client went away) does not
+        cancel the shared call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._calls.pop(key, None) if self._calls.get(key) is done else None)
+        return await asyncio.shield(task)
+
+
+def make_backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_URL, settings.CACHE_KEY_PREFIX)
+    if settings.CACHE_BACKEND != "memory":
+        logger.warning("Unknown CACHE_BACKEND %r, using memory", settings.CACHE_BACKEND)
+    return MemoryBackend(settings.CACHE_MAX_ENTRIES)
+
+
+class Cache:
+    def __init__(self):
+        self.backend = None
+        self._generations = {}
+        self._notified = {}  # namespace -> newest generation whose hooks already ran here
+        self._listening = False
+        self._callbacks = {}  # namespace -> [async callables]
+        self._task = None
+
+    def on_invalidate(self, namespace: str, callback):
+        """Await callback() whenever the namespace is invalidated, by any worker"""
+        self._callbacks.setdefault(namespace, []).append(callback)
+
+    async def _notify(self, namespaces):
+        for namespace in namespaces:
+            for callback in self._callbacks.get(namespace, ()):
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.warning("Cache invalidation hook for %s failed: %s", namespace, e)
+
+    def _backend(self):
+        if self.backend is None:
+            self.backend = make_backend()
+        return self.backend
+
+    async def _generation(self, namespace: str) -> int:
+        # Generations are kept locally only while the invalidation channel is up
+        generation = self._generations.get(namespace) if self._listening else None
+        if generation is None:
+            generation = await self._backend().counter(f"gen:{namespace}")
+            if self._listening:
+                self._generations[namespace] = generation
+        return generation
+
+    async def generation(self, namespace: str) -> Optional[int]:
+        """Current generation of the namespace, the same in every worker (None if the backend is down)"""
+        try:
+            return await self._generation(namespace)
+        except Exception as e:
+            logger.warning("Cache unavailable: %s", e)
+            return None
+
+    async def entry_key(self, namespace: str, key: str) -> Optional[str]:
+        """Full key for `key` in the namespace's current generation (None if the backend is down).
+
+        Fetch this once, before reading the data to cache, and use it for
+        both get and set, so a value computed before an invalidation is
+        never stored under the new generation.
+        """
+        generation = await self.generation(namespace)
+        if generation is None:
+            return None
+        return f"{namespace}:{generation}:{key}"
+
+    async def get(self, entry_key: Optional[str]) -> Optional[bytes]:
+        if entry_key is None:
+            return None
+        try:
+            return await self._backend().get(entry_key)
+        except Exception as e:
+            logger.warning("Cache get failed: %s", e)
+            return None
+
+    async def set(self, entry_key: Optional[str], value: bytes, ttl: float):
+        if entry_key is None:
+            return
+        try:
+            await self._backend().set(entry_key, value, ttl)
+        except Exception as e:
+            logger.warning("Cache set failed: %s", e)
+
+    async def invalidate(self, *namespaces: str):
+        """Drop every entry in these namespaces, in all workers; local hooks have run on return"""
+        for namespace in namespaces:
+            try:
+                generation = await self._backend().incr(f"gen:{namespace}")
+                self._generations[namespace] = max(generation, self._generations.get(namespace, 0))
+                self._notified[namespace] = max(generation, self._notified.get(namespace, 0))
+                await self._backend().publish(f"{namespace}:{generation}")
+            except Exception as e:
+                self._generations.pop(namespace, None)
+                logger.warning("Cache invalidation of %s failed: %s", namespace, e)
+        await self._notify(namespaces)
+
+    async def start(self):
+        if self._task is None:
+            self._backend()
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.backend is not None:
+            await self.backend.close()
+            self.backend = None
+        self._generations.clear()
+        self._notified.clear()
+
+    async def _listen(self):
+        delay = 1.0
+        subscribed_before = False
+        while True:
+            try:
+                async for message in self._backend().listen():
+                    if message is None:
+                        # (Re)subscribed: anything announced meanwhile may have been missed
+                        self._generations.clear()
+                        self._listening = True
+                        delay = 1.0
+                        if subscribed_before:
+                            await self._notify(list(self._callbacks))
+                        subscribed_before = True
+                        continue
+                    namespace, _, generation = message.rpartition(":")
+                    generation = int(generation)
+                    self._generations[namespace] = max(generation, self._generations.get(namespace, 0))
+                    if generation > self._notified.get(namespace, 0):
+                        self._notified[namespace] = generation
+                        await self._notify([namespace])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation channel lost: %s", e)
+            finally:
+                self._listening = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+
+cache = Cache()
@@ -2,18 +2,78 @@
 Database Configuration
 """
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.query_trace import install_query_tracing
+from app.core.replicas import ReplicaRouter, client_key, WROTE_SCOPE_KEY
 
-engine = create_engine(settings.DATABASE_URL)
+def _create_engine(url: str, **kwargs):
+    engine = create_engine(url, **kwargs)
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    if settings.QUERY_TRACE_ENABLED:
+        install_query_tracing(engine)
+    return engine
+
+engine = _create_engine(settings.DATABASE_URL)
+replica_engines = [
+    _create_engine(url.strip(), pool_pre_ping=True)
+    for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+replica_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS,
+    read_your_writes=settings.READ_YOUR_WRITES_SECONDS,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
-def get_db():
+for _replica in replica_engines:
+    @event.listens_for(_replica, "handle_error")
+    def _replica_error(context):
+        if context.is_disconnect:
+            replica_router.mark_down(context.engine)
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(SessionLocal, "after_commit")
+def _note_commit(session):
+    # ReadYourWritesMiddleware pins the client to the primary before responding
+    scope = session.info.get("request_scope")
+    if session.info.pop("wrote", False) and scope is not None:
+        scope[WROTE_SCOPE_KEY] = True
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_flush(session, flush_context, instances):
+    raise RuntimeError("Read-only session: use get_db for requests that write")
+
+def get_db(request: Request = None):
     """Dependency for database sessions"""
     db = SessionLocal()
+    if request is not None:
+        db.info["request_scope"] = request.scope
+    try:
+        yield db
+    finally:
+        db.close()
+
+def read_session() -> Session:
+    """Read-only session on a healthy replica (or the primary), for reads not tied to a client"""
+    return ReadSessionLocal(bind=replica_router.any_engine())
+
+async def get_read_db(request: Request = None):
+    """Dependency for read-only sessions; served by a replica when one is configured and healthy"""
+    key = client_key(request.headers.get("authorization")) if request is not None else None
+    db = ReadSessionLocal(bind=await replica_router.engine_for_read(key))
     try:
         yield db
     finally:
@@ -0,0 +1,88 @@
+"""
+Health Checks - liveness and readiness
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+
+class LoopLagMonitor:
+    """Measure event-loop lag as the overshoot of a periodic sleep"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, time.perf_counter() - start - self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+loop_lag_monitor = LoopLagMonitor()
+
+def _ping(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+async def check_database(engine) -> dict:
+    """Round-trip to the database with a timeout"""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(_ping, engine), settings.HEALTH_DB_TIMEOUT_MS / 1000)
+        ok, error = True, None
+    except asyncio.TimeoutError:
+        ok, error = False, "timeout"
+    except Exception as e:
+        ok, error = False, str(e).splitlines()[0]
+    result = {"ok": ok, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+    if error:
+        result["error"] = error
+    return result
+
+def check_pool(engine) -> dict:
+    """Share of pooled connections currently checked out"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"ok": True, "saturation": 0.0}
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": saturation < settings.HEALTH_MAX_POOL_SATURATION,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+    }
+
+def check_pdf_workers(pool) -> dict:
+    stats = pool.stats()
+    return {"ok": stats["queued"] <= settings.HEALTH_MAX_PDF_QUEUE, **stats}
+
+def check_replicas(router) -> dict:
+    """Replica status; reads fall back to the primary, so this never fails readiness"""
+    replicas = router.status()
+    return {"ok": True, "healthy": sum(1 for r in replicas if r["healthy"]), "replicas": replicas}
+
+def check_event_loop() -> dict:
+    lag_ms = loop_lag_monitor.lag * 1000
+    return {"ok": lag_ms < settings.HEALTH_MAX_LOOP_LAG_MS, "lag_ms": round(lag_ms, 2)}
@@ -0,0 +1,112 @@
+"""
+Query Tracing - slow-query log and N+1 detection
+
+Opt-in (QUERY_TRACE_ENABLED). Every statement is timed against
+SLOW_QUERY_MS, and statements repeated with the same shape within one
+request are reported as likely N+1 patterns. In DEBUG mode each response
+also carries an X-Query-Summary header.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import route_label
+
+logger = logging.getLogger("app.query_trace")
+
+MAX_PARAMS_LENGTH = 500
+
+def _shape(statement: str) -> str:
+    """Collapse whitespace; bound parameters already keep values out of the text"""
+    return " ".join(statement.split())
+
+
+class RequestTrace:
+    __slots__ = ("scope", "count", "total_time", "shapes")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+
+    @property
+    def route(self) -> str:
+        return f"{self.scope['method']} {route_label(self.scope)}"
+
+    def repeated(self) -> list:
+        """Statement shapes executed at least N_PLUS_ONE_THRESHOLD times"""
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= settings.N_PLUS_ONE_THRESHOLD
+        ]
+
+    def summary(self) -> str:
+        return f"count={self.count}; time={self.total_time * 1000:.1f}ms; repeated={len(self.repeated())}"
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("query_trace", default=None)
+
+def install_query_tracing(engine):
+    """Attach slow-query and repetition tracking to an engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._trace_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._trace_start
+        trace = _current_trace.get()
+        shape = _shape(statement)
+        if trace is not None:
+            trace.count += 1
+            trace.total_time += elapsed
+            trace.shapes[shape] += 1
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            params = repr(parameters)
+            if len(params) > MAX_PARAMS_LENGTH:
+                params = params[:MAX_PARAMS_LENGTH] + "..."
+            logger.warning(
+                "Slow query %.1fms [%s]: %s | params=%s",
+                elapsed * 1000,
+                trace.route if trace else "no request",
+                shape,
+                params
+            )
+
+
+class QueryTraceMiddleware:
+    """ASGI middleware collecting a per-request query trace"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope)
+        token = _current_trace.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-summary", trace.summary().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            for shape, count in trace.repeated():
+                logger.warning("Possible N+1 [%s]: statement ran %d times: %s", trace.route, count, shape)
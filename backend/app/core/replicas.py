@@ -0,0 +1,182 @@
+"""
+Read Replica Routing
+
+Picks the database for read-only requests. Replicas are used round-robin
+while they are reachable and within REPLICA_MAX_LAG_SECONDS of the primary;
+otherwise reads fall back to the primary. Health and lag are checked by a
+background task every REPLICA_CHECK_INTERVAL_SECONDS, never on the request
+path.
+
+Clients that just wrote (identified by their bearer token) read from the
+primary for READ_YOUR_WRITES_SECONDS so they see their own changes. The
+marker is kept in the shared cache, so it holds whichever worker serves the
+next read; it is stored before the write's response goes out.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from itertools import count
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Set in the request scope when a session bound to that request commits a write
+WROTE_SCOPE_KEY = "app.db_wrote"
+
+def client_key(authorization: str):
+    """Stable, non-reversible key for a client's credentials"""
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+def replication_lag(conn) -> float:
+    """Seconds the replica is behind the primary (0 when caught up or not a standby)"""
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    return float(conn.execute(text("""
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """)).scalar() or 0)
+
+
+class Replica:
+    def __init__(self, engine):
+        self.engine = engine
+        self.healthy = True
+        self.lag = 0.0
+        self.checked_at = 0.0
+        self.error = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def check(self, max_lag: float):
+        try:
+            with self.engine.connect() as conn:
+                self.lag = replication_lag(conn)
+            self.error = None
+            self.healthy = self.lag <= max_lag
+            if not self.healthy:
+                self.error = f"lagging {self.lag:.1f}s"
+        except SQLAlchemyError as e:
+            self.healthy = False
+            self.error = str(e).splitlines()[0]
+        if not self.healthy:
+            logger.warning("Replica %s unavailable: %s", self.name, self.error)
+        self.checked_at = time.monotonic()
+
+
+class ReplicaRouter:
+    def __init__(self, primary, replicas: list, max_lag: float, check_interval: float, read_your_writes: float):
+        self.primary = primary
+        self.replicas = [Replica(engine) for engine in replicas]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_your_writes = read_your_writes
+        self._recent_writers = {}  # this worker's writers, in case the cache is down
+        self._round_robin = count()
+        self._lock = threading.Lock()
+        self._task = None
+
+    async def note_write(self, key: str):
+        """Pin this client's reads to the primary for the read-your-writes window, in every worker"""
+        if not key or not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {k: v for k, v in self._recent_writers.items() if v > now}
+            self._recent_writers[key] = now + self.read_your_writes
+        await cache.set(await cache.entry_key("writers", key), b"1", self.read_your_writes)
+
+    async def wrote_recently(self, key: str) -> bool:
+        if not key:
+            return False
+        if self._recent_writers.get(key, 0) > time.monotonic():
+            return True
+        return await cache.get(await cache.entry_key("writers", key)) is not None
+
+    def mark_down(self, engine):
+        """Take a replica out of rotation until its next check"""
+        for replica in self.replicas:
+            if replica.engine is engine and replica.healthy:
+                replica.healthy = False
+                replica.error = "connection lost"
+                replica.checked_at = time.monotonic()
+                logger.warning("Replica %s marked down: connection lost", replica.name)
+
+    def check_all(self):
+        for replica in self.replicas:
+            replica.check(self.max_lag)
+
+    async def start(self):
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.check_all)
+            except Exception as e:
+                logger.warning("Replica health check failed: %s", e)
+            await asyncio.sleep(self.check_interval)
+
+    def any_engine(self):
+        """A healthy replica (round-robin), or the primary when none is"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return self.primary
+        return healthy[next(self._round_robin) % len(healthy)].engine
+
+    async def engine_for_read(self, key: str = None):
+        """Engine to serve a read for this client"""
+        if not self.replicas or await self.wrote_recently(key):
+            return self.primary
+        return self.any_engine()
+
+    def status(self) -> list:
+        return [
+            {"replica": replica.name, "healthy": replica.healthy, "lag_seconds": round(replica.lag, 3), "error": replica.error}
+            for replica in self.replicas
+        ]
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware recording a client's write before its response starts"""
+
+    def __init__(self, app, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and scope.get(WROTE_SCOPE_KEY):
+                authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+                await self.router.note_write(client_key(authorization))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,153 @@
+"""
+Response Cache - public catalogue GETs in the shared cache
+
+Successful GET responses under the catalogue prefixes are stored in the
+shared cache (app.core.cache) for CACHE_TTL_SECONDS, keyed by path and
+normalised query string, then served stale for up to CACHE_STALE_SECONDS
+while one background request refreshes them. Concurrent identical misses
+are coalesced: one goes downstream and the rest share its response. Any
+successful write under those prefixes invalidates the namespaces it can
+affect before its response is sent, in every worker. Routers need no
+changes; rules live here.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.cache import cache, SingleFlight
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+CACHED_PREFIXES = (
+    ("/api/products", "products"),
+    ("/api/categories", "categories"),
+    ("/api/offers", "offers"),
+)
+# Already answered from memory without touching the database
+UNCACHED_PATHS = {"/api/offers/active"}
+# Products carry offer pricing and offers carry product/category targets
+INVALIDATES = (
+    ("/api/products", ("products", "offers")),
+    ("/api/categories", ("categories", "products", "offers")),
+    ("/api/offers", ("offers", "products")),
+    ("/api/auth/change-password", ("auth",)),
+)
+
+logger = logging.getLogger(__name__)
+
+def _match(path: str, rules):
+    for prefix, value in rules:
+        if path == prefix or path.startswith(prefix + "/"):
+            return value
+    return None
+
+def _decode(cached: Optional[bytes]):
+    """(fresh_until, content_type, body) from a stored entry, or None"""
+    if cached is None:
+        return None
+    try:
+        fresh_until, content_type, body = cached.split(b"\n", 2)
+        return float(fresh_until), content_type, body
+    except ValueError:
+        return None
+
+async def _send(send, status_code: int, headers: list, body: bytes, cache_status: bytes):
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": headers + [(b"content-length", str(len(body)).encode()), (b"x-cache", cache_status)],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving and filling the shared cache for catalogue reads"""
+
+    def __init__(self, app):
+        self.app = app
+        self._flights = SingleFlight()
+        self._refreshes = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        if method == "GET":
+            namespace = _match(path, CACHED_PREFIXES) if path not in UNCACHED_PATHS else None
+            if namespace is not None:
+                await self._read(scope, receive, send, namespace)
+                return
+        elif method not in ("HEAD", "OPTIONS"):
+            namespaces = _match(path, INVALIDATES)
+            if namespaces is not None:
+                await self._write(scope, receive, send, namespaces)
+                return
+        await self.app(scope, receive, send)
+
+    async def _read(self, scope, receive, send, namespace: str):
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        entry_key = await cache.entry_key(namespace, f"{scope['path']}?{query}")
+        flight_key = entry_key or f"{scope['path']}?{query}"
+        entry = _decode(await cache.get(entry_key))
+        record_cache("response", entry is not None)
+        if entry is not None:
+            fresh_until, content_type, body = entry
+            if time.time() < fresh_until:
+                await _send(send, 200, [(b"content-type", content_type)], body, b"HIT")
+                return
+            # Stale: answer now and let one request per key refresh it in the background
+            if not self._flights.in_flight(flight_key):
+                refresh = asyncio.ensure_future(self._flights.do(flight_key, lambda: self._fill(dict(scope), entry_key)))
+                self._refreshes.add(refresh)
+                refresh.add_done_callback(self._refreshed)
+            await _send(send, 200, [(b"content-type", content_type)], body, b"STALE")
+            return
+
+        # Identical concurrent misses wait for one downstream call and share its response
+        status_code, headers, body = await self._flights.do(flight_key, lambda: self._fill(scope, entry_key))
+        await _send(send, status_code, headers, body, b"MISS")
+
+    async def _fill(self, scope, entry_key):
+        """Render the response downstream and store it if cacheable"""
+        response = {"status": 500, "headers": [], "body": []}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def collect(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    (name, value) for name, value in message.get("headers", []) if name != b"content-length"
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.app(scope, receive, collect)
+        body = b"".join(response["body"])
+        content_type = dict(response["headers"]).get(b"content-type", b"")
+        if response["status"] == 200 and content_type.startswith(b"application/json"):
+            fresh_until = time.time() + settings.CACHE_TTL_SECONDS
+            await cache.set(
+                entry_key,
+                b"%.3f\n%s\n%s" % (fresh_until, content_type, body),
+                settings.CACHE_TTL_SECONDS + settings.CACHE_STALE_SECONDS
+            )
+        return response["status"], response["headers"], body
+
+    def _refreshed(self, task):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background cache refresh failed: %s", task.exception())
+
+    async def _write(self, scope, receive, send, namespaces):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await cache.invalidate(*namespaces)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -2,31 +2,51 @@
 Security Utilities - JWT & Password Hashing
 """
 
+import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import cache
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.metrics import record_cache
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+# EventSource cannot set headers, so event streams also take ?access_token=
+optional_security = HTTPBearer(auto_error=False)
+
+# Sub-requests of POST /api/batch carry the already-authenticated user here
+BATCH_USER_SCOPE_KEY = "app.batch_user"
+
+# Columns kept in the shared "auth" cache; the rest (password hash,
+# timestamps) load from the database only if a route touches them
+CACHED_USER_FIELDS = ("email", "full_name", "role", "is_active")
+
+# passlib/bcrypt and jose are imported on first use to keep cold starts fast
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """Password hashing context"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -38,6 +58,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_token(token: str) -> dict:
     """Decode JWT token"""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -48,20 +69,33 @@ def decode_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    token = credentials.credentials
+async def load_user(db: Session, user_id: UUID) -> Optional[User]:
+    """User by id through the shared cache, attached to `db` so routes can still update it"""
+    entry_key = await cache.entry_key("auth", str(user_id))
+    cached = await cache.get(entry_key)
+    record_cache("auth", cached is not None)
+    if cached is not None:
+        user = User(id=user_id, **json.loads(cached))
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        fields = {name: getattr(user, name) for name in CACHED_USER_FIELDS}
+        await cache.set(entry_key, json.dumps(fields).encode(), settings.AUTH_CACHE_SECONDS)
+    return user
+
+async def user_from_token(db: Session, token: str) -> User:
+    """The active user a bearer token was issued to; 401 otherwise"""
     payload = decode_token(token)
     user_id: str = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = UUID(user_id)
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await load_user(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,6 +108,32 @@ async def get_current_user(
         )
     return user
 
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user"""
+    batch_user = request.scope.get(BATCH_USER_SCOPE_KEY)
+    if batch_user is not None:
+        return batch_user
+    return await user_from_token(db, credentials.credentials)
+
+async def get_stream_user(
+    access_token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Current user for an event stream: Authorization header or ?access_token="""
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await user_from_token(db, token)
+
 async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     """Require admin role"""
     if current_user.role != "admin":
@@ -0,0 +1,51 @@
+"""
+Startup Profiling and Database Warm-up
+"""
+
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from app.core.metrics import registry, Gauge
+
+STARTUP_PHASES = registry.register(Gauge(
+    "startup_phase_seconds", "Time spent in each startup phase", ("phase",)))
+
+
+class StartupProfile:
+    """Record how long each startup phase took"""
+
+    def __init__(self):
+        self.phases = {}
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase] = seconds
+        STARTUP_PHASES.set(seconds, phase)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> str:
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()]
+        return "⏱  Startup: " + ", ".join(parts)
+
+
+startup_profile = StartupProfile()
+
+def warm_pool(engine, connections: int):
+    """Open and validate pooled connections so the first requests don't pay for connecting"""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
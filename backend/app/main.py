@@ -3,27 +3,94 @@ Nellusoru Manufacturers and Services - Backend Application
 FastAPI Main Entry Point
 """
 
-from fastapi import FastAPI
+import time
+_import_started = time.perf_counter()
+
+import asyncio
+import hmac
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, JSONResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api import auth, categories, products, customers, invoices, offers, enquiries, dashboard
+from app.core.database import engine, replica_router
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.query_trace import QueryTraceMiddleware
+from app.core.cache import cache
+from app.core.response_cache import ResponseCacheMiddleware
+from app.core.replicas import ReadYourWritesMiddleware
+from app.core.startup import startup_profile, warm_pool
+from app.core.health import loop_lag_monitor, check_database, check_pool, check_pdf_workers, check_event_loop, check_replicas
+from app.migrations import upgrade, current_version, head_version
+from app.services.enquiry_intake import enquiry_intake
+from app.services.pdf_worker import pdf_workers
+from app.services.images import image_workers
+from app.services.jobs import job_workers
+from app.services.notifications import dispatcher
+from app.services.events import event_bus
+from app.services.dashboard_feed import dashboard_feed
+from app.services.offer_schedule import offer_schedule
+from app.services.catalogue_snapshot import catalogue_snapshot
+from app.services.business_settings import business_settings as business_settings_cache
+from app.api import auth, categories, products, customers, invoices, offers, enquiries, dashboard, analytics, reports, jobs, archive, business_settings, media, storefront, batch
 
-# Create database tables
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup
+def prepare_database():
+    """Verify the schema version (one query), apply pending migrations if allowed, warm the pool and settings
+
+    A failed migration is raised, so the worker does not serve requests
+    against a half-upgraded schema.
+    """
+    with startup_profile.phase("schema_check"):
+        current, head = current_version(engine), head_version()
+    if current >= head:
+        print(f"✅ Database schema is up to date (version {current})")
+    elif settings.AUTO_MIGRATE:
+        with startup_profile.phase("migrations"):
+            applied = upgrade(engine)
+        print(f"✅ Database migrated from version {current} to {head} ({len(applied)} applied)")
+    else:
+        print(f"⚠️  Database schema is at version {current}, latest is {head}; run `python -m app.migrations upgrade`")
     try:
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created successfully")
+        with startup_profile.phase("pool_warmup"):
+            warm_pool(engine, settings.POOL_WARM_CONNECTIONS)
+        with startup_profile.phase("settings_load"):
+            business_settings_cache.get()
     except Exception as e:
-        print(f"⚠️  Database table creation failed: {e}")
+        print(f"⚠️  Database warm-up failed: {e}")
         print("Application will continue, but database operations may fail")
+    print(startup_profile.report())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    if settings.LAZY_STARTUP:
+        # Serve immediately; the database is prepared in the background
+        app.state.database_ready = asyncio.create_task(asyncio.to_thread(prepare_database))
+    else:
+        await asyncio.to_thread(prepare_database)
+    await cache.start()
+    await replica_router.start()
+    await catalogue_snapshot.start()
+    await enquiry_intake.start()
+    await job_workers.start()
+    loop_lag_monitor.start()
+    await event_bus.start()
+    await dashboard_feed.start()
+    await offer_schedule.start()
     yield
     # Shutdown
-    pass
+    await offer_schedule.stop()
+    await dashboard_feed.stop()
+    await event_bus.stop()
+    await loop_lag_monitor.stop()
+    await job_workers.stop()
+    await dispatcher.close()
+    await enquiry_intake.stop()
+    pdf_workers.shutdown()
+    image_workers.shutdown()
+    await replica_router.stop()
+    await cache.stop()
 
 app = FastAPI(
     title="Nellusoru Manufacturers and Services API",
@@ -32,6 +99,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Shared cache for public catalogue reads (innermost, so hits still get CORS headers)
+app.add_middleware(ResponseCacheMiddleware)
+
+# Clients that just wrote read from the primary (only needed with replicas)
+if replica_router.replicas:
+    app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -41,9 +115,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query tracing (opt-in)
+if settings.QUERY_TRACE_ENABLED:
+    app.add_middleware(QueryTraceMiddleware)
+
+# Request metrics (outermost, so CORS handling is included in latency)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(archive.router, prefix="/api/archive", tags=["Archive"])
+app.include_router(business_settings.router, prefix="/api/settings", tags=["Settings"])
+app.include_router(media.router, prefix="/api/media", tags=["Media"])
+app.include_router(storefront.router, prefix="/api/storefront", tags=["Storefront"])
+app.include_router(batch.router, prefix="/api/batch", tags=["Batch"])
 app.include_router(categories.router, prefix="/api/categories", tags=["Categories"])
 app.include_router(products.router, prefix="/api/products", tags=["Products"])
 app.include_router(customers.router, prefix="/api/customers", tags=["Customers"])
@@ -51,6 +141,8 @@ app.include_router(invoices.router, prefix="/api/invoices", tags=["Invoices"])
 app.include_router(offers.router, prefix="/api/offers", tags=["Offers"])
 app.include_router(enquiries.router, prefix="/api/enquiries", tags=["Enquiries"])
 
+startup_profile.record("app_import", time.perf_counter() - _import_started)
+
 @app.get("/")
 async def root():
     return {
@@ -62,5 +154,48 @@ async def root():
     }
 
 @app.get("/api/health")
+@app.get("/api/health/live")
 async def health_check():
+    """Liveness: the process is up and serving requests"""
     return {"status": "healthy", "service": "Nellusoru API"}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness: dependencies are reachable and the worker has headroom; 503 otherwise"""
+    database_ready = getattr(app.state, "database_ready", None)
+    if database_ready is not None and not database_ready.done():
+        return JSONResponse(status_code=503, content={"status": "starting", "service": "Nellusoru API"})
+    if database_ready is not None and database_ready.exception() is not None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "failed", "service": "Nellusoru API", "error": str(database_ready.exception())}
+        )
+
+    def timed(check, *args):
+        start = time.perf_counter()
+        result = check(*args)
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    checks = {
+        "database": await check_database(engine),
+        "pool": timed(check_pool, engine),
+        "replicas": timed(check_replicas, replica_router),
+        "pdf_workers": timed(check_pdf_workers, pdf_workers),
+        "event_loop": timed(check_event_loop),
+    }
+    ready = all(check["ok"] for check in checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "unavailable", "service": "Nellusoru API", "checks": checks}
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics for this worker process; needs the METRICS_TOKEN bearer token"""
+    authorization = request.headers.get("authorization", "")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not settings.METRICS_TOKEN or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        # Indistinguishable from a missing route
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1 @@
+from app.migrations.runner import upgrade, stamp, current_version, head_version, load_migrations
@@ -0,0 +1,37 @@
+"""
+Migration CLI
+
+    python -m app.migrations upgrade [--target N]
+    python -m app.migrations current
+    python -m app.migrations stamp N
+"""
+
+import argparse
+import logging
+
+from app.core.database import engine
+from app.migrations import upgrade, stamp, current_version, head_version
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the database schema version")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="apply pending migrations")
+    upgrade_parser.add_argument("--target", type=int)
+    subparsers.add_parser("current", help="show applied and latest versions")
+    stamp_parser = subparsers.add_parser("stamp", help="record a version without running migrations")
+    stamp_parser.add_argument("version", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.target)
+        print(f"Applied: {applied or 'nothing'}; now at version {current_version(engine)}")
+    elif args.command == "current":
+        print(f"Current: {current_version(engine)}; latest: {head_version()}")
+    elif args.command == "stamp":
+        stamp(engine, args.version)
+        print(f"Stamped version {args.version}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Schema Migration Runner
+
+Migrations live in app/migrations/versions as mNNNN_<name>.py modules, each
+with an ``upgrade(op)`` function and an optional ``TRANSACTIONAL = False``
+for steps such as CREATE INDEX CONCURRENTLY. Applied versions are recorded
+in the schema_version table.
+
+Each migration declares the tables, columns and indexes it creates as
+SQLAlchemy Core objects in its own MetaData, frozen as they were at that
+version; migrations never import the ORM models, which keep changing. The
+``op`` helpers skip objects that already exist, so databases built from
+database/schema.sql or by the old create_all startup upgrade cleanly.
+"""
+
+import importlib
+import logging
+import pkgutil
+from contextlib import contextmanager
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.models import SchemaVersion
+from app.migrations import versions as versions_package
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_advisory_lock so only one worker migrates at a time
+ADVISORY_LOCK_KEY = 734_210_001
+
+
+class Migration:
+    def __init__(self, version: int, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+        self.transactional = getattr(module, "TRANSACTIONAL", True)
+
+    def upgrade(self, op):
+        self.module.upgrade(op)
+
+
+def load_migrations() -> list:
+    """Discover migration modules in version order"""
+    migrations = []
+    for info in pkgutil.iter_modules(versions_package.__path__):
+        if not info.name.startswith("m"):
+            continue
+        version = int(info.name[1:5])
+        module = importlib.import_module(f"{versions_package.__name__}.{info.name}")
+        migrations.append(Migration(version, info.name[6:], module))
+    migrations.sort(key=lambda migration: migration.version)
+    return migrations
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+def current_version(engine) -> int:
+    """Applied schema version; a single cheap query, 0 for an unversioned database"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+    except SQLAlchemyError:
+        return 0
+
+
+class Operations:
+    """Idempotent schema operations handed to each migration"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.dialect = conn.dialect.name
+
+    def _inspector(self):
+        return inspect(self.conn)
+
+    def execute(self, sql: str, **params):
+        self.conn.execute(text(sql), params)
+
+    def has_table(self, table_name: str) -> bool:
+        return self._inspector().has_table(table_name)
+
+    def has_index(self, table_name: str, index_name: str) -> bool:
+        return any(index["name"] == index_name for index in self._inspector().get_indexes(table_name))
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return any(column["name"] == column_name for column in self._inspector().get_columns(table_name))
+
+    def create_table(self, table):
+        """Create a table with its indexes, or add the indexes an existing copy lacks"""
+        if not self.has_table(table.name):
+            self.conn.execute(CreateTable(table))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            self.create_index(index)
+
+    def create_index(self, index, concurrently: bool = False):
+        """Create an index; CONCURRENTLY needs TRANSACTIONAL = False"""
+        if self.has_index(index.table.name, index.name):
+            return
+        sql = str(CreateIndex(index).compile(dialect=self.conn.dialect))
+        if concurrently and self.dialect == "postgresql":
+            sql = sql.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+        self.conn.execute(text(sql))
+
+    def drop_index(self, table_name: str, index_name: str, concurrently: bool = False):
+        if not self.has_index(table_name, index_name):
+            return
+        keyword = "DROP INDEX CONCURRENTLY" if concurrently and self.dialect == "postgresql" else "DROP INDEX"
+        self.conn.execute(text(f"{keyword} {index_name}"))
+
+    def add_column(self, table_name: str, column):
+        """Add a column to an existing table"""
+        if self.has_column(table_name, column.name):
+            return
+        column_type = column.type.compile(dialect=self.conn.dialect)
+        sql = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}"
+        if column.server_default is not None:
+            default = column.server_default.arg
+            default = default.text if hasattr(default, "text") else f"'{default}'"
+            sql += f" DEFAULT {default}"
+        if not column.nullable and column.server_default is not None:
+            sql += " NOT NULL"
+        self.conn.execute(text(sql))
+
+    def ensure_updated_at_triggers(self, *table_names: str):
+        """Install the updated_at trigger on the given tables (PostgreSQL)"""
+        if self.dialect != "postgresql":
+            # SQLite relies on the models' onupdate=func.now()
+            return
+        self.execute("""
+            CREATE OR REPLACE FUNCTION update_updated_at_column()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                NEW.updated_at = CURRENT_TIMESTAMP;
+                RETURN NEW;
+            END;
+            $$ language 'plpgsql'
+        """)
+        for table_name in table_names:
+            trigger = f"update_{table_name}_updated_at"
+            exists = self.conn.execute(
+                text("SELECT 1 FROM pg_trigger WHERE tgname = :name"), {"name": trigger}
+            ).scalar()
+            if not exists:
+                self.execute(
+                    f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table_name} "
+                    f"FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+                )
+
+
+@contextmanager
+def _migration_lock(engine):
+    """Serialize migrations across processes on PostgreSQL"""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            conn.commit()
+
+def _record(conn, migration: Migration):
+    conn.execute(SchemaVersion.__table__.insert(), {"version": migration.version, "name": migration.name})
+
+def upgrade(engine, target: int = None) -> list:
+    """Apply pending migrations up to target (default: latest); returns applied versions"""
+    applied = []
+    with _migration_lock(engine):
+        current = current_version(engine)
+        for migration in load_migrations():
+            if migration.version <= current or (target is not None and migration.version > target):
+                continue
+            logger.info("Applying migration %04d_%s", migration.version, migration.name)
+            if migration.transactional:
+                with engine.begin() as conn:
+                    migration.upgrade(Operations(conn))
+                    SchemaVersion.__table__.create(bind=conn, checkfirst=True)
+                    _record(conn, migration)
+            else:
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    migration.upgrade(Operations(conn))
+                with engine.begin() as conn:
+                    SchemaVersion.__table__.create(bind=conn, checkfirst=True)
+                    _record(conn, migration)
+            applied.append(migration.version)
+    return applied
+
+def stamp(engine, version: int):
+    """Mark the database as being at a version without running migrations"""
+    with engine.begin() as conn:
+        SchemaVersion.__table__.create(bind=conn, checkfirst=True)
+        for migration in load_migrations():
+            if migration.version <= version:
+                exists = conn.execute(
+                    text("SELECT 1 FROM schema_version WHERE version = :version"),
+                    {"version": migration.version}
+                ).scalar()
+                if not exists:
+                    _record(conn, migration)
@@ -0,0 +1,194 @@
+"""
+Baseline schema: the storefront and billing tables, the revenue rollups,
+their indexes and the updated_at triggers, as they stood when migrations
+were introduced. On databases created from database/schema.sql or by the
+old create_all startup this only fills in the tables and indexes that are
+missing.
+"""
+
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey
+from sqlalchemy import String, Boolean, Integer, Text, DateTime, Date, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+metadata = MetaData()
+
+def timestamps():
+    return (
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+    )
+
+users = Table(
+    "users", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("email", String(255), unique=True, nullable=False, index=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("full_name", String(255), nullable=False),
+    Column("role", String(50)),
+    Column("is_active", Boolean),
+    *timestamps(),
+)
+
+categories = Table(
+    "categories", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("slug", String(255), unique=True, nullable=False, index=True),
+    Column("description", Text),
+    Column("image_url", String(500)),
+    Column("is_active", Boolean),
+    Column("display_order", Integer),
+    *timestamps(),
+)
+
+products = Table(
+    "products", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("category_id", UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL")),
+    Column("name", String(255), nullable=False),
+    Column("slug", String(255), unique=True, nullable=False, index=True),
+    Column("brand", String(255)),
+    Column("description", Text),
+    Column("specifications", Text),
+    Column("image_url", String(500)),
+    Column("price", Numeric(12, 2)),
+    Column("unit", String(50)),
+    Column("min_order_quantity", Integer),
+    Column("is_featured", Boolean),
+    Column("is_active", Boolean),
+    *timestamps(),
+)
+Index("idx_products_category", products.c.category_id)
+Index(
+    "idx_products_featured",
+    products.c.is_featured,
+    postgresql_where=(products.c.is_featured == True),
+    sqlite_where=(products.c.is_featured == True),
+)
+
+customers = Table(
+    "customers", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("company_name", String(255)),
+    Column("contact_person", String(255), nullable=False),
+    Column("email", String(255), index=True),
+    Column("phone", String(20), nullable=False, index=True),
+    Column("alternate_phone", String(20)),
+    Column("address", Text),
+    Column("city", String(100)),
+    Column("state", String(100)),
+    Column("pincode", String(10)),
+    Column("gst_number", String(20)),
+    Column("notes", Text),
+    Column("is_active", Boolean),
+    *timestamps(),
+)
+
+invoices = Table(
+    "invoices", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("invoice_number", String(50), unique=True, nullable=False, index=True),
+    Column("customer_id", UUID(as_uuid=True), ForeignKey("customers.id", ondelete="SET NULL")),
+    Column("invoice_date", Date, nullable=False, server_default=func.current_date()),
+    Column("due_date", Date),
+    Column("subtotal", Numeric(12, 2), nullable=False),
+    Column("tax_rate", Numeric(5, 2)),
+    Column("tax_amount", Numeric(12, 2)),
+    Column("discount_amount", Numeric(12, 2)),
+    Column("total_amount", Numeric(12, 2), nullable=False),
+    Column("status", String(50)),
+    Column("notes", Text),
+    Column("terms", Text),
+    Column("created_by", UUID(as_uuid=True), ForeignKey("users.id")),
+    *timestamps(),
+)
+Index("idx_invoices_date", invoices.c.invoice_date)
+Index("idx_invoices_status", invoices.c.status)
+
+invoice_items = Table(
+    "invoice_items", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("invoice_id", UUID(as_uuid=True), ForeignKey("invoices.id", ondelete="CASCADE")),
+    Column("product_id", UUID(as_uuid=True), ForeignKey("products.id", ondelete="SET NULL")),
+    Column("description", String(500), nullable=False),
+    Column("quantity", Numeric(10, 2), nullable=False),
+    Column("unit", String(50)),
+    Column("unit_price", Numeric(12, 2), nullable=False),
+    Column("discount_percent", Numeric(5, 2)),
+    Column("amount", Numeric(12, 2), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+Index("idx_invoice_items_invoice", invoice_items.c.invoice_id)
+
+offers = Table(
+    "offers", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("image_url", String(500)),
+    Column("start_date", Date),
+    Column("end_date", Date),
+    Column("discount_percent", Numeric(5, 2)),
+    Column("is_active", Boolean),
+    Column("display_order", Integer),
+    *timestamps(),
+)
+Index(
+    "idx_offers_active",
+    offers.c.is_active,
+    postgresql_where=(offers.c.is_active == True),
+    sqlite_where=(offers.c.is_active == True),
+)
+
+enquiries = Table(
+    "enquiries", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("email", String(255)),
+    Column("phone", String(20), nullable=False),
+    Column("company", String(255)),
+    Column("subject", String(255)),
+    Column("message", Text, nullable=False),
+    Column("product_id", UUID(as_uuid=True), ForeignKey("products.id", ondelete="SET NULL")),
+    Column("status", String(50)),
+    Column("notes", Text),
+    *timestamps(),
+)
+Index("idx_enquiries_status", enquiries.c.status)
+Index("idx_enquiries_created", enquiries.c.created_at)
+
+Table(
+    "revenue_rollups", metadata,
+    Column("period", String(10), primary_key=True),
+    Column("bucket_start", Date, primary_key=True),
+    Column("invoice_count", Integer, nullable=False),
+    Column("billed_amount", Numeric(14, 2), nullable=False),
+    Column("paid_count", Integer, nullable=False),
+    Column("revenue", Numeric(14, 2), nullable=False),
+)
+
+Table(
+    "customer_revenue_rollups", metadata,
+    Column("period", String(10), primary_key=True),
+    Column("bucket_start", Date, primary_key=True),
+    Column("customer_id", UUID(as_uuid=True), primary_key=True),
+    Column("invoice_count", Integer, nullable=False),
+    Column("revenue", Numeric(14, 2), nullable=False),
+)
+
+Table(
+    "product_revenue_rollups", metadata,
+    Column("period", String(10), primary_key=True),
+    Column("bucket_start", Date, primary_key=True),
+    Column("product_id", UUID(as_uuid=True), primary_key=True),
+    Column("quantity", Numeric(14, 2), nullable=False),
+    Column("revenue", Numeric(14, 2), nullable=False),
+)
+
+def upgrade(op):
+    for table in metadata.sorted_tables:
+        op.create_table(table)
+    op.ensure_updated_at_triggers(
+        *(table.name for table in metadata.sorted_tables if "updated_at" in table.c)
+    )
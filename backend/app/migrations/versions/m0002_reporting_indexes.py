@@ -0,0 +1,36 @@
+"""
+Reporting indexes on invoices for customer statements and receivables
+ageing. Built concurrently so the invoices table stays writable.
+idx_invoices_customer is superseded by idx_invoices_customer_date.
+"""
+
+from sqlalchemy import MetaData, Table, Column, Index, String, Date, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+
+TRANSACTIONAL = False
+
+invoices = Table(
+    "invoices", MetaData(),
+    Column("customer_id", UUID(as_uuid=True)),
+    Column("invoice_date", Date),
+    Column("due_date", Date),
+    Column("total_amount", Numeric(12, 2)),
+    Column("status", String(50)),
+)
+
+customer_date = Index("idx_invoices_customer_date", invoices.c.customer_id, invoices.c.invoice_date)
+
+# Only outstanding invoices are indexed
+unpaid_due = Index(
+    "idx_invoices_unpaid_due",
+    invoices.c.customer_id,
+    invoices.c.due_date,
+    postgresql_include=["invoice_date", "total_amount"],
+    postgresql_where=(invoices.c.status == "pending"),
+    sqlite_where=(invoices.c.status == "pending"),
+)
+
+def upgrade(op):
+    op.create_index(customer_date, concurrently=True)
+    op.create_index(unpaid_due, concurrently=True)
+    op.drop_index("invoices", "idx_invoices_customer", concurrently=True)
@@ -0,0 +1,42 @@
+"""
+Background job queue table.
+"""
+
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey
+from sqlalchemy import String, Text, DateTime, Integer, LargeBinary, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", UUID(as_uuid=True), primary_key=True))
+
+jobs = Table(
+    "jobs", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("kind", String(50), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("payload", JSON, nullable=False),
+    Column("result", JSON),
+    Column("error", Text),
+    Column("progress", Integer, nullable=False),
+    Column("progress_message", String(255)),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("run_after", DateTime(timezone=True), nullable=False),
+    Column("locked_by", String(100)),
+    Column("locked_at", DateTime(timezone=True)),
+    Column("artifact", LargeBinary),
+    Column("artifact_name", String(255)),
+    Column("artifact_type", String(100)),
+    Column("created_by", UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL")),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("started_at", DateTime(timezone=True)),
+    Column("finished_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+Index("idx_jobs_status_run_after", jobs.c.status, jobs.c.run_after)
+
+def upgrade(op):
+    op.create_table(jobs)
+    op.ensure_updated_at_triggers("jobs")
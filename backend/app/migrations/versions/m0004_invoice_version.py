@@ -0,0 +1,8 @@
+"""
+Version counter on invoices for optimistic locking (If-Match / ETag).
+"""
+
+from sqlalchemy import Column, Integer
+
+def upgrade(op):
+    op.add_column("invoices", Column("version", Integer, nullable=False, server_default="1"))
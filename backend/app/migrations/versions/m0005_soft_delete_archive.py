@@ -0,0 +1,96 @@
+"""
+Soft delete (deleted_at) on invoices, enquiries and customers, partial
+indexes for live-row listings, and the archive tables. Indexes are built
+concurrently so the live tables stay writable.
+"""
+
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey
+from sqlalchemy import String, Text, DateTime, Date, Numeric, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+TRANSACTIONAL = False
+
+SOFT_DELETE_TABLES = ("invoices", "enquiries", "customers")
+
+def live_created_index(table_name: str) -> Index:
+    table = Table(
+        table_name, MetaData(),
+        Column("created_at", DateTime(timezone=True)),
+        Column("deleted_at", DateTime(timezone=True)),
+    )
+    return Index(
+        f"idx_{table_name}_live_created",
+        table.c.created_at,
+        postgresql_where=table.c.deleted_at.is_(None),
+        sqlite_where=table.c.deleted_at.is_(None),
+    )
+
+archive = MetaData()
+
+invoices_archive = Table(
+    "invoices_archive", archive,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("invoice_number", String(50), nullable=False),
+    Column("customer_id", UUID(as_uuid=True)),
+    Column("invoice_date", Date, nullable=False),
+    Column("due_date", Date),
+    Column("subtotal", Numeric(12, 2), nullable=False),
+    Column("tax_rate", Numeric(5, 2)),
+    Column("tax_amount", Numeric(12, 2)),
+    Column("discount_amount", Numeric(12, 2)),
+    Column("total_amount", Numeric(12, 2), nullable=False),
+    Column("status", String(50)),
+    Column("notes", Text),
+    Column("terms", Text),
+    Column("created_by", UUID(as_uuid=True)),
+    Column("version", Integer, nullable=False),
+    Column("deleted_at", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+    Column("archived_at", DateTime(timezone=True), nullable=False),
+)
+Index("idx_invoices_archive_customer_date", invoices_archive.c.customer_id, invoices_archive.c.invoice_date)
+Index("idx_invoices_archive_created", invoices_archive.c.created_at)
+Index("idx_invoices_archive_number", invoices_archive.c.invoice_number)
+
+invoice_items_archive = Table(
+    "invoice_items_archive", archive,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("invoice_id", UUID(as_uuid=True), ForeignKey("invoices_archive.id", ondelete="CASCADE")),
+    Column("product_id", UUID(as_uuid=True)),
+    Column("description", String(500), nullable=False),
+    Column("quantity", Numeric(10, 2), nullable=False),
+    Column("unit", String(50)),
+    Column("unit_price", Numeric(12, 2), nullable=False),
+    Column("discount_percent", Numeric(5, 2)),
+    Column("amount", Numeric(12, 2), nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+)
+Index("idx_invoice_items_archive_invoice", invoice_items_archive.c.invoice_id)
+
+enquiries_archive = Table(
+    "enquiries_archive", archive,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("email", String(255)),
+    Column("phone", String(20), nullable=False),
+    Column("company", String(255)),
+    Column("subject", String(255)),
+    Column("message", Text, nullable=False),
+    Column("product_id", UUID(as_uuid=True)),
+    Column("status", String(50)),
+    Column("notes", Text),
+    Column("deleted_at", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+    Column("archived_at", DateTime(timezone=True), nullable=False),
+)
+Index("idx_enquiries_archive_created", enquiries_archive.c.created_at)
+
+def upgrade(op):
+    for table_name in SOFT_DELETE_TABLES:
+        op.add_column(table_name, Column("deleted_at", DateTime(timezone=True)))
+    for table_name in SOFT_DELETE_TABLES:
+        op.create_index(live_created_index(table_name), concurrently=True)
+    for table in archive.sorted_tables:
+        op.create_table(table)
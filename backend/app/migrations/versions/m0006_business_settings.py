@@ -0,0 +1,31 @@
+"""
+Business settings table (already present on databases built from
+database/schema.sql) seeded with any missing default keys and the
+_version counter used for cache invalidation.
+"""
+
+import uuid
+
+from sqlalchemy import MetaData, Table, Column, String, Text, DateTime, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.services.business_settings import DEFAULTS, VERSION_KEY
+
+settings = Table(
+    "settings", MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("key", String(100), unique=True, nullable=False),
+    Column("value", Text),
+    Column("description", String(255)),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def upgrade(op):
+    op.create_table(settings)
+    op.ensure_updated_at_triggers("settings")
+    rows = {**DEFAULTS, VERSION_KEY: ("1", "Bumped on every settings change")}
+    for key, (value, description) in rows.items():
+        exists = op.conn.execute(select(settings.c.key).where(settings.c.key == key)).first()
+        if not exists:
+            op.conn.execute(settings.insert().values(id=uuid.uuid4(), key=key, value=value, description=description))
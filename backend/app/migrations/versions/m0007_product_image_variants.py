@@ -0,0 +1,8 @@
+"""
+Resized image variants for uploaded product images.
+"""
+
+from sqlalchemy import Column, JSON
+
+def upgrade(op):
+    op.add_column("products", Column("image_variants", JSON))
@@ -0,0 +1,23 @@
+"""
+Offer targets: the categories and products an offer discounts.
+"""
+
+from sqlalchemy import MetaData, Table, Column, Index, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+metadata = MetaData()
+
+for referenced in ("offers", "categories", "products"):
+    Table(referenced, metadata, Column("id", UUID(as_uuid=True), primary_key=True))
+
+offer_targets = Table(
+    "offer_targets", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("offer_id", UUID(as_uuid=True), ForeignKey("offers.id", ondelete="CASCADE"), nullable=False),
+    Column("category_id", UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE")),
+    Column("product_id", UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE")),
+)
+Index("idx_offer_targets_offer", offer_targets.c.offer_id)
+
+def upgrade(op):
+    op.create_table(offer_targets)
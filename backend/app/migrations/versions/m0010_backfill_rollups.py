@@ -0,0 +1,14 @@
+"""
+Backfill the revenue rollups from live and archived invoices. The rollups
+are only maintained incrementally, so invoices written before they existed
+were missing from the dashboard and analytics totals.
+"""
+
+from sqlalchemy.orm import Session
+
+from app.services.analytics import rebuild_rollups
+
+def upgrade(op):
+    with Session(bind=op.conn) as db:
+        rebuild_rollups(db)
+        db.flush()
@@ -3,5 +3,10 @@ from app.models.category import Category
 from app.models.product import Product
 from app.models.customer import Customer
 from app.models.invoice import Invoice, InvoiceItem
-from app.models.offer import Offer
+from app.models.offer import Offer, OfferTarget
 from app.models.enquiry import Enquiry
+from app.models.analytics import RevenueRollup, CustomerRevenueRollup, ProductRevenueRollup
+from app.models.schema_version import SchemaVersion
+from app.models.job import Job
+from app.models.archive import InvoiceArchive, InvoiceItemArchive, EnquiryArchive
+from app.models.setting import Setting
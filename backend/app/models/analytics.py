@@ -0,0 +1,37 @@
+"""
+Analytics Rollup Models
+"""
+
+from sqlalchemy import Column, String, Integer, Date, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+class RevenueRollup(Base):
+    __tablename__ = "revenue_rollups"
+
+    period = Column(String(10), primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    billed_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+
+class CustomerRevenueRollup(Base):
+    __tablename__ = "customer_revenue_rollups"
+
+    period = Column(String(10), primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    customer_id = Column(UUID(as_uuid=True), primary_key=True)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+
+class ProductRevenueRollup(Base):
+    __tablename__ = "product_revenue_rollups"
+
+    period = Column(String(10), primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
+    quantity = Column(Numeric(14, 2), nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
@@ -0,0 +1,94 @@
+"""
+Archive Models
+
+Paid invoices and closed enquiries older than ARCHIVE_AFTER_MONTHS are
+moved here so the live tables stay small. Columns mirror the live tables,
+without foreign keys, plus archived_at.
+"""
+
+from sqlalchemy import Column, String, Text, DateTime, Date, Numeric, ForeignKey, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+class InvoiceArchive(Base):
+    __tablename__ = "invoices_archive"
+
+    archived = True
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    invoice_number = Column(String(50), nullable=False)
+    customer_id = Column(UUID(as_uuid=True))
+    invoice_date = Column(Date, nullable=False)
+    due_date = Column(Date)
+    subtotal = Column(Numeric(12, 2), nullable=False, default=0)
+    tax_rate = Column(Numeric(5, 2), default=0)
+    tax_amount = Column(Numeric(12, 2), default=0)
+    discount_amount = Column(Numeric(12, 2), default=0)
+    total_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    status = Column(String(50))
+    notes = Column(Text)
+    terms = Column(Text)
+    created_by = Column(UUID(as_uuid=True))
+    version = Column(Integer, nullable=False, default=1)
+    deleted_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    customer = relationship(
+        "Customer",
+        primaryjoin="foreign(InvoiceArchive.customer_id) == Customer.id",
+        viewonly=True
+    )
+    items = relationship("InvoiceItemArchive", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("idx_invoices_archive_customer_date", "customer_id", "invoice_date"),
+        Index("idx_invoices_archive_created", "created_at"),
+        Index("idx_invoices_archive_number", "invoice_number"),
+    )
+
+
+class InvoiceItemArchive(Base):
+    __tablename__ = "invoice_items_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices_archive.id", ondelete="CASCADE"))
+    product_id = Column(UUID(as_uuid=True))
+    description = Column(String(500), nullable=False)
+    quantity = Column(Numeric(10, 2), nullable=False, default=1)
+    unit = Column(String(50))
+    unit_price = Column(Numeric(12, 2), nullable=False)
+    discount_percent = Column(Numeric(5, 2), default=0)
+    amount = Column(Numeric(12, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("idx_invoice_items_archive_invoice", "invoice_id"),
+    )
+
+
+class EnquiryArchive(Base):
+    __tablename__ = "enquiries_archive"
+
+    archived = True
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    name = Column(String(255), nullable=False)
+    email = Column(String(255))
+    phone = Column(String(20), nullable=False)
+    company = Column(String(255))
+    subject = Column(String(255))
+    message = Column(Text, nullable=False)
+    product_id = Column(UUID(as_uuid=True))
+    status = Column(String(50))
+    notes = Column(Text)
+    deleted_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("idx_enquiries_archive_created", "created_at"),
+    )
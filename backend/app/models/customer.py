@@ -3,7 +3,7 @@ Customer Model
 """
 
 import uuid
-from sqlalchemy import Column, String, Boolean, Text, DateTime
+from sqlalchemy import Column, String, Boolean, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -25,8 +25,18 @@ class Customer(Base):
     gst_number = Column(String(20))
     notes = Column(Text)
     is_active = Column(Boolean, default=True)
+    deleted_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     invoices = relationship("Invoice", back_populates="customer")
+
+    __table_args__ = (
+        Index(
+            "idx_customers_live_created",
+            "created_at",
+            postgresql_where=deleted_at.is_(None),
+            sqlite_where=deleted_at.is_(None),
+        ),
+    )
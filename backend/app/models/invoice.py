@@ -3,7 +3,7 @@ Invoice and Invoice Items Models
 """
 
 import uuid
-from sqlalchemy import Column, String, Boolean, Text, DateTime, Date, Numeric, ForeignKey, Integer
+from sqlalchemy import Column, String, Boolean, Text, DateTime, Date, Numeric, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,6 +26,9 @@ class Invoice(Base):
     notes = Column(Text)
     terms = Column(Text)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    # Optimistic locking: bumped on every update, sent to clients as the ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    deleted_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -33,6 +36,31 @@ class Invoice(Base):
     customer = relationship("Customer", back_populates="invoices")
     items = relationship("InvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
 
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Customer statements: one customer's invoices in date order
+        Index("idx_invoices_customer_date", "customer_id", "invoice_date"),
+        Index("idx_invoices_date", "invoice_date"),
+        Index("idx_invoices_status", "status"),
+        # Default listings: newest live (not deleted) invoices first
+        Index(
+            "idx_invoices_live_created",
+            "created_at",
+            postgresql_where=deleted_at.is_(None),
+            sqlite_where=deleted_at.is_(None),
+        ),
+        # Covers the receivables ageing report: only live outstanding invoices are indexed
+        Index(
+            "idx_invoices_unpaid_due",
+            "customer_id",
+            "due_date",
+            postgresql_include=["invoice_date", "total_amount"],
+            postgresql_where=(status == "pending") & deleted_at.is_(None),
+            sqlite_where=(status == "pending") & deleted_at.is_(None),
+        ),
+    )
+
 
 class InvoiceItem(Base):
     __tablename__ = "invoice_items"
@@ -50,3 +78,7 @@ class InvoiceItem(Base):
 
     # Relationships
     invoice = relationship("Invoice", back_populates="items")
+
+    __table_args__ = (
+        Index("idx_invoice_items_invoice", "invoice_id"),
+    )
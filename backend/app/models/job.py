@@ -0,0 +1,45 @@
+"""
+Background Job Model
+"""
+
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Text, DateTime, Integer, LargeBinary, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON)
+    error = Column(Text)
+    progress = Column(Integer, nullable=False, default=0)
+    progress_message = Column(String(255))
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime(timezone=True))
+    # Downloadable output (e.g. a rendered PDF); only loaded when asked for
+    artifact = deferred(Column(LargeBinary))
+    artifact_name = Column(String(255))
+    artifact_type = Column(String(100))
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Workers claim the oldest runnable job
+        Index("idx_jobs_status_run_after", "status", "run_after"),
+    )
@@ -1,10 +1,11 @@
 """
-Offer Model
+Offer and Offer Target Models
 """
 
 import uuid
-from sqlalchemy import Column, String, Boolean, Integer, Text, DateTime, Date, Numeric
+from sqlalchemy import Column, String, Boolean, Integer, Text, DateTime, Date, Numeric, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -22,3 +23,37 @@ class Offer(Base):
     display_order = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships; an offer without targets is a banner and discounts nothing
+    targets = relationship("OfferTarget", cascade="all, delete-orphan", lazy="selectin")
+
+    @property
+    def category_ids(self) -> list:
+        return [target.category_id for target in self.targets if target.category_id]
+
+    @property
+    def product_ids(self) -> list:
+        return [target.product_id for target in self.targets if target.product_id]
+
+    __table_args__ = (
+        Index(
+            "idx_offers_active",
+            "is_active",
+            postgresql_where=(is_active == True),
+            sqlite_where=(is_active == True),
+        ),
+    )
+
+
+class OfferTarget(Base):
+    """A category or a product an offer's discount applies to"""
+    __tablename__ = "offer_targets"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    offer_id = Column(UUID(as_uuid=True), ForeignKey("offers.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"))
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"))
+
+    __table_args__ = (
+        Index("idx_offer_targets_offer", "offer_id"),
+    )
@@ -3,7 +3,7 @@ Product Model
 """
 
 import uuid
-from sqlalchemy import Column, String, Boolean, Integer, Text, DateTime, Numeric, ForeignKey
+from sqlalchemy import Column, String, Boolean, Integer, Text, DateTime, Numeric, ForeignKey, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,6 +20,7 @@ class Product(Base):
     description = Column(Text)
     specifications = Column(Text)
     image_url = Column(String(500))
+    image_variants = Column(JSON)  # {"<width>": {"width", "height", "webp", "jpeg"}} from an upload
     price = Column(Numeric(12, 2))
     unit = Column(String(50))
     min_order_quantity = Column(Integer, default=1)
@@ -30,3 +31,13 @@ class Product(Base):
 
     # Relationships
     category = relationship("Category", back_populates="products")
+
+    __table_args__ = (
+        Index("idx_products_category", "category_id"),
+        Index(
+            "idx_products_featured",
+            "is_featured",
+            postgresql_where=(is_featured == True),
+            sqlite_where=(is_featured == True),
+        ),
+    )
@@ -3,8 +3,10 @@ from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryRespons
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductWithCategory
 from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
 from app.schemas.invoice import (
-    InvoiceCreate, InvoiceUpdate, InvoiceResponse, InvoiceWithCustomer,
-    InvoiceItemCreate, InvoiceItemResponse
+    InvoiceCreate, InvoiceUpdate, InvoicePatch, InvoiceResponse, InvoiceWithCustomer,
+    InvoiceItemCreate, InvoiceItemUpdate, InvoiceItemResponse
 )
 from app.schemas.offer import OfferCreate, OfferUpdate, OfferResponse
 from app.schemas.enquiry import EnquiryCreate, EnquiryUpdate, EnquiryResponse
+from app.schemas.setting import SettingUpdate, SettingResponse
+from app.schemas.batch import BatchSubRequest, BatchRequest
@@ -0,0 +1,15 @@
+"""
+Batch Request Schemas
+"""
+
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str
+    params: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
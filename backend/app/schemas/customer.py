@@ -42,6 +42,7 @@ class CustomerResponse(CustomerBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
+    deleted_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
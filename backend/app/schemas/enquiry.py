@@ -2,17 +2,17 @@
 Enquiry Schemas
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
 class EnquiryBase(BaseModel):
-    name: str
+    name: str = Field(max_length=255)
     email: Optional[EmailStr] = None
-    phone: str
-    company: Optional[str] = None
-    subject: Optional[str] = None
+    phone: str = Field(max_length=20)
+    company: Optional[str] = Field(None, max_length=255)
+    subject: Optional[str] = Field(None, max_length=255)
     message: str
     product_id: Optional[UUID] = None
 
@@ -29,6 +29,8 @@ class EnquiryResponse(EnquiryBase):
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    deleted_at: Optional[datetime] = None
+    archived: bool = False
 
     class Config:
         from_attributes = True
@@ -44,7 +44,17 @@ class InvoiceBase(BaseModel):
 class InvoiceCreate(InvoiceBase):
     items: List[InvoiceItemCreate]
 
-class InvoiceUpdate(BaseModel):
+class InvoiceItemUpdate(BaseModel):
+    id: UUID
+    product_id: Optional[UUID] = None
+    description: Optional[str] = None
+    quantity: Optional[Decimal] = None
+    unit: Optional[str] = None
+    unit_price: Optional[Decimal] = None
+    discount_percent: Optional[Decimal] = None
+    amount: Optional[Decimal] = None
+
+class InvoiceFieldsUpdate(BaseModel):
     customer_id: Optional[UUID] = None
     invoice_date: Optional[date] = None
     due_date: Optional[date] = None
@@ -56,14 +66,25 @@ class InvoiceUpdate(BaseModel):
     status: Optional[str] = None
     notes: Optional[str] = None
     terms: Optional[str] = None
+
+class InvoiceUpdate(InvoiceFieldsUpdate):
     items: Optional[List[InvoiceItemCreate]] = None
 
+class InvoicePatch(InvoiceFieldsUpdate):
+    """Partial update: invoice fields plus item-level operations"""
+    add_items: List[InvoiceItemCreate] = []
+    update_items: List[InvoiceItemUpdate] = []
+    remove_items: List[UUID] = []
+
 class InvoiceResponse(InvoiceBase):
     id: UUID
     invoice_number: str
     created_by: Optional[UUID] = None
+    version: int = 1
     created_at: datetime
     updated_at: datetime
+    deleted_at: Optional[datetime] = None
+    archived: bool = False
     items: List[InvoiceItemResponse] = []
     customer_name: Optional[str] = None
 
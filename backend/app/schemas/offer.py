@@ -3,7 +3,7 @@ Offer Schemas
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 from datetime import datetime, date
 from decimal import Decimal
@@ -17,6 +17,9 @@ class OfferBase(BaseModel):
     discount_percent: Optional[Decimal] = None
     is_active: bool = True
     display_order: int = 0
+    # What the discount applies to; both empty means a banner-only offer
+    category_ids: List[UUID] = []
+    product_ids: List[UUID] = []
 
 class OfferCreate(OfferBase):
     pass
@@ -30,6 +33,8 @@ class OfferUpdate(BaseModel):
     discount_percent: Optional[Decimal] = None
     is_active: Optional[bool] = None
     display_order: Optional[int] = None
+    category_ids: Optional[List[UUID]] = None
+    product_ids: Optional[List[UUID]] = None
 
 class OfferResponse(OfferBase):
     id: UUID
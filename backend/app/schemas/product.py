@@ -3,7 +3,7 @@ Product Schemas
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -41,6 +41,8 @@ class ProductUpdate(BaseModel):
 
 class ProductResponse(ProductBase):
     id: UUID
+    image_variants: Optional[Dict[str, Dict[str, Any]]] = None
+    effective_price: Optional[Decimal] = None  # price after the best live offer
     created_at: datetime
     updated_at: datetime
     category_name: Optional[str] = None
@@ -0,0 +1,19 @@
+"""
+Business Setting Schemas
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class SettingUpdate(BaseModel):
+    value: Optional[str] = None
+
+class SettingResponse(BaseModel):
+    key: str
+    value: Optional[str] = None
+    description: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1 +1,8 @@
-from app.services.pdf_generator import generate_invoice_pdf
+from app.services.analytics import snapshot_invoice, apply_invoice_change, rebuild_rollups
+
+def __getattr__(name):
+    # ReportLab is slow to import, so the PDF service loads on first use
+    if name in ("generate_invoice_pdf", "generate_statement_pdf"):
+        from app.services import pdf_generator
+        return getattr(pdf_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,226 @@
+"""
+Analytics Rollup Service
+
+Keeps the revenue rollup tables in step with invoice writes so reporting
+queries read a handful of pre-aggregated rows instead of scanning
+invoices and invoice items.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Invoice, InvoiceItem, InvoiceArchive, InvoiceItemArchive,
+    RevenueRollup, CustomerRevenueRollup, ProductRevenueRollup
+)
+
+PERIODS = ("day", "week", "month")
+REVENUE_STATUS = "paid"
+
+# A rollup row with all of these columns at zero no longer represents any invoice
+_EMPTY_WHEN_ZERO = {
+    RevenueRollup: ("invoice_count",),
+    CustomerRevenueRollup: ("invoice_count",),
+    ProductRevenueRollup: ("quantity", "revenue"),
+}
+
+def bucket_start(value: date, period: str) -> date:
+    """Return the first day of the bucket containing a date"""
+    if period == "day":
+        return value
+    if period == "week":
+        return value - timedelta(days=value.weekday())
+    if period == "month":
+        return value.replace(day=1)
+    raise ValueError(f"Unknown period: {period}")
+
+def snapshot_invoice(db: Session, invoice: Invoice) -> dict:
+    """Capture the fields of an invoice that feed the rollups.
+
+    Items are read from the database, so pending item changes must be
+    flushed before taking the snapshot.
+    """
+    paid = invoice.status == REVENUE_STATUS
+    items = {}
+    if paid:
+        rows = db.query(
+            InvoiceItem.product_id,
+            func.sum(InvoiceItem.quantity),
+            func.sum(InvoiceItem.amount)
+        ).filter(
+            InvoiceItem.invoice_id == invoice.id,
+            InvoiceItem.product_id.isnot(None)
+        ).group_by(InvoiceItem.product_id).all()
+        items = {product_id: (Decimal(qty or 0), Decimal(amount or 0)) for product_id, qty, amount in rows}
+
+    return {
+        "invoice_date": invoice.invoice_date,
+        "customer_id": invoice.customer_id,
+        "paid": paid,
+        "total_amount": Decimal(invoice.total_amount or 0),
+        "items": items,
+    }
+
+def _add_contribution(deltas: dict, snapshot: dict, sign: int):
+    """Accumulate one invoice snapshot into a delta map"""
+    total = snapshot["total_amount"] * sign
+    paid = snapshot["paid"]
+    for period in PERIODS:
+        start = bucket_start(snapshot["invoice_date"], period)
+
+        row = deltas[(RevenueRollup, (("period", period), ("bucket_start", start)))]
+        row["invoice_count"] += sign
+        row["billed_amount"] += total
+        if paid:
+            row["paid_count"] += sign
+            row["revenue"] += total
+
+        if snapshot["customer_id"]:
+            row = deltas[(CustomerRevenueRollup, (
+                ("period", period), ("bucket_start", start), ("customer_id", snapshot["customer_id"])
+            ))]
+            row["invoice_count"] += sign
+            if paid:
+                row["revenue"] += total
+
+        for product_id, (quantity, amount) in snapshot["items"].items():
+            row = deltas[(ProductRevenueRollup, (
+                ("period", period), ("bucket_start", start), ("product_id", product_id)
+            ))]
+            row["quantity"] += quantity * sign
+            row["revenue"] += amount * sign
+
+def _upsert_increment(db: Session, model, keys: dict, values: dict):
+    """Add values to a rollup row, creating it if needed"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        row = db.get(model, tuple(keys.values()))
+        if row is None:
+            row = model(**keys, **{col: 0 for col in values})
+            db.add(row)
+        for col, delta in values.items():
+            setattr(row, col, (getattr(row, col) or 0) + delta)
+        db.flush()
+        return
+
+    table = model.__table__
+    stmt = insert(table).values(**keys, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={col: table.c[col] + stmt.excluded[col] for col in values}
+    )
+    db.execute(stmt)
+
+def apply_invoice_change(db: Session, before: Optional[dict], after: Optional[dict]):
+    """Apply the difference between two invoice snapshots to the rollups.
+
+    Pass ``before=None`` for a new invoice and ``after=None`` for a deleted
+    one. Runs inside the caller's transaction.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    if before:
+        _add_contribution(deltas, before, -1)
+    if after:
+        _add_contribution(deltas, after, 1)
+
+    for (model, keys), values in deltas.items():
+        values = {col: delta for col, delta in values.items() if delta}
+        if not values:
+            continue
+        keys = dict(keys)
+        _upsert_increment(db, model, keys, values)
+        if any(delta < 0 for delta in values.values()):
+            db.query(model).filter(
+                *[getattr(model, col) == value for col, value in keys.items()],
+                *[getattr(model, col) == 0 for col in _EMPTY_WHEN_ZERO[model]]
+            ).delete(synchronize_session=False)
+
+def rebuild_rollups(db: Session) -> dict:
+    """Recompute every rollup table from live and archived invoices (backfill / repair)
+
+    Soft-deleted invoices are left out, matching delete_invoice.
+    """
+    db.query(RevenueRollup).delete()
+    db.query(CustomerRevenueRollup).delete()
+    db.query(ProductRevenueRollup).delete()
+
+    revenue = defaultdict(lambda: defaultdict(int))
+    customers = defaultdict(lambda: defaultdict(int))
+    products = defaultdict(lambda: defaultdict(int))
+    for invoices, items in ((Invoice, InvoiceItem), (InvoiceArchive, InvoiceItemArchive)):
+        is_paid = invoices.status == REVENUE_STATUS
+        is_live = invoices.deleted_at.is_(None)
+
+        daily = db.query(
+            invoices.invoice_date,
+            func.count(invoices.id),
+            func.sum(invoices.total_amount),
+            func.sum(case((is_paid, 1), else_=0)),
+            func.sum(case((is_paid, invoices.total_amount), else_=0))
+        ).filter(is_live).group_by(invoices.invoice_date)
+        for day, count, billed, paid_count, paid_total in daily:
+            for period in PERIODS:
+                row = revenue[(period, bucket_start(day, period))]
+                row["invoice_count"] += count
+                row["billed_amount"] += Decimal(billed or 0)
+                row["paid_count"] += paid_count or 0
+                row["revenue"] += Decimal(paid_total or 0)
+
+        daily = db.query(
+            invoices.invoice_date,
+            invoices.customer_id,
+            func.count(invoices.id),
+            func.sum(case((is_paid, invoices.total_amount), else_=0))
+        ).filter(
+            is_live,
+            invoices.customer_id.isnot(None)
+        ).group_by(invoices.invoice_date, invoices.customer_id)
+        for day, customer_id, count, paid_total in daily:
+            for period in PERIODS:
+                row = customers[(period, bucket_start(day, period), customer_id)]
+                row["invoice_count"] += count
+                row["revenue"] += Decimal(paid_total or 0)
+
+        daily = db.query(
+            invoices.invoice_date,
+            items.product_id,
+            func.sum(items.quantity),
+            func.sum(items.amount)
+        ).join(invoices, items.invoice_id == invoices.id).filter(
+            is_paid,
+            is_live,
+            items.product_id.isnot(None)
+        ).group_by(invoices.invoice_date, items.product_id)
+        for day, product_id, quantity, amount in daily:
+            for period in PERIODS:
+                row = products[(period, bucket_start(day, period), product_id)]
+                row["quantity"] += Decimal(quantity or 0)
+                row["revenue"] += Decimal(amount or 0)
+
+    db.bulk_insert_mappings(RevenueRollup, [
+        {"period": period, "bucket_start": start, **values}
+        for (period, start), values in revenue.items()
+    ])
+    db.bulk_insert_mappings(CustomerRevenueRollup, [
+        {"period": period, "bucket_start": start, "customer_id": customer_id, **values}
+        for (period, start, customer_id), values in customers.items()
+    ])
+    db.bulk_insert_mappings(ProductRevenueRollup, [
+        {"period": period, "bucket_start": start, "product_id": product_id, **values}
+        for (period, start, product_id), values in products.items()
+    ])
+
+    return {
+        "revenue_rows": len(revenue),
+        "customer_rows": len(customers),
+        "product_rows": len(products),
+    }
@@ -0,0 +1,115 @@
+"""
+Archival Service
+
+Moves paid invoices and closed enquiries older than a cutoff out of the
+live tables into their *_archive tables, in small batches so each
+transaction stays short. Soft-deleted rows past the cutoff move too.
+Rollups are aggregates and are left untouched.
+"""
+
+import calendar
+from datetime import date, datetime, timezone
+
+from sqlalchemy import select, insert, literal, DateTime, or_
+from sqlalchemy.orm import Session
+
+from app.models import Invoice, InvoiceItem, Enquiry, InvoiceArchive, InvoiceItemArchive, EnquiryArchive
+
+ARCHIVE_INVOICE_STATUS = "paid"
+CLOSED_ENQUIRY_STATUSES = ("replied", "resolved")
+
+def months_before(day: date, months: int) -> date:
+    """Same day of month, `months` earlier (clamped to the month's last day)"""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def _copy_rows(db: Session, source, target, key_column, ids: list, archived_at: datetime = None):
+    """INSERT INTO target SELECT same columns FROM source WHERE key IN ids"""
+    names = [column.name for column in source.__table__.columns]
+    columns = [source.__table__.c[name] for name in names]
+    if archived_at is not None:
+        names.append("archived_at")
+        columns.append(literal(archived_at, DateTime(timezone=True)))
+    db.execute(
+        insert(target.__table__).from_select(names, select(*columns).where(key_column.in_(ids)))
+    )
+
+def _invoice_candidates(db: Session, cutoff: date):
+    return db.query(Invoice.id).filter(
+        Invoice.invoice_date < cutoff,
+        or_(Invoice.status == ARCHIVE_INVOICE_STATUS, Invoice.deleted_at.isnot(None))
+    )
+
+def _enquiry_candidates(db: Session, cutoff: date):
+    cutoff_at = datetime(cutoff.year, cutoff.month, cutoff.day, tzinfo=timezone.utc)
+    return db.query(Enquiry.id).filter(
+        Enquiry.created_at < cutoff_at,
+        or_(Enquiry.status.in_(CLOSED_ENQUIRY_STATUSES), Enquiry.deleted_at.isnot(None))
+    )
+
+def pending_counts(db: Session, cutoff: date) -> dict:
+    """How many rows archive_old_records would move for this cutoff"""
+    return {
+        "invoices": _invoice_candidates(db, cutoff).count(),
+        "enquiries": _enquiry_candidates(db, cutoff).count(),
+    }
+
+def archive_invoices(db: Session, cutoff: date, batch_size: int, on_batch=None) -> int:
+    """Move paid (or deleted) invoices dated before cutoff, with their items"""
+    moved = 0
+    while True:
+        ids = [row[0] for row in _invoice_candidates(db, cutoff).limit(batch_size)]
+        if not ids:
+            return moved
+        now = datetime.now(timezone.utc)
+        _copy_rows(db, Invoice, InvoiceArchive, Invoice.id, ids, archived_at=now)
+        _copy_rows(db, InvoiceItem, InvoiceItemArchive, InvoiceItem.invoice_id, ids)
+        db.query(InvoiceItem).filter(InvoiceItem.invoice_id.in_(ids)).delete(synchronize_session=False)
+        db.query(Invoice).filter(Invoice.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        moved += len(ids)
+        if on_batch:
+            on_batch("invoices", moved)
+
+def archive_enquiries(db: Session, cutoff: date, batch_size: int, on_batch=None) -> int:
+    """Move closed (or deleted) enquiries created before cutoff"""
+    moved = 0
+    while True:
+        ids = [row[0] for row in _enquiry_candidates(db, cutoff).limit(batch_size)]
+        if not ids:
+            return moved
+        _copy_rows(db, Enquiry, EnquiryArchive, Enquiry.id, ids, archived_at=datetime.now(timezone.utc))
+        db.query(Enquiry).filter(Enquiry.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        moved += len(ids)
+        if on_batch:
+            on_batch("enquiries", moved)
+
+def archive_old_records(db: Session, months: int, batch_size: int = 500, on_batch=None) -> dict:
+    """Archive everything eligible that is older than `months` months"""
+    if months < 1:
+        raise ValueError("months must be at least 1")
+    cutoff = months_before(date.today(), months)
+    return {
+        "cutoff": cutoff.isoformat(),
+        "invoices": archive_invoices(db, cutoff, batch_size, on_batch),
+        "enquiries": archive_enquiries(db, cutoff, batch_size, on_batch),
+    }
+
+def merge_newest(live: list, archived: list, skip: int, limit: int) -> list:
+    """Page through live and archived rows as one list, newest created_at first.
+
+    Each input must already be ordered newest first and hold at least
+    skip + limit rows (or all there are).
+    """
+    def sort_key(row):
+        created = row.created_at
+        if created is None:
+            return 0.0
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        return created.timestamp()
+
+    rows = sorted(live + archived, key=sort_key, reverse=True)
+    return rows[skip:skip + limit]
@@ -0,0 +1,56 @@
+"""
+Content-Addressed Blob Store
+
+Files are named by the SHA-256 of their bytes, so a key never changes
+meaning: identical uploads share one file and anything served from here
+can be cached forever.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional
+
+from app.core.config import settings
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,5}$")
+
+class BlobStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> Optional[str]:
+        """Filesystem path for a key, or None for anything that is not a valid key"""
+        if not KEY_PATTERN.match(key):
+            return None
+        return os.path.join(self.root, key[:2], key)
+
+    def put(self, data: bytes, extension: str) -> str:
+        """Store bytes and return their key (a no-op if already stored)"""
+        key = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        path = self.path(key)
+        if os.path.exists(path):
+            return key
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return key
+
+    def exists(self, key: str) -> bool:
+        path = self.path(key)
+        return path is not None and os.path.exists(path)
+
+    def url(self, key: str) -> str:
+        return f"{settings.MEDIA_URL_PREFIX}/{key}"
+
+
+blob_store = BlobStore(settings.MEDIA_ROOT)
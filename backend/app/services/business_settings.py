@@ -0,0 +1,128 @@
+"""
+Business Settings Service
+
+Loads the settings table once into an immutable snapshot shared by every
+request and PDF worker thread. Admin edits bump the _version row; each
+process checks that single row at most every SETTINGS_REFRESH_SECONDS and
+reloads only when it has changed.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from sqlalchemy import update, cast, Integer, String
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import record_cache
+from app.models import Setting
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "_version"
+
+# Seeded by migration m0006 and used when a row is missing
+DEFAULTS = {
+    "business_name": (settings.BUSINESS_NAME, "Company name"),
+    "business_tagline": ("Quality Manufacturing & Reliable Services", "Company tagline"),
+    "business_phone": (settings.BUSINESS_PHONE, "Primary phone number"),
+    "business_whatsapp": (settings.BUSINESS_WHATSAPP, "WhatsApp number (without +)"),
+    "business_email": (settings.BUSINESS_EMAIL, "Business email"),
+    "business_address": (settings.BUSINESS_ADDRESS, "Business address"),
+    "gst_number": ("", "GST Number"),
+    "established_year": ("2023", "Year of establishment"),
+    "invoice_prefix": ("NMS", "Invoice number prefix"),
+    "invoice_terms": ("", "Default invoice terms"),
+}
+
+# Served to anyone by GET /api/settings/public; every other key stays admin-only
+PUBLIC_KEYS = (
+    "business_name",
+    "business_tagline",
+    "business_phone",
+    "business_whatsapp",
+    "business_email",
+    "business_address",
+    "gst_number",
+    "established_year",
+)
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    version: int
+    values: Mapping[str, str] = field(default_factory=dict)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.values.get(key)
+        if value is None and key in DEFAULTS:
+            value = DEFAULTS[key][0]
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> str:
+        return self.get(key, "")
+
+
+def read_version(db: Session) -> int:
+    value = db.query(Setting.value).filter(Setting.key == VERSION_KEY).scalar()
+    return int(value or 0)
+
+def bump_version(db: Session):
+    """Advance the shared version in the caller's transaction"""
+    result = db.execute(
+        update(Setting).where(Setting.key == VERSION_KEY).values(
+            value=cast(cast(Setting.value, Integer) + 1, String)
+        )
+    )
+    if result.rowcount == 0:
+        db.add(Setting(key=VERSION_KEY, value="1", description="Bumped on every settings change"))
+
+
+class BusinessSettings:
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> SettingsSnapshot:
+        """Current snapshot; at most one version check per refresh interval"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.refresh_seconds:
+            record_cache("business_settings", True)
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.refresh_seconds:
+                record_cache("business_settings", True)
+                return self._snapshot
+            # A hit unless the rows have to be (re)loaded
+            hit = self._snapshot is not None
+            try:
+                with SessionLocal() as db:
+                    version = read_version(db)
+                    if self._snapshot is None or version != self._snapshot.version:
+                        hit = False
+                        rows = db.query(Setting.key, Setting.value).filter(Setting.key != VERSION_KEY).all()
+                        self._snapshot = SettingsSnapshot(
+                            version=version,
+                            values=MappingProxyType({key: value for key, value in rows})
+                        )
+            except Exception as e:
+                # Keep serving the last snapshot (or the defaults) until the database is back
+                logger.warning("Could not refresh business settings: %s", e)
+                if self._snapshot is None:
+                    self._snapshot = SettingsSnapshot(version=-1, values=MappingProxyType({}))
+            self._checked_at = time.monotonic()
+            record_cache("business_settings", hit)
+            return self._snapshot
+
+    def invalidate(self):
+        """Force the next get() to check the version (after a local edit)"""
+        self._checked_at = 0.0
+
+
+business_settings = BusinessSettings(settings.SETTINGS_REFRESH_SECONDS)
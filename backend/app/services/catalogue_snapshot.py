@@ -0,0 +1,244 @@
+"""
+Catalogue Snapshot
+
+Active products (with category_name) and active categories serialised
+once into a file every worker maps read-only, so the catalogue lives once
+in the OS page cache however many workers there are. Lookups
+binary-search a fixed-width index inside the mapping and decode only the
+one record they hit.
+
+Layout (little-endian):
+
+    header   MAGIC, products generation, categories generation,
+             product count, category count, offsets of the four indexes
+    records  compact JSON, one per product then per category
+    indexes  products by id, products by slug, categories by id,
+             categories by slug; each a sorted array of
+             (16-byte key, record offset, record length)
+
+Id keys are the UUID bytes, slug keys a 16-byte BLAKE2b of the slug.
+
+One worker rebuilds after a catalogue write (the others wait on a file
+lock, then just map the new file); publishing is write-then-rename plus an
+atomic swap of the CURRENT pointer. The snapshot records the shared cache
+generations it was built from, and is only read while they still match,
+so until a rebuild lands lookups fall back to the database. Generation
+counters say nothing about writes made while the app was down (and the
+memory backend restarts them at 0), so at boot a snapshot older than the
+process is rebuilt whatever generations it carries.
+
+Workers only agree on generations when they share a cache backend, so by
+default the snapshot is used only with CACHE_BACKEND=redis.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import joinedload
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Product, Category
+from app.schemas import ProductResponse, CategoryResponse
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NMSCAT01"
+HEADER = struct.Struct("<8sQQIIQQQQ")
+ENTRY = struct.Struct("<16sQI")
+POINTER = "CURRENT"
+# Snapshots published before this are not trusted at startup
+STARTED_AT = time.time()
+
+def _id_key(value) -> bytes:
+    return UUID(str(value)).bytes
+
+def _slug_key(slug: str) -> bytes:
+    return hashlib.blake2b(slug.encode(), digest_size=16).digest()
+
+def build(products: list, categories: list, generations: tuple) -> bytes:
+    """Serialise JSON-ready product and category dicts into the file layout"""
+    records = bytearray()
+    indexes = []
+    for rows in (products, categories):
+        by_id, by_slug = [], []
+        for row in rows:
+            body = json.dumps(row, separators=(",", ":")).encode()
+            offset = HEADER.size + len(records)
+            records += body
+            by_id.append((_id_key(row["id"]), offset, len(body)))
+            by_slug.append((_slug_key(row["slug"]), offset, len(body)))
+        indexes += [sorted(by_id), sorted(by_slug)]
+
+    offsets = []
+    tail = bytearray()
+    for index in indexes:
+        offsets.append(HEADER.size + len(records) + len(tail))
+        for entry in index:
+            tail += ENTRY.pack(*entry)
+    header = HEADER.pack(MAGIC, *generations, len(products), len(categories), *offsets)
+    return header + bytes(records) + bytes(tail)
+
+def _load_catalogue() -> tuple:
+    with SessionLocal() as db:
+        products = []
+        for product in db.query(Product).options(joinedload(Product.category)).filter(Product.is_active == True):
+            row = ProductResponse.model_validate(product).model_dump(mode="json")
+            if product.category:
+                row["category_name"] = product.category.name
+            products.append(row)
+        categories = [
+            CategoryResponse.model_validate(category).model_dump(mode="json")
+            for category in db.query(Category).filter(Category.is_active == True)
+        ]
+    return products, categories
+
+
+class Snapshot:
+    """One published file, mapped read-only"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.built_at = os.fstat(f.fileno()).st_mtime
+        magic, products_gen, categories_gen, product_count, category_count, *offsets = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalogue snapshot")
+        self.name = os.path.basename(path)
+        self.generations = (products_gen, categories_gen)
+        self._indexes = {
+            ("products", "id"): (offsets[0], product_count),
+            ("products", "slug"): (offsets[1], product_count),
+            ("categories", "id"): (offsets[2], category_count),
+            ("categories", "slug"): (offsets[3], category_count),
+        }
+
+    def record(self, kind: str, field: str, key: bytes) -> Optional[memoryview]:
+        """The record's bytes, in place in the mapping, or None"""
+        start, count = self._indexes[(kind, field)]
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, offset, length = ENTRY.unpack_from(self._map, start + middle * ENTRY.size)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return memoryview(self._map)[offset:offset + length]
+        return None
+
+
+class CatalogueSnapshot:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._snapshot: Optional[Snapshot] = None
+
+    def _map_current(self):
+        """Map whatever CURRENT points at, if it is not mapped already"""
+        try:
+            with open(os.path.join(self.directory, POINTER)) as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return
+        if self._snapshot is None or self._snapshot.name != name:
+            # The old mapping is released once the last lookup using it is done
+            self._snapshot = Snapshot(os.path.join(self.directory, name))
+
+    def _write(self, name: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @property
+    def enabled(self) -> bool:
+        if settings.CATALOGUE_SNAPSHOT_ENABLED is None:
+            return settings.CACHE_BACKEND == "redis"
+        return settings.CATALOGUE_SNAPSHOT_ENABLED
+
+    def _publish(self, generations: tuple, built_after: float = 0):
+        """Rebuild unless the published snapshot already matches; one process at a time"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._map_current()
+                snapshot = self._snapshot
+                if snapshot is not None and snapshot.generations == generations and snapshot.built_at >= built_after:
+                    return
+                products, categories = _load_catalogue()
+                name = f"catalogue-{uuid4().hex}.bin"
+                self._write(name, build(products, categories, generations))
+                self._write(POINTER, name.encode())
+                # Workers still mapping an older file keep it until they swap
+                for stale in os.listdir(self.directory):
+                    if stale.startswith("catalogue-") and stale != name:
+                        os.remove(os.path.join(self.directory, stale))
+                self._map_current()
+                logger.info("Published catalogue snapshot %s (%d products, %d categories)",
+                            name, len(products), len(categories))
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    async def _generations(self) -> Optional[tuple]:
+        products_gen = await cache.generation("products")
+        categories_gen = await cache.generation("categories")
+        if products_gen is None or categories_gen is None:
+            return None
+        return products_gen, categories_gen
+
+    async def refresh(self, built_after: float = 0):
+        """Publish a snapshot for the current generations, or map the one another worker published"""
+        if not self.enabled:
+            return
+        generations = await self._generations()
+        if generations is None:
+            return
+        try:
+            await asyncio.to_thread(self._publish, generations, built_after)
+        except Exception as e:
+            logger.warning("Could not publish catalogue snapshot: %s", e)
+
+    async def start(self):
+        """Map a snapshot built since this process started, rebuilding if there is none"""
+        await self.refresh(built_after=STARTED_AT)
+
+    async def find(self, kind: str, id=None, slug: Optional[str] = None) -> Optional[dict]:
+        """An active product or category by id or slug, or None (not active, or no current snapshot)"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.generations != await self._generations():
+            return None
+        if slug is not None:
+            view = snapshot.record(kind, "slug", _slug_key(slug))
+        else:
+            view = snapshot.record(kind, "id", _id_key(id))
+        if view is None:
+            return None
+        row = json.loads(str(view, "utf-8"))
+        if slug is not None and row["slug"] != slug:
+            return None
+        return row
+
+
+catalogue_snapshot = CatalogueSnapshot(settings.CATALOGUE_SNAPSHOT_DIR)
+cache.on_invalidate("products", catalogue_snapshot.refresh)
+cache.on_invalidate("categories", catalogue_snapshot.refresh)
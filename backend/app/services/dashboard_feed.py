@@ -0,0 +1,181 @@
+"""
+Dashboard Feed
+
+Dashboard queries, plus one shared copy of their results for every open
+admin stream. Invoice and enquiry events mark the copy stale; while anyone
+is listening a single task recomputes the stats at most once per
+DASHBOARD_STATS_INTERVAL_SECONDS and publishes them as a "stats" event.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Product, Customer, Invoice, Enquiry, Offer, RevenueRollup
+from app.services.events import event_bus
+from app.services.offer_schedule import live_offer_filter, business_today
+
+logger = logging.getLogger(__name__)
+
+WATCHED_EVENTS = ("invoice.", "enquiry.")
+
+def dashboard_stats(db: Session) -> dict:
+    """Headline counts; invoice totals come from the monthly revenue rollup
+    so they still count invoices that have been moved to the archive."""
+    total_products = db.query(func.count(Product.id)).scalar()
+    active_products = db.query(func.count(Product.id)).filter(Product.is_active == True).scalar()
+    
+    live_customers = db.query(func.count(Customer.id)).filter(Customer.deleted_at.is_(None))
+    total_customers = live_customers.scalar()
+    active_customers = live_customers.filter(Customer.is_active == True).scalar()
+    
+    total_invoices, paid_invoices, total_revenue = db.query(
+        func.coalesce(func.sum(RevenueRollup.invoice_count), 0),
+        func.coalesce(func.sum(RevenueRollup.paid_count), 0),
+        func.coalesce(func.sum(RevenueRollup.revenue), 0)
+    ).filter(RevenueRollup.period == "month").one()
+    pending_invoices = db.query(func.count(Invoice.id)).filter(
+        Invoice.status == "pending",
+        Invoice.deleted_at.is_(None)
+    ).scalar()
+    
+    live_enquiries = db.query(func.count(Enquiry.id)).filter(Enquiry.deleted_at.is_(None))
+    new_enquiries = live_enquiries.filter(Enquiry.status == "new").scalar()
+    total_enquiries = live_enquiries.scalar()
+    
+    active_offers = db.query(func.count(Offer.id)).filter(live_offer_filter(business_today())).scalar()
+    
+    return {
+        "products": {
+            "total": total_products,
+            "active": active_products
+        },
+        "customers": {
+            "total": total_customers,
+            "active": active_customers
+        },
+        "invoices": {
+            "total": total_invoices,
+            "pending": pending_invoices,
+            "paid": paid_invoices,
+            "total_revenue": float(total_revenue)
+        },
+        "enquiries": {
+            "total": total_enquiries,
+            "new": new_enquiries
+        },
+        "offers": {
+            "active": active_offers
+        }
+    }
+
+def invoice_summary(invoice: Invoice) -> dict:
+    customer_name = None
+    if invoice.customer:
+        customer_name = invoice.customer.contact_person
+    return {
+        "id": str(invoice.id),
+        "invoice_number": invoice.invoice_number,
+        "customer_name": customer_name,
+        "total_amount": float(invoice.total_amount),
+        "status": invoice.status,
+        "invoice_date": invoice.invoice_date.isoformat()
+    }
+
+def enquiry_summary(enquiry: Enquiry) -> dict:
+    return {
+        "id": str(enquiry.id),
+        "name": enquiry.name,
+        "phone": enquiry.phone,
+        "subject": enquiry.subject,
+        "status": enquiry.status,
+        "created_at": enquiry.created_at.isoformat()
+    }
+
+def recent_invoices(db: Session, limit: int) -> list:
+    invoices = db.query(Invoice).filter(Invoice.deleted_at.is_(None)).order_by(Invoice.created_at.desc()).limit(limit).all()
+    return [invoice_summary(invoice) for invoice in invoices]
+
+def recent_enquiries(db: Session, limit: int) -> list:
+    enquiries = db.query(Enquiry).filter(Enquiry.deleted_at.is_(None)).order_by(Enquiry.created_at.desc()).limit(limit).all()
+    return [enquiry_summary(enquiry) for enquiry in enquiries]
+
+
+class DashboardFeed:
+    def __init__(self, interval: float, recent_limit: int = 5):
+        self.interval = interval
+        self.recent_limit = recent_limit
+        self._snapshot: Optional[dict] = None
+        self._snapshot_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._queue = None
+        self._task = None
+
+    def _build_snapshot(self) -> dict:
+        with SessionLocal() as db:
+            return {
+                "stats": dashboard_stats(db),
+                "recent_invoices": recent_invoices(db, self.recent_limit),
+                "recent_enquiries": recent_enquiries(db, self.recent_limit),
+            }
+
+    def _build_stats(self) -> dict:
+        with SessionLocal() as db:
+            return dashboard_stats(db)
+
+    async def snapshot(self) -> dict:
+        """Shared snapshot, rebuilt at most once per interval however many streams ask"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._snapshot is None or time.monotonic() - self._snapshot_at > self.interval:
+                self._snapshot = await asyncio.to_thread(self._build_snapshot)
+                self._snapshot_at = time.monotonic()
+            return self._snapshot
+
+    async def start(self):
+        if self._task is None:
+            self._queue = event_bus.subscribe()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            event_bus.unsubscribe(self._queue)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            event, _ = await self._queue.get()
+            if event is None:
+                return
+            if not event.startswith(WATCHED_EVENTS):
+                continue
+            # Let a burst of writes settle into one recompute
+            await asyncio.sleep(self.interval)
+            while not self._queue.empty():
+                if self._queue.get_nowait()[0] is None:
+                    return
+            self._snapshot_at = 0.0
+            # Our own subscription is one of them
+            if event_bus.subscribers <= 1:
+                continue
+            try:
+                stats = await asyncio.to_thread(self._build_stats)
+            except Exception as e:
+                logger.warning("Could not refresh dashboard stats: %s", e)
+                continue
+            event_bus.publish("stats", stats)
+
+
+dashboard_feed = DashboardFeed(settings.DASHBOARD_STATS_INTERVAL_SECONDS)
@@ -0,0 +1,205 @@
+"""
+Enquiry Intake Service
+
+Buffers public contact-form submissions in an in-process queue and writes
+them to the database in batches, with per-client rate limiting and
+duplicate suppression in front of the queue. Batches are retried only on
+connection-level errors; a batch the database rejects is split until the
+offending rows are isolated, and those go to a dead-letter file so the
+rest of the queue keeps moving.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import json
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import OperationalError, InterfaceError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.enquiry import Enquiry
+
+logger = logging.getLogger(__name__)
+
+class TokenBucketLimiter:
+    """Per-key token bucket; refills at a fixed rate up to a burst size"""
+
+    def __init__(self, rate_per_minute: int, burst: int, max_keys: int = 10000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = {}
+
+    def acquire(self, key: str) -> float:
+        """Take one token for key; return 0 if allowed, else seconds until a token is free"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > self.max_keys:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float):
+        """Drop buckets that have refilled completely"""
+        full_after = self.burst / self.rate
+        self._buckets = {
+            key: value for key, value in self._buckets.items()
+            if now - value[1] < full_after
+        }
+
+
+class EnquiryIntake:
+    """Queue enquiries and batch-insert them from a background task"""
+
+    def __init__(self):
+        self.ip_limiter = TokenBucketLimiter(settings.ENQUIRY_RATE_LIMIT_PER_MINUTE, settings.ENQUIRY_RATE_LIMIT_BURST)
+        self.phone_limiter = TokenBucketLimiter(settings.ENQUIRY_RATE_LIMIT_PER_MINUTE, settings.ENQUIRY_RATE_LIMIT_BURST)
+        self._recent = {}
+        self._queue = None
+        self._worker = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background batch writer"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.ENQUIRY_QUEUE_SIZE)
+        self._stopping = False
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting work and flush everything still queued"""
+        if not self.running:
+            return
+        self._stopping = True
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    @staticmethod
+    def fingerprint(phone: str, message: str) -> str:
+        """Hash a submission so repeats of the same message can be recognised"""
+        normalized = " ".join(message.lower().split())
+        return hashlib.sha256(f"{phone.strip()}\n{normalized}".encode()).hexdigest()
+
+    def find_duplicate(self, fingerprint: str):
+        """Return the previously accepted row for a fingerprint, if still in the window"""
+        entry = self._recent.get(fingerprint)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def remember(self, fingerprint: str, row: dict):
+        now = time.monotonic()
+        if len(self._recent) > settings.ENQUIRY_QUEUE_SIZE:
+            self._recent = {key: value for key, value in self._recent.items() if value[0] > now}
+        self._recent[fingerprint] = (now + settings.ENQUIRY_DEDUP_WINDOW_SECONDS, row)
+
+    def submit(self, row: dict):
+        """Queue a row for insertion; raises asyncio.QueueFull when saturated"""
+        self._queue.put_nowait(row)
+
+    async def _run(self):
+        interval = settings.ENQUIRY_BATCH_INTERVAL_MS / 1000
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + interval
+            while len(batch) < settings.ENQUIRY_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+
+        # Drain anything queued behind the stop marker
+        remaining = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            await self._write(remaining)
+
+    async def _write(self, batch: list):
+        """Insert a batch; retry transient failures, split batches the database rejects"""
+        delay = 0.5
+        while True:
+            try:
+                await asyncio.to_thread(insert_enquiries, batch)
+                return
+            except (OperationalError, InterfaceError) as e:
+                if self._stopping:
+                    dead_letter(batch, e)
+                    return
+                logger.warning("Enquiry batch insert failed, retrying in %.1fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            except Exception as e:
+                # Integrity or data errors come from the rows themselves: retrying cannot help
+                if len(batch) == 1:
+                    dead_letter(batch, e)
+                    return
+                middle = len(batch) // 2
+                await self._write(batch[:middle])
+                await self._write(batch[middle:])
+                return
+
+
+def insert_enquiries(rows: list):
+    """Insert enquiry rows in a single transaction"""
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(Enquiry, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def dead_letter(rows: list, error: Exception):
+    """Append rows that could not be stored to ENQUIRY_DEAD_LETTER_PATH (JSON lines)"""
+    logger.error("Could not store %d enquiries, dead-lettered: %s", len(rows), error)
+    failed_at = datetime.now(timezone.utc).isoformat()
+    reason = f"{type(error).__name__}: {str(error).strip().splitlines()[0] if str(error).strip() else ''}"
+    lines = "".join(
+        json.dumps({"failed_at": failed_at, "error": reason, "row": row}, default=str) + "\n"
+        for row in rows
+    )
+    try:
+        directory = os.path.dirname(settings.ENQUIRY_DEAD_LETTER_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(settings.ENQUIRY_DEAD_LETTER_PATH, "a") as f:
+            f.write(lines)
+    except OSError as e:
+        # Last resort: keep the data in the logs for manual recovery
+        logger.error("Could not write dead letters (%s): %s", e, lines)
+
+
+enquiry_intake = EnquiryIntake()
@@ -0,0 +1,100 @@
+"""
+In-Process Event Bus
+
+Fans out (event, data) pairs to every subscriber queue on the event loop.
+publish() is safe to call from request handlers and worker threads alike.
+A subscriber that falls QUEUE_SIZE events behind is sent a single
+"resync" event in place of the backlog.
+
+The server waits for open responses before running shutdown, so the bus
+also ends every stream as soon as SIGINT/SIGTERM arrives.
+"""
+
+import asyncio
+import signal
+import threading
+from typing import Optional
+
+from app.core.config import settings
+
+RESYNC = "resync"
+
+class EventBus:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._previous_handlers = {}
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._chain_exit_signals()
+
+    async def stop(self):
+        """End every open stream and stop accepting publishes"""
+        self._end_streams()
+        self._subscribers.clear()
+        self._loop = None
+        for sig, previous in self._previous_handlers.items():
+            signal.signal(sig, previous)
+        self._previous_handlers.clear()
+
+    def _chain_exit_signals(self):
+        # Only the main thread may install handlers (not the case under TestClient)
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                continue
+
+            def handler(signum, frame, previous=previous):
+                if self._loop is not None:
+                    self._loop.call_soon_threadsafe(self._end_streams)
+                previous(signum, frame)
+
+            self._previous_handlers[sig] = previous
+            signal.signal(sig, handler)
+
+    def _end_streams(self):
+        """Send the None event that makes each stream return"""
+        for queue in list(self._subscribers):
+            self._put(queue, (None, None))
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: dict = None):
+        if self._loop is None or not self._subscribers:
+            return
+        if threading.get_ident() == self._loop_thread:
+            self._deliver(event, data)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, event, data)
+
+    def _deliver(self, event: str, data: dict):
+        for queue in list(self._subscribers):
+            self._put(queue, (event, data))
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, item):
+        if queue.full():
+            # Too far behind: drop the backlog and ask the reader to reload
+            while not queue.empty():
+                queue.get_nowait()
+            item = item if item[0] is None else (RESYNC, None)
+        queue.put_nowait(item)
+
+
+event_bus = EventBus(settings.SSE_QUEUE_SIZE)
@@ -0,0 +1,100 @@
+"""
+Image Variant Service
+
+Turns one uploaded image into resized WebP and JPEG variants on a small
+thread pool (Pillow releases the GIL while resampling and encoding) and
+stores them in the blob store.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from app.core.config import settings
+from app.core.metrics import IMAGE_PROCESS
+from app.services.blob_store import blob_store
+
+FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+# Pillow is imported on first use to keep cold starts fast
+
+class ImageError(ValueError):
+    """The upload is not an image Pillow can read"""
+
+def variant_widths() -> list:
+    return sorted({int(width) for width in settings.IMAGE_VARIANT_WIDTHS.split(",") if width.strip()})
+
+def _flatten(image):
+    """RGB copy with any transparency composited onto white (JPEG has no alpha)"""
+    from PIL import Image
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+def make_variants(data: bytes) -> dict:
+    """Resize to each configured width (never upscaling) and store every format.
+
+    Returns {"<width>": {"width": w, "height": h, "webp": url, "jpeg": url}, ...}.
+    """
+    from PIL import Image, ImageOps
+    try:
+        with Image.open(BytesIO(data)) as source:
+            source.load()
+            image = _flatten(ImageOps.exif_transpose(source))
+    except Image.DecompressionBombError:
+        raise ImageError("Image dimensions are too large")
+    except (OSError, SyntaxError):
+        raise ImageError("Unsupported or corrupt image")
+
+    # Widths at or above the original collapse into one full-size variant
+    configured = variant_widths()
+    widths = [width for width in configured if width < image.width]
+    if len(widths) < len(configured):
+        widths.append(image.width)
+    variants = {}
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        variant = {"width": width, "height": height}
+        for name, pil_format, options in FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            variant[name] = blob_store.url(blob_store.put(buffer.getvalue(), EXTENSIONS[name]))
+        variants[str(width)] = variant
+    return variants
+
+def largest_jpeg(variants: dict) -> str:
+    """URL of the widest JPEG variant, for clients that only read image_url"""
+    return variants[max(variants, key=int)]["jpeg"]
+
+
+class ImageWorkerPool:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image")
+        return self._executor
+
+    async def variants(self, data: bytes) -> dict:
+        def timed():
+            with IMAGE_PROCESS.time("variants"):
+                return make_variants(data)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), timed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+image_workers = ImageWorkerPool(settings.IMAGE_WORKERS)
@@ -0,0 +1,294 @@
+"""
+Background Jobs
+
+A small in-process job queue stored in the jobs table, so it works on
+PostgreSQL or SQLite without a separate broker. Routes enqueue a job and
+return 202; a pool of worker tasks claims runnable jobs, runs the
+registered handler, records progress and retries failures with backoff.
+Jobs left "running" by a crashed process are requeued once their lease
+expires, so several app instances can share one table.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import Job, utcnow
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+class JobFailed(Exception):
+    """Raise from a handler to fail the job without retrying"""
+
+
+def job_handler(kind: str):
+    """Register a function as the handler for a job kind.
+
+    Handlers receive a JobContext and return a JSON-serializable result.
+    Plain functions run in a thread; coroutine functions run on the event loop.
+    """
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+class JobContext:
+    """What a handler gets: its payload, a database session and progress reporting"""
+
+    def __init__(self, job: Job, db):
+        self.job_id = job.id
+        self.kind = job.kind
+        self.payload = dict(job.payload or {})
+        self.attempt = job.attempts
+        self.db = db
+        self.artifact = None
+
+    def progress(self, percent: int, message: str = None):
+        """Record progress in its own transaction so pollers see it immediately"""
+        percent = max(0, min(100, int(percent)))
+        with SessionLocal() as db:
+            db.execute(
+                update(Job).where(Job.id == self.job_id).values(
+                    progress=percent, progress_message=message, locked_at=utcnow()
+                )
+            )
+            db.commit()
+
+    def attach(self, content: bytes, filename: str, content_type: str):
+        """Store a downloadable file with the job result"""
+        self.artifact = (content, filename, content_type)
+
+
+def enqueue(db, kind: str, payload: dict = None, user_id=None, max_attempts: int = None, delay: float = 0) -> Job:
+    """Create a queued job and wake the workers"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        created_by=user_id,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=utcnow() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    job_workers.notify()
+    return job
+
+def job_status(job: Job) -> dict:
+    """Public view of a job"""
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "progress_message": job.progress_message,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "result": job.result,
+        "error": job.error,
+        "has_artifact": job.artifact_name is not None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+def accepted(job: Job) -> dict:
+    """Body for a 202 response pointing at the job"""
+    return {"job_id": str(job.id), "status": job.status, "status_url": f"/api/jobs/{job.id}"}
+
+def claim_next(worker_id: str):
+    """Atomically move the oldest runnable job to running; returns its id or None"""
+    with SessionLocal() as db:
+        now = utcnow()
+        query = db.query(Job.id).filter(
+            Job.status == "queued",
+            Job.run_after <= now
+        ).order_by(Job.run_after).limit(1)
+        if db.bind.dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        row = query.first()
+        if row is None:
+            return None
+        # The status check makes the claim safe even without row locks (SQLite)
+        claimed = db.execute(
+            update(Job).where(Job.id == row.id, Job.status == "queued").values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_at=now,
+                started_at=now,
+                error=None,
+            )
+        ).rowcount
+        db.commit()
+        return row.id if claimed else None
+
+def renew_lease(job_id: uuid.UUID):
+    with SessionLocal() as db:
+        db.execute(update(Job).where(Job.id == job_id, Job.status == "running").values(locked_at=utcnow()))
+        db.commit()
+
+def recover_stale_jobs() -> int:
+    """Requeue jobs whose worker stopped renewing its lease, and prune old finished jobs"""
+    now = utcnow()
+    with SessionLocal() as db:
+        requeued = db.execute(
+            update(Job).where(
+                Job.status == "running",
+                Job.locked_at < now - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+            ).values(status="queued", locked_by=None, locked_at=None, run_after=now)
+        ).rowcount
+        db.query(Job).filter(
+            Job.status.in_(("succeeded", "failed")),
+            Job.finished_at < now - timedelta(days=settings.JOB_RETENTION_DAYS)
+        ).delete(synchronize_session=False)
+        db.commit()
+    if requeued:
+        logger.warning("Requeued %d stale jobs", requeued)
+    return requeued
+
+
+class JobWorkerPool:
+    """Worker tasks that poll the jobs table and run handlers"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = []
+        self._wakeup = None
+        self._loop = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run(n)) for n in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        """Cancel the workers; interrupted jobs are requeued when their lease expires"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def notify(self):
+        """Wake idle workers; safe to call from any thread"""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _wait(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _sweep(self):
+        while True:
+            try:
+                await asyncio.to_thread(recover_stale_jobs)
+            except Exception as e:
+                logger.warning("Job recovery sweep failed: %s", e)
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 2)
+
+    async def _run(self, number: int):
+        worker_id = f"{self.worker_id}:{number}"
+        interval = settings.JOB_POLL_INTERVAL_MS / 1000
+        while True:
+            try:
+                job_id = await asyncio.to_thread(claim_next, worker_id)
+            except Exception as e:
+                # e.g. the jobs table is not migrated yet during a lazy startup
+                logger.warning("Could not poll for jobs: %s", e)
+                await asyncio.sleep(interval * 5)
+                continue
+            if job_id is None:
+                await self._wait(interval)
+                continue
+            await self._execute(job_id)
+
+    async def _execute(self, job_id: uuid.UUID):
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            handler = HANDLERS.get(job.kind)
+            context = JobContext(job, db)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler registered for job kind {job.kind}")
+                if asyncio.iscoroutinefunction(handler):
+                    result = await handler(context)
+                else:
+                    result = await asyncio.to_thread(handler, context)
+            except Exception as e:
+                db.rollback()
+                logger.warning("Job %s (%s) attempt %d failed: %s", job.id, job.kind, job.attempts, e)
+                self._record_failure(db, job, e, retry=handler is not None and not isinstance(e, JobFailed))
+                return
+            finally:
+                heartbeat.cancel()
+            self._record_success(db, job, result, context.artifact)
+        except Exception:
+            logger.exception("Could not record outcome of job %s", job_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def _heartbeat(job_id: uuid.UUID):
+        """Renew the lease while a handler runs so long jobs are not requeued"""
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            try:
+                await asyncio.to_thread(renew_lease, job_id)
+            except Exception as e:
+                logger.warning("Could not renew lease on job %s: %s", job_id, e)
+
+    @staticmethod
+    def _record_success(db, job: Job, result, artifact):
+        job.status = "succeeded"
+        job.result = result
+        job.progress = 100
+        job.finished_at = utcnow()
+        job.locked_by = None
+        job.locked_at = None
+        if artifact:
+            job.artifact, job.artifact_name, job.artifact_type = artifact
+        db.commit()
+
+    @staticmethod
+    def _record_failure(db, job: Job, error: Exception, retry: bool):
+        job.error = f"{type(error).__name__}: {error}"
+        job.locked_by = None
+        job.locked_at = None
+        if retry and job.attempts < job.max_attempts:
+            backoff = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            job.status = "queued"
+            job.run_after = utcnow() + timedelta(seconds=backoff)
+        else:
+            job.status = "failed"
+            job.finished_at = utcnow()
+        db.commit()
+
+
+job_workers = JobWorkerPool(settings.JOB_WORKERS)
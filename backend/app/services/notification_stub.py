@@ -0,0 +1,63 @@
+"""
+Stub WhatsApp Gateway
+
+A tiny stand-in for the WhatsApp Cloud API for local development and
+tests. It accepts the same message payload, records what it received and
+can be told to fail a share of requests, or the next few, with 429/503 to
+exercise retries. Recipients that are not 10-15 digits are rejected with
+400, as the real API does.
+
+In-process: NOTIFY_PROVIDER=stub routes the dispatcher here over httpx's
+ASGI transport. As a server:
+
+    uvicorn app.services.notification_stub:stub_gateway --port 8090
+
+and point WHATSAPP_API_URL at http://localhost:8090 with NOTIFY_PROVIDER=whatsapp_cloud.
+"""
+
+import itertools
+import random
+import re
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+stub_gateway = FastAPI(title="Stub WhatsApp Gateway", docs_url=None, redoc_url=None)
+stub_gateway.state.sent = []
+stub_gateway.state.failure_rate = 0.0
+stub_gateway.state.failure_status = 503
+stub_gateway.state.fail_next = 0
+
+_ids = itertools.count(1)
+
+@stub_gateway.post("/{phone_number_id}/messages")
+async def stub_send_message(phone_number_id: str, request: Request):
+    state = stub_gateway.state
+    if state.fail_next or (state.failure_rate and random.random() < state.failure_rate):
+        state.fail_next = max(0, state.fail_next - 1)
+        headers = {"Retry-After": "0"} if state.failure_status == 429 else {}
+        return JSONResponse(status_code=state.failure_status, content={"error": "stub failure"}, headers=headers)
+
+    payload = await request.json()
+    if not re.fullmatch(r"\d{10,15}", str(payload.get("to") or "")):
+        return JSONResponse(status_code=400, content={"error": {"message": "Invalid recipient", "code": 131030}})
+    message_id = f"wamid.stub-{next(_ids)}"
+    state.sent.append({"id": message_id, "phone_number_id": phone_number_id, **payload})
+    return {
+        "messaging_product": "whatsapp",
+        "contacts": [{"input": payload.get("to"), "wa_id": payload.get("to")}],
+        "messages": [{"id": message_id}],
+    }
+
+@stub_gateway.get("/sent")
+async def stub_sent_messages():
+    """Messages received so far"""
+    return stub_gateway.state.sent
+
+@stub_gateway.post("/configure")
+async def stub_configure(failure_rate: float = 0.0, failure_status: int = 503, fail_next: int = 0):
+    """Make a share of sends fail, e.g. failure_rate=0.2&failure_status=429, or the next fail_next sends"""
+    stub_gateway.state.failure_rate = failure_rate
+    stub_gateway.state.failure_status = failure_status
+    stub_gateway.state.fail_next = fail_next
+    return {"failure_rate": failure_rate, "failure_status": failure_status, "fail_next": fail_next}
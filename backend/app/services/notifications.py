@@ -0,0 +1,258 @@
+"""
+Notification Dispatcher
+
+Sends outbound WhatsApp messages through a pluggable transport. All sends
+share one pooled httpx.AsyncClient, with a cap on concurrent requests, a
+per-provider rate limit and retries with backoff on 429/5xx and network
+errors. ``send_many`` streams any number of messages through a fixed set of
+workers, so a month-end run reuses a handful of keep-alive connections.
+
+Providers (NOTIFY_PROVIDER):
+    mock            no network; returns a wa.me link (the default)
+    whatsapp_cloud  WhatsApp Business Cloud API
+    webhook         POST {"to", "text", "reference"} to NOTIFY_WEBHOOK_URL
+    stub            whatsapp_cloud against the in-process stub gateway
+"""
+
+import asyncio
+import logging
+import random
+import re
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+
+from app.core.config import settings
+from app.services.enquiry_intake import TokenBucketLimiter
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# httpx is imported when the first HTTP transport sends, to keep cold starts fast
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def normalize_phone(phone: str) -> str:
+    """Digits only, with the Indian country code added to 10-digit numbers"""
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 10:
+        digits = "91" + digits
+    return digits
+
+def whatsapp_link(phone: str, text: str) -> str:
+    return f"https://wa.me/{normalize_phone(phone)}?text={quote(text)}"
+
+def message(to: str, text: str, reference: str = None) -> dict:
+    return {"to": normalize_phone(to), "text": text, "reference": reference}
+
+
+class SendError(Exception):
+    def __init__(self, detail: str, retry_after: float = None, retryable: bool = True):
+        super().__init__(detail)
+        self.retry_after = retry_after
+        self.retryable = retryable
+
+
+class Transport:
+    """Turns a message into a gateway request; subclasses define the wire format"""
+
+    name = "base"
+    uses_http = True
+
+    def client_options(self) -> dict:
+        return {}
+
+    async def send(self, client: "httpx.AsyncClient", msg: dict) -> dict:
+        response = await client.post(self.url(), json=self.body(msg), headers=self.headers())
+        if response.status_code in RETRY_STATUSES:
+            retry_after = response.headers.get("retry-after")
+            raise SendError(
+                f"HTTP {response.status_code}",
+                retry_after=float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else None
+            )
+        if response.status_code >= 400:
+            raise SendError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+        try:
+            return self.parse(response)
+        except (ValueError, AttributeError, LookupError, TypeError) as e:
+            raise SendError(f"Unexpected response from {self.name}: {response.text[:200]}", retryable=False) from e
+
+    def url(self) -> str:
+        raise NotImplementedError
+
+    def headers(self) -> dict:
+        return {}
+
+    def body(self, msg: dict) -> dict:
+        return {"to": msg["to"], "text": msg["text"], "reference": msg.get("reference")}
+
+    def parse(self, response: "httpx.Response") -> dict:
+        return {}
+
+
+class MockTransport(Transport):
+    """No gateway configured: build a wa.me link for a person to open"""
+
+    name = "mock"
+    uses_http = False
+
+    async def send(self, client, msg: dict) -> dict:
+        return {"whatsapp_link": whatsapp_link(msg["to"], msg["text"])}
+
+
+class WhatsAppCloudTransport(Transport):
+    name = "whatsapp_cloud"
+
+    def url(self) -> str:
+        return f"{settings.WHATSAPP_API_URL.rstrip('/')}/{settings.WHATSAPP_PHONE_NUMBER_ID}/messages"
+
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {settings.WHATSAPP_API_TOKEN}"}
+
+    def body(self, msg: dict) -> dict:
+        return {
+            "messaging_product": "whatsapp",
+            "to": msg["to"],
+            "type": "text",
+            "text": {"body": msg["text"]},
+        }
+
+    def parse(self, response: "httpx.Response") -> dict:
+        messages = response.json().get("messages") or [{}]
+        return {"provider_id": messages[0].get("id")}
+
+
+class WebhookTransport(Transport):
+    name = "webhook"
+
+    def url(self) -> str:
+        return settings.NOTIFY_WEBHOOK_URL
+
+    def parse(self, response: "httpx.Response") -> dict:
+        try:
+            return {"provider_id": response.json().get("id")}
+        except ValueError:
+            return {}
+
+
+class StubTransport(WhatsAppCloudTransport):
+    """WhatsApp Cloud API wire format served by the in-process stub gateway"""
+
+    name = "stub"
+
+    def client_options(self) -> dict:
+        import httpx
+        from app.services.notification_stub import stub_gateway
+        return {"transport": httpx.ASGITransport(app=stub_gateway), "base_url": "http://stub-gateway"}
+
+    def url(self) -> str:
+        return f"/{settings.WHATSAPP_PHONE_NUMBER_ID or 'stub'}/messages"
+
+
+TRANSPORTS = {
+    transport.name: transport
+    for transport in (MockTransport, WhatsAppCloudTransport, WebhookTransport, StubTransport)
+}
+
+
+class NotificationDispatcher:
+    def __init__(self, transport: Transport = None):
+        self._transport = transport
+        self._client = None
+        self._semaphore = None
+        self.limiter = TokenBucketLimiter(
+            settings.NOTIFY_RATE_PER_SECOND * 60, max(1, settings.NOTIFY_RATE_PER_SECOND)
+        )
+
+    @property
+    def transport(self) -> Transport:
+        if self._transport is None:
+            self._transport = TRANSPORTS[settings.NOTIFY_PROVIDER]()
+        return self._transport
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """The shared client; connections are kept alive and reused across sends"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=settings.NOTIFY_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.NOTIFY_CONCURRENCY,
+                    max_keepalive_connections=settings.NOTIFY_CONCURRENCY,
+                ),
+                **self.transport.client_options()
+            )
+            self._semaphore = asyncio.Semaphore(settings.NOTIFY_CONCURRENCY)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _throttle(self):
+        while True:
+            wait = self.limiter.acquire(self.transport.name)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    async def send(self, msg: dict) -> dict:
+        """Send one message with retries; never raises, the outcome is in the result"""
+        transport = self.transport
+        if transport.uses_http:
+            import httpx
+            client, errors = self._get_client(), (SendError, httpx.TransportError)
+        else:
+            client, errors = None, (SendError,)
+        result = {"to": msg["to"], "reference": msg.get("reference"), "provider": transport.name}
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if client is None:
+                    sent = await transport.send(None, msg)
+                else:
+                    await self._throttle()
+                    async with self._semaphore:
+                        sent = await transport.send(client, msg)
+                return {**result, "status": "sent", "attempts": attempt, **sent}
+            except errors as e:
+                retryable = getattr(e, "retryable", True)
+                if not retryable or attempt > settings.NOTIFY_MAX_RETRIES:
+                    logger.warning("Notification to %s failed after %d attempts: %s", msg["to"], attempt, e)
+                    return {**result, "status": "failed", "attempts": attempt, "error": str(e) or type(e).__name__}
+                delay = getattr(e, "retry_after", None)
+                if delay is None:
+                    delay = settings.NOTIFY_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                    delay += random.uniform(0, delay / 2)
+                await asyncio.sleep(delay)
+            except Exception as e:
+                # e.g. an unexpected provider body; the gateway may have accepted the
+                # message, so it is not retried
+                logger.exception("Notification to %s failed", msg["to"])
+                return {**result, "status": "failed", "attempts": attempt, "error": f"{type(e).__name__}: {e}"}
+
+    async def send_many(self, messages, on_progress=None) -> dict:
+        """Send an iterable of messages through a fixed pool of workers.
+
+        on_progress(done, total) is awaited after each message when given.
+        """
+        messages = list(messages)
+        total = len(messages)
+        pending = iter(messages)
+        results = []
+
+        async def worker():
+            for msg in pending:
+                results.append(await self.send(msg))
+                if on_progress:
+                    await on_progress(len(results), total)
+
+        await asyncio.gather(*(worker() for _ in range(min(settings.NOTIFY_CONCURRENCY, total) or 1)))
+        failed = [result for result in results if result["status"] != "sent"]
+        return {"total": total, "sent": total - len(failed), "failed": len(failed), "failures": failed[:100]}
+
+
+dispatcher = NotificationDispatcher()
@@ -0,0 +1,177 @@
+"""
+Offer Schedule
+
+Keeps every enabled offer in memory with its start and end instants (local
+midnight in BUSINESS_TIMEZONE; end_date is inclusive) and a precomputed,
+display-ordered list of the offers live right now. The list is rebuilt
+when the next start/end boundary passes, whenever the shared "offers"
+cache namespace is invalidated (admin edits, in any worker), and on a
+periodic reload. Cached product responses carry effective prices, so when
+a boundary or reload (rather than an edit, which invalidates them itself)
+changes the live set, "products" and "offers" are invalidated too.
+Reads never touch the database.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, or_
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Offer
+from app.schemas import OfferResponse
+
+logger = logging.getLogger(__name__)
+
+def business_now() -> datetime:
+    return datetime.now(ZoneInfo(settings.BUSINESS_TIMEZONE))
+
+def business_today() -> date:
+    return business_now().date()
+
+def live_offer_filter(today: date):
+    """SQL condition for offers that are enabled and within their dates on a given day"""
+    return and_(
+        Offer.is_active == True,
+        or_(Offer.start_date.is_(None), Offer.start_date <= today),
+        or_(Offer.end_date.is_(None), Offer.end_date >= today)
+    )
+
+def _midnight(day: Optional[date]) -> Optional[datetime]:
+    if day is None:
+        return None
+    return datetime.combine(day, time.min, tzinfo=ZoneInfo(settings.BUSINESS_TIMEZONE))
+
+
+class OfferSchedule:
+    def __init__(self, reload_seconds: float):
+        self.reload_seconds = reload_seconds
+        self.version = 0  # bumped whenever the live set is rebuilt
+        self._offers = None  # [(starts_at, ends_at, payload)] in display order
+        self._active = []
+        self._active_json = b"[]"
+        self._next_boundary: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._task = None
+        self._wakeup = None
+
+    def _load(self):
+        with SessionLocal() as db:
+            offers = db.query(Offer).filter(Offer.is_active == True).order_by(
+                Offer.display_order, Offer.created_at
+            ).all()
+            entries = [
+                (
+                    _midnight(offer.start_date),
+                    _midnight(offer.end_date + timedelta(days=1)) if offer.end_date else None,
+                    OfferResponse.model_validate(offer).model_dump(mode="json"),
+                )
+                for offer in offers
+            ]
+        with self._lock:
+            self._offers = entries
+            self._rebuild(business_now())
+
+    def _rebuild(self, now: datetime):
+        """Recompute the live list and the next boundary (caller holds the lock)"""
+        self._active = [
+            payload for starts_at, ends_at, payload in self._offers
+            if (starts_at is None or starts_at <= now) and (ends_at is None or now < ends_at)
+        ]
+        self._active_json = json.dumps(self._active).encode()
+        upcoming = [
+            instant for starts_at, ends_at, _ in self._offers
+            for instant in (starts_at, ends_at) if instant is not None and instant > now
+        ]
+        self._next_boundary = min(upcoming, default=None)
+        self.version += 1
+
+    def _check_boundary(self) -> bool:
+        """Rebuild once the next boundary has passed; True if the live list changed"""
+        boundary = self._next_boundary
+        if boundary is not None and business_now() >= boundary:
+            with self._lock:
+                if self._next_boundary is not None and business_now() >= self._next_boundary:
+                    previous = self._active_json
+                    self._rebuild(business_now())
+                    return self._active_json != previous
+        return False
+
+    async def _live_set_changed(self):
+        # Cached product and offer responses were rendered from the old live list
+        await cache.invalidate("products", "offers")
+
+    async def _ensure_loaded(self):
+        if self._offers is None:
+            await asyncio.to_thread(self._load)
+        if self._check_boundary():
+            await self._live_set_changed()
+
+    async def active(self) -> list:
+        """Live offers in display order, as OfferResponse dicts"""
+        await self._ensure_loaded()
+        return self._active
+
+    async def active_json(self) -> bytes:
+        """The live list pre-serialised as a JSON array"""
+        await self._ensure_loaded()
+        return self._active_json
+
+    async def refresh(self):
+        """Reload after an offer was created, edited or deleted"""
+        await asyncio.to_thread(self._load)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            previous = self._active_json if self._offers is not None else None
+            try:
+                await asyncio.to_thread(self._load)
+            except Exception as e:
+                logger.warning("Could not load offers: %s", e)
+            else:
+                if previous is not None and self._active_json != previous:
+                    await self._live_set_changed()
+            reload_at = loop.time() + self.reload_seconds
+            while (remaining := reload_at - loop.time()) > 0:
+                # Sleep until the next start/end boundary, a local edit or the periodic reload
+                if self._next_boundary is not None:
+                    until_boundary = (self._next_boundary - business_now()).total_seconds()
+                    remaining = min(remaining, max(0.0, until_boundary))
+                self._wakeup.clear()
+                # asyncio.wait, not wait_for: a wakeup racing stop() must not swallow the cancel
+                waiter = asyncio.ensure_future(self._wakeup.wait())
+                try:
+                    done, _ = await asyncio.wait({waiter}, timeout=remaining)
+                finally:
+                    waiter.cancel()
+                if not done and self._check_boundary():
+                    await self._live_set_changed()
+
+
+offer_schedule = OfferSchedule(settings.OFFER_RELOAD_SECONDS)
+cache.on_invalidate("offers", offer_schedule.refresh)
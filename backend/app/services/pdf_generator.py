@@ -3,6 +3,7 @@ PDF Invoice Generator Service
 """
 
 from io import BytesIO
+from xml.sax.saxutils import escape
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -10,10 +11,14 @@ from reportlab.lib.units import inch, mm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 
-from app.core.config import settings
+from app.services.business_settings import business_settings
 
-def generate_invoice_pdf(invoice, customer=None) -> BytesIO:
-    """Generate PDF invoice"""
+# Paragraph text is reportlab markup, so every value typed by a user
+# (customer details, notes, settings) goes through escape() first
+
+def generate_invoice_pdf(invoice, customer=None, on_page=None) -> BytesIO:
+    """Generate PDF invoice; on_page(page_number) is called as each page starts"""
+    business = business_settings.get()
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -61,10 +66,14 @@ def generate_invoice_pdf(invoice, customer=None) -> BytesIO:
     )
     
     # Header - Company Name
-    elements.append(Paragraph(settings.BUSINESS_NAME, title_style))
-    elements.append(Paragraph("Quality Manufacturing & Reliable Services", subtitle_style))
-    elements.append(Paragraph(settings.BUSINESS_ADDRESS, subtitle_style))
-    elements.append(Paragraph(f"Phone: {settings.BUSINESS_PHONE} | Email: {settings.BUSINESS_EMAIL}", subtitle_style))
+    elements.append(Paragraph(escape(business["business_name"]), title_style))
+    elements.append(Paragraph(escape(business["business_tagline"]), subtitle_style))
+    elements.append(Paragraph(escape(business["business_address"]), subtitle_style))
+    elements.append(Paragraph(
+        f"Phone: {escape(business['business_phone'])} | Email: {escape(business['business_email'])}", subtitle_style
+    ))
+    if business["gst_number"]:
+        elements.append(Paragraph(f"GSTIN: {escape(business['gst_number'])}", subtitle_style))
     elements.append(Spacer(1, 20))
     
     # Invoice Title
@@ -95,12 +104,12 @@ def generate_invoice_pdf(invoice, customer=None) -> BytesIO:
     elements.append(Paragraph("Bill To:", heading_style))
     if customer:
         customer_info = f"""
-        <b>{customer.contact_person}</b><br/>
-        {customer.company_name or ''}<br/>
-        {customer.address or ''}<br/>
-        {customer.city or ''}, {customer.state or ''} - {customer.pincode or ''}<br/>
-        Phone: {customer.phone}<br/>
-        {f'GST: {customer.gst_number}' if customer.gst_number else ''}
+        <b>{escape(customer.contact_person)}</b><br/>
+        {escape(customer.company_name or '')}<br/>
+        {escape(customer.address or '')}<br/>
+        {escape(customer.city or '')}, {escape(customer.state or '')} - {escape(customer.pincode or '')}<br/>
+        Phone: {escape(customer.phone)}<br/>
+        {f'GST: {escape(customer.gst_number)}' if customer.gst_number else ''}
         """
         elements.append(Paragraph(customer_info, normal_style))
     else:
@@ -172,12 +181,13 @@ def generate_invoice_pdf(invoice, customer=None) -> BytesIO:
     # Notes and Terms
     if invoice.notes:
         elements.append(Paragraph("Notes:", heading_style))
-        elements.append(Paragraph(invoice.notes, normal_style))
+        elements.append(Paragraph(escape(invoice.notes), normal_style))
         elements.append(Spacer(1, 10))
     
-    if invoice.terms:
+    terms = invoice.terms or business["invoice_terms"]
+    if terms:
         elements.append(Paragraph("Terms & Conditions:", heading_style))
-        elements.append(Paragraph(invoice.terms, normal_style))
+        elements.append(Paragraph(escape(terms), normal_style))
         elements.append(Spacer(1, 20))
     
     # Footer
@@ -190,11 +200,110 @@ def generate_invoice_pdf(invoice, customer=None) -> BytesIO:
     )
     elements.append(Spacer(1, 30))
     elements.append(Paragraph(
-        f"Thank you for your business! | {settings.BUSINESS_NAME} | Est. 2023",
+        f"Thank you for your business! | {escape(business['business_name'])} | Est. {escape(business['established_year'])}",
         footer_style
     ))
     
     # Build PDF
+    if on_page:
+        page_hook = lambda canvas, document: on_page(document.page)
+        doc.build(elements, onFirstPage=page_hook, onLaterPages=page_hook)
+    else:
+        doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+def generate_statement_pdf(statement: dict, customer) -> BytesIO:
+    """Generate PDF customer account statement"""
+    business = business_settings.get()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=20*mm,
+        leftMargin=20*mm,
+        topMargin=20*mm,
+        bottomMargin=20*mm
+    )
+    
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        spaceAfter=6,
+        textColor=colors.HexColor('#1e40af'),
+        alignment=TA_CENTER
+    )
+    
+    subtitle_style = ParagraphStyle(
+        'Subtitle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.gray,
+        alignment=TA_CENTER
+    )
+    
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=4
+    )
+    
+    # Header - Company Name
+    elements.append(Paragraph(escape(business["business_name"]), title_style))
+    elements.append(Paragraph(escape(business["business_address"]), subtitle_style))
+    elements.append(Paragraph(
+        f"Phone: {escape(business['business_phone'])} | Email: {escape(business['business_email'])}", subtitle_style
+    ))
+    elements.append(Spacer(1, 20))
+    
+    elements.append(Paragraph("STATEMENT OF ACCOUNT", styles['Heading1']))
+    period = f"{statement['from'] or 'Beginning'} to {statement['to'] or 'Today'}"
+    elements.append(Paragraph(
+        f"<b>{escape(customer.contact_person)}</b> {escape(customer.company_name or '')}<br/>Period: {period}",
+        normal_style
+    ))
+    elements.append(Spacer(1, 10))
+    
+    # Ledger table
+    ledger_data = [['Date', 'Invoice', 'Status', 'Debit', 'Credit', 'Balance']]
+    ledger_data.append(['', 'Opening balance', '', '', '', f"₹{statement['opening_balance']:,.2f}"])
+    for line in statement['lines']:
+        ledger_data.append([
+            line['invoice_date'],
+            line['invoice_number'],
+            line['status'].upper(),
+            f"₹{line['debit']:,.2f}",
+            f"₹{line['credit']:,.2f}" if line['credit'] else '-',
+            f"₹{line['balance']:,.2f}"
+        ])
+    ledger_data.append([
+        '', 'Closing balance', '',
+        f"₹{statement['total_debit']:,.2f}",
+        f"₹{statement['total_credit']:,.2f}",
+        f"₹{statement['closing_balance']:,.2f}"
+    ])
+    
+    ledger_table = Table(ledger_data, colWidths=[70, 110, 60, 80, 80, 80], repeatRows=1)
+    ledger_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (3, 0), (5, -1), 'RIGHT'),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('LINEABOVE', (0, -1), (-1, -1), 1, colors.HexColor('#1e40af')),
+        ('GRID', (0, 0), (-1, -2), 0.5, colors.gray),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    elements.append(ledger_table)
+    
     doc.build(elements)
     buffer.seek(0)
     return buffer
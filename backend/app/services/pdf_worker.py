@@ -0,0 +1,51 @@
+"""
+PDF Worker Pool
+
+Runs ReportLab rendering on a small thread pool so PDF requests do not
+block the event loop, and exposes how busy the pool is for readiness checks.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.core.metrics import PDF_RENDER
+
+
+class PdfWorkerPool:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.busy = 0
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf")
+        return self._executor
+
+    async def render(self, document: str, func, *args):
+        """Run a PDF generator function on the pool and return its result"""
+        def timed():
+            with PDF_RENDER.time(document):
+                return func(*args)
+
+        self.busy += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), timed)
+        finally:
+            self.busy -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "busy": min(self.busy, self.workers),
+            "queued": max(0, self.busy - self.workers),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+pdf_workers = PdfWorkerPool(settings.PDF_WORKERS)
@@ -0,0 +1,55 @@
+"""
+Pricing Engine
+
+Effective prices for a whole product list in one pass. The live offers are
+folded into best-discount maps keyed by category and by product once per
+offer-schedule version, so pricing a page costs two dict lookups per
+product and no queries. Offers do not stack: the largest discount wins.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from app.services.offer_schedule import offer_schedule
+
+CENT = Decimal("0.01")
+HUNDRED = Decimal(100)
+
+class PricingEngine:
+    def __init__(self):
+        self._version = None
+        self._by_category = {}
+        self._by_product = {}
+
+    def _discounts(self, offers: list, version: int):
+        if version != self._version:
+            by_category, by_product = {}, {}
+            for offer in offers:
+                percent = min(HUNDRED, Decimal(str(offer["discount_percent"] or 0)))
+                if percent <= 0:
+                    continue
+                for key, ids in ((by_category, offer["category_ids"]), (by_product, offer["product_ids"])):
+                    for target_id in ids:
+                        key[str(target_id)] = max(percent, key.get(str(target_id), 0))
+            self._by_category, self._by_product, self._version = by_category, by_product, version
+        return self._by_category, self._by_product
+
+    def effective_price(self, price, category_id, product_id, by_category: dict, by_product: dict):
+        if price is None:
+            return None
+        percent = max(by_product.get(str(product_id), 0), by_category.get(str(category_id), 0))
+        if not percent:
+            return Decimal(price)
+        return (Decimal(price) * (HUNDRED - percent) / HUNDRED).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    async def apply(self, products: list) -> list:
+        """Set effective_price on each product dict in place"""
+        offers = await offer_schedule.active()
+        by_category, by_product = self._discounts(offers, offer_schedule.version)
+        for product in products:
+            product["effective_price"] = self.effective_price(
+                product.get("price"), product.get("category_id"), product.get("id"), by_category, by_product
+            )
+        return products
+
+
+pricing = PricingEngine()
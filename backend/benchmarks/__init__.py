@@ -0,0 +1 @@
+# API load-test and benchmark suite
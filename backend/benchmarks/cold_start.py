@@ -0,0 +1,76 @@
+"""
+Cold Start Benchmark
+
+Starts the API with uvicorn repeatedly and measures the time from process
+spawn to the first healthy /api/health response, with and without
+LAZY_STARTUP.
+
+    python -m benchmarks.cold_start --runs 5 --output benchmarks/results/cold_start.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.run import DEFAULT_DATABASE_URL, summarize
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_to_healthy(env: dict, timeout: float) -> float:
+    """Spawn uvicorn and return seconds until /api/health answers 200"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/api/health"
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(url, timeout=0.5).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"/api/health not healthy after {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure time to first healthy response")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode, lazy in (("eager", "false"), ("lazy", "true")):
+        env = {**os.environ, "DATABASE_URL": args.database_url, "LAZY_STARTUP": lazy}
+        samples = [time_to_healthy(env, args.timeout) for _ in range(args.runs)]
+        results[mode] = summarize(samples, 0, sum(samples))
+        r = results[mode]
+        print(f"{mode:6} p50 {r['p50_ms']:>8.1f}ms  p95 {r['p95_ms']:>8.1f}ms  max {r['max_ms']:>8.1f}ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, "results": results}, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
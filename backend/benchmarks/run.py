@@ -0,0 +1,225 @@
+"""
+API Benchmark Runner
+
+Seeds a database with synthetic data and drives the real FastAPI app
+through httpx, reporting throughput and latency percentiles per route.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.run --scale small --output benchmarks/results/latest.json
+    python -m benchmarks.run --skip-seed --compare benchmarks/results/baseline.json
+
+By default the app runs in-process over httpx's ASGI transport against
+DATABASE_URL (or --database-url). Pass --base-url to benchmark a running
+server instead; it must use the same database that was seeded.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date, datetime, timezone
+
+import httpx
+
+DEFAULT_DATABASE_URL = "sqlite:///./bench.db"
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+async def run_scenario(client: httpx.AsyncClient, make_request, total: int, concurrency: int) -> dict:
+    """Fire `total` requests with at most `concurrency` in flight"""
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, kwargs = make_request()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+def load_samples(engine, size: int = 500) -> dict:
+    """Pick real slugs, ids and search terms to request"""
+    from sqlalchemy.orm import Session
+    from app.models import Product, Invoice, Customer
+
+    with Session(engine) as db:
+        slugs = [row[0] for row in db.query(Product.slug).limit(size)]
+        invoice_ids = [str(row[0]) for row in db.query(Invoice.id).limit(size)]
+        customer_ids = [str(row[0]) for row in db.query(Customer.id).limit(size)]
+    return {"slugs": slugs, "invoice_ids": invoice_ids, "customer_ids": customer_ids}
+
+def build_scenarios(samples: dict, credentials: dict, rng: random.Random) -> dict:
+    """Map scenario name to a factory producing (method, url, kwargs)"""
+    from benchmarks.seed import WORDS
+
+    def invoice_payload():
+        return {"json": {
+            "customer_id": rng.choice(samples["customer_ids"]) if samples["customer_ids"] else None,
+            "invoice_date": date.today().isoformat(),
+            "subtotal": "1000.00",
+            "total_amount": "1180.00",
+            "tax_rate": "18",
+            "tax_amount": "180.00",
+            "status": "pending",
+            "items": [{"description": "Benchmark item", "quantity": "1", "unit_price": "1000.00", "amount": "1000.00"}],
+        }}
+
+    return {
+        "login": lambda: ("POST", "/api/auth/login", {"json": credentials}),
+        "products_list": lambda: ("GET", "/api/products/", {"params": {"limit": 50}}),
+        "products_search": lambda: ("GET", "/api/products/", {"params": {"search": rng.choice(WORDS), "limit": 50}}),
+        "product_by_slug": lambda: ("GET", f"/api/products/slug/{rng.choice(samples['slugs'])}", {}),
+        "dashboard_stats": lambda: ("GET", "/api/dashboard/stats", {}),
+        "invoices_list": lambda: ("GET", "/api/invoices/", {"params": {"limit": 50}}),
+        "invoice_create": lambda: ("POST", "/api/invoices/", invoice_payload()),
+        "invoice_pdf": lambda: ("GET", f"/api/invoices/{rng.choice(samples['invoice_ids'])}/pdf", {}),
+    }
+
+def compare(results: dict, baseline_path: str, threshold: float) -> list:
+    """Return regressions where p95 grew by more than threshold over baseline"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous["p95_ms"]:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+async def main(args) -> int:
+    os.environ["DATABASE_URL"] = args.database_url
+    # Benchmarks measure the application, not the contact-form limiter
+    os.environ.setdefault("ENQUIRY_RATE_LIMIT_PER_MINUTE", "1000000")
+
+    from app.core.database import engine
+    from benchmarks.seed import SCALES, seed_database, BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+
+    scale = dict(SCALES[args.scale])
+    for key in ("products", "customers", "invoices"):
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed_database(engine, scale, seed=args.seed)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    credentials = {"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD}
+    samples = load_samples(engine)
+    rng = random.Random(args.seed)
+    scenarios = build_scenarios(samples, credentials, rng)
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    results = {}
+    async with client:
+        response = await client.post("/api/auth/login", json=credentials)
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        for name in selected:
+            make_request = scenarios[name]
+            # Warm up connections, caches and lazy imports before measuring
+            await run_scenario(client, make_request, min(args.warmup, args.requests), args.concurrency)
+            total = max(1, args.requests // 10) if name in ("login", "invoice_pdf") else args.requests
+            results[name] = await run_scenario(client, make_request, total, args.concurrency)
+            r = results[name]
+            print(f"{name:18} {r['throughput_rps']:>9.1f} rps  p50 {r['p50_ms']:>8.2f}ms  "
+                  f"p95 {r['p95_ms']:>8.2f}ms  p99 {r['p99_ms']:>8.2f}ms  errors {r['errors']}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "scale": args.scale,
+            "data": scale,
+            "database": engine.dialect.name,
+            "target": args.base_url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Nellusoru API")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--scale", choices=("small", "medium", "large"), default="small")
+    parser.add_argument("--products", type=int)
+    parser.add_argument("--customers", type=int)
+    parser.add_argument("--invoices", type=int)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse previously seeded data")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--scenarios", help="comma-separated subset of scenarios to run")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth, e.g. 0.2 = 20%%")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
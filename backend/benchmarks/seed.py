@@ -0,0 +1,159 @@
+"""
+Synthetic Data Seeder for Benchmarks
+
+Fills a database with deterministic fake data at a chosen scale using
+Core bulk inserts, then rebuilds the analytics rollups.
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.migrations import upgrade
+from app.core.security import get_password_hash
+from app.models import User, Category, Product, Customer, Invoice, InvoiceItem
+from app.services.analytics import rebuild_rollups
+
+BENCH_ADMIN_EMAIL = "bench@nellusoru.com"
+BENCH_ADMIN_PASSWORD = "bench-password"
+
+SCALES = {
+    "small": {"categories": 10, "products": 1000, "customers": 2000, "invoices": 5000, "items_per_invoice": 3},
+    "medium": {"categories": 20, "products": 10000, "customers": 50000, "invoices": 100000, "items_per_invoice": 2},
+    "large": {"categories": 50, "products": 100000, "customers": 1000000, "invoices": 1000000, "items_per_invoice": 1},
+}
+
+CHUNK_SIZE = 5000
+WORDS = (
+    "steel", "aluminium", "copper", "bearing", "motor", "valve", "pipe", "sheet", "rod", "bolt",
+    "welding", "cutting", "precision", "industrial", "heavy", "custom", "pump", "gear", "chain", "coupling",
+)
+STATUSES = ("draft", "pending", "paid", "paid", "paid", "cancelled")
+
+def _insert_chunks(conn, model, rows):
+    """Insert an iterable of row dicts in fixed-size chunks"""
+    table = model.__table__
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            conn.execute(table.insert(), chunk)
+            chunk = []
+    if chunk:
+        conn.execute(table.insert(), chunk)
+
+def seed_database(engine, scale: dict, seed: int = 42, log=print) -> dict:
+    """Drop and recreate all tables, then load synthetic data"""
+    rng = random.Random(seed)
+    Base.metadata.drop_all(bind=engine)
+    upgrade(engine)
+
+    admin_id = uuid.uuid4()
+    category_ids = [uuid.uuid4() for _ in range(scale["categories"])]
+    product_ids = [uuid.uuid4() for _ in range(scale["products"])]
+    product_prices = [Decimal(rng.randint(100, 50000)) for _ in product_ids]
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{
+            "id": admin_id,
+            "email": BENCH_ADMIN_EMAIL,
+            "password_hash": get_password_hash(BENCH_ADMIN_PASSWORD),
+            "full_name": "Benchmark Admin",
+            "role": "admin",
+            "is_active": True,
+        }])
+
+        log(f"Seeding {len(category_ids)} categories")
+        _insert_chunks(conn, Category, (
+            {"id": category_id, "name": f"Category {i}", "slug": f"category-{i}", "display_order": i, "is_active": True}
+            for i, category_id in enumerate(category_ids)
+        ))
+
+        log(f"Seeding {len(product_ids)} products")
+        _insert_chunks(conn, Product, (
+            {
+                "id": product_id,
+                "category_id": rng.choice(category_ids),
+                "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+                "slug": f"product-{i}",
+                "brand": rng.choice(("Tata", "Bosch", "SKF", "Siemens", "Nellusoru")),
+                "description": " ".join(rng.choice(WORDS) for _ in range(20)),
+                "price": price,
+                "unit": "per unit",
+                "min_order_quantity": 1,
+                "is_featured": rng.random() < 0.05,
+                "is_active": rng.random() < 0.95,
+            }
+            for i, (product_id, price) in enumerate(zip(product_ids, product_prices))
+        ))
+
+        customer_ids = [uuid.uuid4() for _ in range(scale["customers"])]
+        log(f"Seeding {len(customer_ids)} customers")
+        _insert_chunks(conn, Customer, (
+            {
+                "id": customer_id,
+                "contact_person": f"Customer {i}",
+                "company_name": f"Company {i}",
+                "phone": f"9{i:09d}",
+                "email": f"customer{i}@example.com",
+                "city": "Karur",
+                "state": "Tamil Nadu",
+                "is_active": True,
+            }
+            for i, customer_id in enumerate(customer_ids)
+        ))
+
+        log(f"Seeding {scale['invoices']} invoices with {scale['items_per_invoice']} items each")
+        start = date.today() - timedelta(days=3 * 365)
+        invoices = []
+        items = []
+        for i in range(scale["invoices"]):
+            invoice_id = uuid.uuid4()
+            invoice_date = start + timedelta(days=rng.randint(0, 3 * 365))
+            subtotal = Decimal(0)
+            for _ in range(scale["items_per_invoice"]):
+                index = rng.randrange(len(product_ids))
+                quantity = Decimal(rng.randint(1, 20))
+                amount = product_prices[index] * quantity
+                subtotal += amount
+                items.append({
+                    "id": uuid.uuid4(),
+                    "invoice_id": invoice_id,
+                    "product_id": product_ids[index],
+                    "description": f"Product {index}",
+                    "quantity": quantity,
+                    "unit_price": product_prices[index],
+                    "discount_percent": Decimal(0),
+                    "amount": amount,
+                })
+            invoices.append({
+                "id": invoice_id,
+                "invoice_number": f"BENCH-{i:08d}",
+                "customer_id": rng.choice(customer_ids),
+                "invoice_date": invoice_date,
+                "due_date": invoice_date + timedelta(days=30),
+                "subtotal": subtotal,
+                "tax_rate": Decimal(18),
+                "tax_amount": subtotal * Decimal("0.18"),
+                "discount_amount": Decimal(0),
+                "total_amount": subtotal * Decimal("1.18"),
+                "status": rng.choice(STATUSES),
+                "created_by": admin_id,
+            })
+            if len(invoices) >= CHUNK_SIZE:
+                _insert_chunks(conn, Invoice, invoices)
+                _insert_chunks(conn, InvoiceItem, items)
+                invoices, items = [], []
+        _insert_chunks(conn, Invoice, invoices)
+        _insert_chunks(conn, InvoiceItem, items)
+
+    log("Rebuilding analytics rollups")
+    with Session(engine) as db:
+        rebuild_rollups(db)
+        db.commit()
+
+    return {"admin_email": BENCH_ADMIN_EMAIL, "admin_password": BENCH_ADMIN_PASSWORD}
@@ -0,0 +1,77 @@
+"""
+Shared fixtures. The app runs against a throwaway SQLite database and the
+in-memory cache backend; settings come from the environment, so they are
+set before anything under app/ is imported.
+"""
+
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="nellusoru-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["CATALOGUE_SNAPSHOT_DIR"] = os.path.join(_workdir, "catalogue")
+os.environ["MEDIA_ROOT"] = os.path.join(_workdir, "media")
+os.environ["ENQUIRY_DEAD_LETTER_PATH"] = os.path.join(_workdir, "enquiry_dead_letters.jsonl")
+
+import pytest
+from fastapi.testclient import TestClient
+
+# app.core and app.models import each other; load them in the order the app does
+import app.main  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin_user(client):
+    from app.core.database import SessionLocal
+    from app.core.security import get_password_hash
+    from app.models import User
+    with SessionLocal() as db:
+        user = User(email="admin@example.com", password_hash=get_password_hash("secret"),
+                    full_name="Admin", role="admin", is_active=True)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+    return user
+
+
+@pytest.fixture
+def admin(client, admin_user):
+    """Authenticate every request as the admin user for the duration of a test"""
+    from app.core.security import get_current_user, get_current_admin
+    overrides = client.app.dependency_overrides
+    overrides[get_current_user] = overrides[get_current_admin] = lambda: admin_user
+    yield admin_user
+    overrides.pop(get_current_user, None)
+    overrides.pop(get_current_admin, None)
+
+
+@pytest.fixture
+def count_queries():
+    """Count statements on the primary engine whose SQL contains a fragment"""
+    from sqlalchemy import event
+    from app.core.database import engine
+
+    counts = {}
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        for fragment in counts:
+            if fragment in statement:
+                counts[fragment] += 1
+
+    event.listen(engine, "before_cursor_execute", listener)
+
+    def count(fragment: str):
+        counts.setdefault(fragment, 0)
+        return lambda: counts[fragment]
+
+    yield count
+    event.remove(engine, "before_cursor_execute", listener)
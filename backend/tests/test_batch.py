@@ -0,0 +1,54 @@
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUESTS
+
+
+def batch(client, *requests):
+    response = client.post("/api/batch/", json={"requests": [
+        {"id": str(index), **request} for index, request in enumerate(requests)
+    ]})
+    assert response.status_code == 200
+    return response.json()["responses"]
+
+
+def test_responses_come_back_in_request_order(client, admin):
+    responses = batch(
+        client,
+        {"path": "/api/dashboard/recent-invoices"},
+        {"path": "/api/health"},
+        {"path": "/api/categories", "params": {"limit": 5}},
+        {"path": "/api/no-such-endpoint"},
+    )
+
+    assert [response["id"] for response in responses] == ["0", "1", "2", "3"]
+    assert [response["status"] for response in responses] == [200, 200, 200, 404]
+    assert responses[1]["body"]["status"] == "healthy"
+    assert isinstance(responses[2]["body"], list)
+
+
+def test_only_gets_under_api_can_be_batched(client, admin):
+    responses = batch(
+        client,
+        {"method": "POST", "path": "/api/categories"},
+        {"path": "/api/batch/"},
+        {"path": "/api/dashboard/stream"},
+        {"path": "/metrics"},
+    )
+
+    assert [response["status"] for response in responses] == [405, 400, 400, 400]
+
+
+def test_slow_sub_request_times_out(client, admin, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_REQUEST_TIMEOUT_SECONDS", 0)
+
+    [response] = batch(client, {"path": "/api/dashboard/stats"})
+
+    assert response["status"] == 504
+
+
+def test_sub_requests_pass_through_the_middleware(client, admin):
+    labels = ("GET", "/api/dashboard/recent-enquiries", "200")
+    before = HTTP_REQUESTS._values.get(labels, 0)
+
+    batch(client, {"path": "/api/dashboard/recent-enquiries"}, {"path": "/api/dashboard/recent-enquiries"})
+
+    assert HTTP_REQUESTS._values.get(labels, 0) == before + 2
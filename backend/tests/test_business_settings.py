@@ -0,0 +1,17 @@
+from app.core.database import SessionLocal
+from app.models import Setting
+from app.services.business_settings import PUBLIC_KEYS, VERSION_KEY, business_settings
+
+
+def test_public_settings_only_expose_the_allow_list(client):
+    with SessionLocal() as db:
+        db.add(Setting(key="payment_gateway_secret", value="do-not-leak"))
+        db.commit()
+    business_settings.invalidate()
+
+    public = client.get("/api/settings/public").json()
+
+    assert set(public) == set(PUBLIC_KEYS)
+    assert "invoice_prefix" not in public
+    assert VERSION_KEY not in public
+    assert "do-not-leak" not in public.values()
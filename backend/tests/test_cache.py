@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.core.cache import Cache, RedisBackend
+
+
+def redis_cache(server) -> Cache:
+    """A Cache on the Redis backend, talking to an in-process Redis stand-in"""
+    backend = RedisBackend("redis://localhost:6379/0", "test:")
+    backend._client = fakeredis.FakeAsyncRedis(server=server)
+    cache = Cache()
+    cache.backend = backend
+    return cache
+
+
+async def until(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_invalidation_reaches_another_worker():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first, second = redis_cache(server), redis_cache(server)
+        notified = []
+
+        async def hook():
+            notified.append("products")
+
+        second.on_invalidate("products", hook)
+        await first.start()
+        await second.start()
+        await until(lambda: first._listening and second._listening)
+        try:
+            entry_key = await first.entry_key("products", "/api/products/?")
+            await first.set(entry_key, b"cached", 60)
+            assert await second.get(await second.entry_key("products", "/api/products/?")) == b"cached"
+            # Listening workers keep generations locally; only the announcement moves them
+            assert await second.generation("products") == 0
+
+            await first.invalidate("products")
+            await until(lambda: notified)
+
+            assert await second.generation("products") == 1
+            assert await second.get(await second.entry_key("products", "/api/products/?")) is None
+            assert await second.generation("categories") == 0
+        finally:
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_backend_errors_are_misses():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        cache = redis_cache(server)
+        entry_key = await cache.entry_key("products", "/api/products/?")
+        await cache.set(entry_key, b"cached", 60)
+
+        server.connected = False
+        assert await cache.generation("products") is None
+        assert await cache.entry_key("products", "/api/products/?") is None
+        assert await cache.get(entry_key) is None
+        await cache.set(entry_key, b"other", 60)
+        await cache.invalidate("products")
+
+        server.connected = True
+        assert await cache.get(entry_key) == b"cached"
+        await cache.stop()
+
+    asyncio.run(scenario())
+
+
+def test_hooks_run_once_per_invalidation_in_every_worker():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first, second = redis_cache(server), redis_cache(server)
+        calls = {"first": 0, "second": 0}
+
+        def hook(name):
+            async def count():
+                calls[name] += 1
+            return count
+
+        first.on_invalidate("offers", hook("first"))
+        second.on_invalidate("offers", hook("second"))
+        await first.start()
+        await second.start()
+        await until(lambda: first._listening and second._listening)
+        try:
+            await first.invalidate("offers")
+            # The invalidating worker's hooks have run before invalidate returns
+            assert calls["first"] == 1
+            await until(lambda: calls["second"] == 1)
+            await asyncio.sleep(0.1)
+            assert calls == {"first": 1, "second": 1}
+        finally:
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+from app.api.storefront import home_payload
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import CACHE_REQUESTS
+from app.core.security import load_user
+from app.services.business_settings import business_settings
+
+
+def lookups(name: str) -> tuple:
+    values = CACHE_REQUESTS._values
+    return values.get((name, "hit"), 0), values.get((name, "miss"), 0)
+
+
+def delta(before: tuple, after: tuple) -> tuple:
+    return after[0] - before[0], after[1] - before[1]
+
+
+def test_response_cache_lookups_are_counted(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    client.portal.call(cache.invalidate, "categories")
+    before = lookups("response")
+    client.get("/api/categories/")
+    client.get("/api/categories/")
+
+    assert delta(before, lookups("response")) == (1, 1)
+    assert 'cache_requests_total{cache="response",result="hit"}' in client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).text
+
+
+def test_auth_lookups_are_counted(client, admin_user):
+    async def load_twice():
+        with SessionLocal() as db:
+            await load_user(db, admin_user.id)
+            await load_user(db, admin_user.id)
+
+    client.portal.call(cache.invalidate, "auth")
+    before = lookups("auth")
+    client.portal.call(load_twice)
+
+    assert delta(before, lookups("auth")) == (1, 1)
+
+
+def test_settings_and_storefront_lookups_are_counted(client):
+    business_settings.invalidate()
+    before = lookups("business_settings")
+    business_settings.get()
+    business_settings.get()
+    assert sum(delta(before, lookups("business_settings"))) == 2
+    assert delta(before, lookups("business_settings"))[0] >= 1
+
+    client.portal.call(home_payload.invalidate)
+    before = lookups("storefront_home")
+    client.get("/api/storefront/home")
+    client.get("/api/storefront/home")
+    assert delta(before, lookups("storefront_home")) == (1, 1)
@@ -0,0 +1,63 @@
+import asyncio
+import os
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services import catalogue_snapshot as snapshot_module
+from app.services.catalogue_snapshot import CatalogueSnapshot
+
+
+def product(slug):
+    return {"id": str(uuid4()), "slug": slug, "name": slug.title()}
+
+
+def make_snapshot(directory, monkeypatch, products):
+    """A snapshot service whose generations are stuck at (0, 0), as after a memory-backend restart"""
+    snapshot = CatalogueSnapshot(str(directory))
+
+    async def generations():
+        return 0, 0
+
+    monkeypatch.setattr(snapshot, "_generations", generations)
+    monkeypatch.setattr(snapshot_module, "_load_catalogue", lambda: (list(products), []))
+    return snapshot
+
+
+def test_boot_rebuilds_a_snapshot_from_before_the_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOGUE_SNAPSHOT_ENABLED", True)
+    old = product("old-stock")
+    asyncio.run(make_snapshot(tmp_path, monkeypatch, [old]).refresh())
+
+    # Restarted: a product was added while down, but the generations look unchanged
+    new = product("new-stock")
+    restarted = make_snapshot(tmp_path, monkeypatch, [old, new])
+    with open(os.path.join(tmp_path, "CURRENT")) as f:
+        built_at = os.stat(os.path.join(tmp_path, f.read().strip())).st_mtime
+    monkeypatch.setattr(snapshot_module, "STARTED_AT", built_at + 1)
+    asyncio.run(restarted.start())
+
+    assert asyncio.run(restarted.find("products", slug="new-stock"))["id"] == new["id"]
+    assert asyncio.run(restarted.find("products", id=old["id"]))["slug"] == "old-stock"
+
+
+def test_matching_snapshot_is_reused_within_a_boot(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOGUE_SNAPSHOT_ENABLED", True)
+    first = make_snapshot(tmp_path, monkeypatch, [product("a")])
+    asyncio.run(first.start())
+    second = make_snapshot(tmp_path, monkeypatch, [product("b")])
+    monkeypatch.setattr(snapshot_module, "STARTED_AT", first._snapshot.built_at)
+    asyncio.run(second.start())
+
+    assert second._snapshot.name == first._snapshot.name
+
+
+def test_disabled_by_default_with_the_memory_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOGUE_SNAPSHOT_ENABLED", None)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    snapshot = make_snapshot(tmp_path, monkeypatch, [product("a")])
+    asyncio.run(snapshot.start())
+
+    assert not snapshot.enabled
+    assert not os.path.exists(os.path.join(tmp_path, "CURRENT"))
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    assert snapshot.enabled
@@ -0,0 +1,45 @@
+from starlette.requests import Request
+
+from app.api.enquiries import get_client_ip
+from app.core.config import settings
+from app.services.enquiry_intake import TokenBucketLimiter, enquiry_intake
+
+
+def make_request(forwarded=None, peer="10.0.0.5"):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 4000)})
+
+
+def test_forwarded_header_ignored_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 0)
+    assert get_client_ip(make_request("1.2.3.4")) == "10.0.0.5"
+
+
+def test_takes_the_entry_added_by_the_outermost_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 1)
+    # The client forged the first entry; the proxy appended the real address
+    assert get_client_ip(make_request("6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 2)
+    assert get_client_ip(make_request("6.6.6.6, 203.0.113.7, 10.0.0.2")) == "203.0.113.7"
+
+
+def test_short_header_falls_back_to_the_peer(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 2)
+    assert get_client_ip(make_request("203.0.113.7")) == "10.0.0.5"
+
+
+def test_enquiry_rate_limit_is_per_client_behind_one_proxy(client, monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_COUNT", 1)
+    monkeypatch.setattr(enquiry_intake, "ip_limiter", TokenBucketLimiter(rate_per_minute=1, burst=2))
+    monkeypatch.setattr(enquiry_intake, "phone_limiter", TokenBucketLimiter(rate_per_minute=1, burst=100))
+
+    def send(visitor, number):
+        # Every request arrives from the same proxy peer; the proxy appends the visitor
+        return client.post(
+            "/api/enquiries/",
+            json={"name": "Visitor", "phone": f"98765{number:05d}", "message": f"Quote {visitor} {number}"},
+            headers={"X-Forwarded-For": f"6.6.6.6, {visitor}"},
+        )
+
+    assert [send("203.0.113.7", n).status_code for n in range(3)] == [202, 202, 429]
+    assert send("198.51.100.9", 3).status_code == 202
@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("PIL", "httpx", "reportlab", "jose", "passlib")
+
+
+def test_importing_the_app_skips_heavy_optional_modules(tmp_path):
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/cold.db"}
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=backend, env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1:] in ([], [""])
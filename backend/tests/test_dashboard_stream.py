@@ -0,0 +1,16 @@
+import asyncio
+
+from app.core.database import SessionLocal
+from app.core.security import create_access_token, get_stream_user
+
+
+def test_stream_requires_a_token(client):
+    assert client.get("/api/dashboard/stream").status_code == 401
+    assert client.get("/api/dashboard/stream", params={"access_token": "not-a-jwt"}).status_code == 401
+
+
+def test_stream_accepts_the_token_in_the_query_string(admin_user):
+    token = create_access_token({"sub": str(admin_user.id)})
+    with SessionLocal() as db:
+        user = asyncio.run(get_stream_user(access_token=token, credentials=None, db=db))
+    assert user.id == admin_user.id
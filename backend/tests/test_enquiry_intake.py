@@ -0,0 +1,73 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Enquiry
+from app.services import enquiry_intake as intake_module
+from app.services.enquiry_intake import EnquiryIntake
+
+
+def make_row(**overrides):
+    now = datetime.now(timezone.utc)
+    row = {
+        "id": uuid4(), "name": "Visitor", "email": None, "phone": "9876543210", "company": None,
+        "subject": None, "message": "Need a quote", "product_id": None, "status": "new",
+        "notes": None, "created_at": now, "updated_at": now,
+    }
+    row.update(overrides)
+    return row
+
+
+def stored(ids) -> set:
+    with SessionLocal() as db:
+        return {row[0] for row in db.query(Enquiry.id).filter(Enquiry.id.in_(ids))}
+
+
+def test_rejected_row_is_dead_lettered_and_the_rest_stored(client, tmp_path, monkeypatch):
+    dead_letters = tmp_path / "dead.jsonl"
+    monkeypatch.setattr(settings, "ENQUIRY_DEAD_LETTER_PATH", str(dead_letters))
+    rows = [make_row() for _ in range(5)]
+    rows[2]["message"] = None  # violates NOT NULL
+
+    asyncio.run(EnquiryIntake()._write(rows))
+
+    good = [row["id"] for index, row in enumerate(rows) if index != 2]
+    assert stored([row["id"] for row in rows]) == set(good)
+    letters = [json.loads(line) for line in dead_letters.read_text().splitlines()]
+    assert [letter["row"]["id"] for letter in letters] == [str(rows[2]["id"])]
+    assert letters[0]["error"].startswith("IntegrityError")
+
+
+def test_transient_errors_retry_the_same_batch(client, monkeypatch):
+    calls = []
+    real_insert = intake_module.insert_enquiries
+
+    def flaky_insert(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, Exception("connection refused"))
+        real_insert(rows)
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(intake_module, "insert_enquiries", flaky_insert)
+    monkeypatch.setattr(intake_module.asyncio, "sleep", no_sleep)
+    rows = [make_row() for _ in range(3)]
+
+    asyncio.run(EnquiryIntake()._write(rows))
+
+    assert calls == [3, 3]
+    assert stored([row["id"] for row in rows]) == {row["id"] for row in rows}
+
+
+def test_overlong_phone_is_rejected_up_front(client):
+    response = client.post("/api/enquiries/", json={
+        "name": "Visitor", "phone": "9" * 21, "message": "Hello"
+    })
+    assert response.status_code == 422
@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from app.api import reports
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Job
+from app.services.jobs import JobFailed, enqueue, job_handler
+
+release = threading.Event()
+calls = {}
+
+
+@job_handler("test_progress")
+def progress_job(job) -> dict:
+    job.progress(50, "halfway")
+    release.wait(5)
+    job.attach(b"report", "report.txt", "text/plain")
+    return {"done": True}
+
+
+@job_handler("test_flaky")
+def flaky_job(job) -> dict:
+    calls[job.job_id] = calls.get(job.job_id, 0) + 1
+    if job.attempt == 1:
+        raise RuntimeError("database went away")
+    return {"attempt": job.attempt}
+
+
+@job_handler("test_rejected")
+def rejected_job(job) -> dict:
+    raise JobFailed("nothing to do")
+
+
+def job_state(job_id) -> Job:
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        db.expunge(job)
+        return job
+
+
+def wait_for(job_id, predicate, timeout: float = 5) -> Job:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = job_state(job_id)
+        if predicate(job) or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def submit(kind: str, **options):
+    with SessionLocal() as db:
+        return enqueue(db, kind, **options).id
+
+
+@pytest.fixture
+def workers(client, monkeypatch):
+    """The app's worker pool (started with the client) with instant retries"""
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 0)
+    release.clear()
+    yield
+    release.set()
+
+
+def test_job_is_claimed_reports_progress_and_completes(workers):
+    job_id = submit("test_progress")
+
+    running = wait_for(job_id, lambda job: job.progress == 50)
+    assert (running.status, running.attempts, running.progress_message) == ("running", 1, "halfway")
+    assert running.locked_by is not None
+
+    release.set()
+    done = wait_for(job_id, lambda job: job.status == "succeeded")
+    assert (done.status, done.progress, done.result) == ("succeeded", 100, {"done": True})
+    assert (done.artifact_name, done.locked_by) == ("report.txt", None)
+
+
+def test_failed_attempt_is_retried(workers):
+    job_id = submit("test_flaky", max_attempts=2)
+
+    done = wait_for(job_id, lambda job: job.status in ("succeeded", "failed"))
+
+    assert (done.status, done.attempts, done.result) == ("succeeded", 2, {"attempt": 2})
+    assert calls[job_id] == 2
+
+
+def test_job_fails_once_attempts_run_out_or_the_handler_gives_up(workers):
+    flaky_id = submit("test_flaky", max_attempts=1)
+    rejected_id = submit("test_rejected", max_attempts=3)
+
+    flaky = wait_for(flaky_id, lambda job: job.status == "failed")
+    rejected = wait_for(rejected_id, lambda job: job.status == "failed")
+
+    assert (flaky.status, flaky.attempts, flaky.error) == ("failed", 1, "RuntimeError: database went away")
+    assert (rejected.status, rejected.attempts, rejected.error) == ("failed", 1, "JobFailed: nothing to do")
+    assert rejected.finished_at is not None
+
+
+def test_ageing_export_reports_progress(workers, monkeypatch):
+    monkeypatch.setattr(reports, "AGEING_CSV_CHUNK_ROWS", 1)
+    with SessionLocal() as db:
+        rows = len(db.execute(reports._ageing_query(date(2026, 1, 1))).all())
+
+    job_id = submit("ageing_export", payload={"as_of": "2026-01-01"})
+
+    done = wait_for(job_id, lambda job: job.status in ("succeeded", "failed"))
+    assert done.status == "succeeded"
+    assert done.progress_message == f"{rows}/{rows} customers written"
+    assert done.artifact_name == "ageing_2026-01-01.csv"
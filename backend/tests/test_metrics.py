@@ -0,0 +1,32 @@
+import uuid
+
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUESTS
+
+
+def routes() -> set:
+    return {labels[1] for labels in HTTP_REQUESTS._values}
+
+
+def test_metrics_need_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+
+def test_route_labels_stay_bounded(client, admin):
+    before = routes()
+    for _ in range(3):
+        token = uuid.uuid4().hex
+        client.get(f"/api/{token}")
+        client.get(f"/wp-admin/{token}.php")
+        client.get(f"/api/products/{uuid.uuid4().hex.upper()}")
+        client.get(f"/api/media/{token}")
+
+    assert routes() - before <= {"unmatched", "/api/products/{product_id}", "/api/media/{key}"}
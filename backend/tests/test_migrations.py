@@ -0,0 +1,79 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.api.reports import _ageing_query
+from app.core.database import Base
+from app.migrations.runner import upgrade, current_version, head_version
+from app.migrations.versions import m0001_baseline
+from app.models import Invoice
+
+# Tables the application created with create_all before rollups and migrations existed
+BASELINE_TABLES = ("users", "categories", "products", "customers", "invoices", "invoice_items", "offers", "enquiries")
+
+
+def assert_matches_models(engine):
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert inspector.has_table(table.name), table.name
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.c.keys()), table.name
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes, table.name
+
+
+def unpaid_due_sql(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE name = 'idx_invoices_unpaid_due'"
+        )).scalar()
+
+
+def test_unpaid_due_index_matches_the_ageing_report(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/migrate.db")
+    upgrade(engine)
+
+    assert "deleted_at IS NULL" in unpaid_due_sql(engine)
+    assert_matches_models(engine)
+
+    compiled = str(_ageing_query(date(2026, 1, 1)).compile(engine))
+    assert "count(*)" in compiled
+    assert f"count({Invoice.__tablename__}.id)" not in compiled
+
+
+def test_upgrades_a_database_created_by_the_baseline_code(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/baseline.db")
+    with engine.begin() as conn:
+        for name in BASELINE_TABLES:
+            m0001_baseline.metadata.tables[name].create(conn)
+        # The baseline models declared no named indexes
+        for name in BASELINE_TABLES:
+            for index in m0001_baseline.metadata.tables[name].indexes:
+                if index.name.startswith("idx_"):
+                    conn.execute(text(f"DROP INDEX {index.name}"))
+        customer_id, invoice_id = uuid.uuid4().hex, uuid.uuid4().hex
+        conn.execute(text(
+            "INSERT INTO customers (id, contact_person, phone) VALUES (:id, 'Ravi', '9876543210')"
+        ), {"id": customer_id})
+        conn.execute(text(
+            "INSERT INTO invoices (id, invoice_number, customer_id, invoice_date, subtotal, total_amount, status) "
+            "VALUES (:id, 'INV-1', :customer_id, '2026-01-10', 100, 100, 'pending')"
+        ), {"id": invoice_id, "customer_id": customer_id})
+    assert current_version(engine) == 0
+
+    assert upgrade(engine) == list(range(1, head_version() + 1))
+
+    assert current_version(engine) == head_version()
+    assert_matches_models(engine)
+    assert "deleted_at IS NULL" in unpaid_due_sql(engine)
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT version, deleted_at FROM invoices WHERE id = :id"), {"id": invoice_id}).one()
+        settings_rows = conn.execute(text("SELECT COUNT(*) FROM settings")).scalar()
+        monthly = conn.execute(text(
+            "SELECT invoice_count, billed_amount FROM revenue_rollups WHERE period = 'month'"
+        )).all()
+    assert tuple(row) == (1, None)
+    assert settings_rows > 0
+    # Invoices written before the rollups existed are counted on the dashboard
+    assert [tuple(r) for r in monthly] == [(1, 100)]
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.notification_stub import stub_gateway
+from app.services.notifications import NotificationDispatcher, StubTransport, message
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFY_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(settings, "NOTIFY_MAX_RETRIES", 3)
+    state = stub_gateway.state
+    state.sent, state.failure_rate, state.fail_next = [], 0.0, 0
+    yield state
+    state.failure_rate, state.failure_status, state.fail_next = 0.0, 503, 0
+
+
+def send(dispatcher, coroutine):
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            await dispatcher.close()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_throttled_and_failing_gateway(stub, status):
+    stub.failure_status, stub.fail_next = status, 2
+    dispatcher = NotificationDispatcher(StubTransport())
+
+    result = send(dispatcher, dispatcher.send(message("9876543210", "Invoice INV-1 is due")))
+
+    assert result["status"] == "sent"
+    assert result["attempts"] == 3
+    assert result["provider_id"].startswith("wamid.stub-")
+    assert len(stub.sent) == 1
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.fail_next = 10
+    dispatcher = NotificationDispatcher(StubTransport())
+
+    result = send(dispatcher, dispatcher.send(message("9876543210", "Hello")))
+
+    assert result["status"] == "failed"
+    assert result["attempts"] == settings.NOTIFY_MAX_RETRIES + 1
+    assert result["error"] == "HTTP 503"
+
+
+def test_bulk_send_reports_a_failing_recipient_and_sends_the_rest(stub):
+    dispatcher = NotificationDispatcher(StubTransport())
+    messages = [message(f"98765{n:05d}", f"Reminder {n}") for n in range(5)]
+    messages.insert(2, message("12", "Reminder to a bad number"))
+
+    summary = send(dispatcher, dispatcher.send_many(messages))
+
+    assert (summary["total"], summary["sent"], summary["failed"]) == (6, 5, 1)
+    assert summary["failures"][0]["to"] == "12"
+    assert summary["failures"][0]["attempts"] == 1
+    assert len(stub.sent) == 5
+
+
+class PlainTextTransport(StubTransport):
+    """A gateway that answers 200 with a body that is not JSON"""
+
+    def client_options(self) -> dict:
+        return {"transport": httpx.MockTransport(lambda request: httpx.Response(200, text="OK"))}
+
+    def url(self) -> str:
+        return "http://gateway/messages"
+
+
+def test_unexpected_provider_body_fails_the_message_without_raising(stub):
+    dispatcher = NotificationDispatcher(PlainTextTransport())
+
+    summary = send(dispatcher, dispatcher.send_many([message("9876543210", "Hello")] * 2))
+
+    assert (summary["sent"], summary["failed"]) == (0, 2)
+    assert all(failure["attempts"] == 1 for failure in summary["failures"])
+    assert "Unexpected response" in summary["failures"][0]["error"]
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from app.services import offer_schedule as schedule_module
+from app.services.offer_schedule import OfferSchedule, business_now, offer_schedule
+
+
+def test_passing_a_boundary_invalidates_cached_prices(monkeypatch):
+    now = business_now()
+    starts_at = now + timedelta(minutes=5)
+    schedule = OfferSchedule(reload_seconds=300)
+    schedule._offers = [(starts_at, None, {"id": "offer", "title": "Diwali"})]
+    schedule._rebuild(now)
+    invalidated = []
+
+    async def invalidate(*namespaces):
+        invalidated.append(namespaces)
+
+    monkeypatch.setattr(schedule_module.cache, "invalidate", invalidate)
+    assert asyncio.run(schedule.active()) == []
+    assert invalidated == []
+
+    monkeypatch.setattr(schedule_module, "business_now", lambda: starts_at + timedelta(seconds=1))
+    assert asyncio.run(schedule.active()) == [{"id": "offer", "title": "Diwali"}]
+    assert invalidated == [("products", "offers")]
+
+    # Nothing further to pass
+    asyncio.run(schedule.active())
+    assert invalidated == [("products", "offers")]
+
+
+def test_offer_edits_are_live_when_the_response_arrives(client, admin, monkeypatch):
+    deadline = time.monotonic() + 2
+    while offer_schedule._offers is None and time.monotonic() < deadline:
+        time.sleep(0.01)  # the startup load
+    loads = []
+    real_load = OfferSchedule._load
+
+    def counting_load(self):
+        loads.append(1)
+        real_load(self)
+
+    monkeypatch.setattr(OfferSchedule, "_load", counting_load)
+    offer = client.post("/api/offers/", json={"title": "Pongal sale"}).json()
+
+    assert offer["id"] in [live["id"] for live in client.get("/api/offers/active").json()]
+    assert len(loads) == 1
+
+    client.patch(f"/api/offers/{offer['id']}/toggle")
+    assert offer["id"] not in [live["id"] for live in client.get("/api/offers/active").json()]
+    assert len(loads) == 2
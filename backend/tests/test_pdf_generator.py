@@ -0,0 +1,32 @@
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.services.pdf_generator import generate_invoice_pdf, generate_statement_pdf
+
+CUSTOMER = SimpleNamespace(
+    contact_person="Ravi <Ravi & Sons>", company_name="R&D Tools", address="12 <b>Main Road",
+    city="Karur", state="TN", pincode="639001", phone="9876543210", gst_number="33ABC<1>",
+)
+
+
+def test_invoice_pdf_renders_markup_characters_as_text():
+    item = SimpleNamespace(description="Bolt <M8> & nut", quantity=Decimal("2"), unit="pc",
+                           unit_price=Decimal("10"), amount=Decimal("20"))
+    invoice = SimpleNamespace(
+        invoice_number="INV-1", invoice_date=date(2026, 1, 1), due_date=None, status="pending",
+        items=[item], subtotal=Decimal("20"), tax_rate=Decimal("0"), tax_amount=Decimal("0"),
+        discount_amount=Decimal("0"), total_amount=Decimal("20"),
+        notes="Deliver to <gate 2> & call", terms="Pay within 30 days <strict>",
+    )
+
+    assert generate_invoice_pdf(invoice, CUSTOMER).getvalue().startswith(b"%PDF")
+
+
+def test_statement_pdf_renders_markup_characters_as_text():
+    statement = {
+        "from": None, "to": None, "opening_balance": 0.0, "lines": [],
+        "total_debit": 0.0, "total_credit": 0.0, "closing_balance": 0.0,
+    }
+
+    assert generate_statement_pdf(statement, CUSTOMER).getvalue().startswith(b"%PDF")
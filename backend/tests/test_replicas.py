@@ -0,0 +1,80 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.replicas import ReplicaRouter, ReadYourWritesMiddleware, client_key
+from app.models import Category
+
+
+def make_router(tmp_path, replica_url: str = None) -> ReplicaRouter:
+    primary = create_engine(f"sqlite:///{tmp_path}/primary.db")
+    replica = create_engine(replica_url or f"sqlite:///{tmp_path}/replica.db")
+    return ReplicaRouter(primary, [replica], max_lag=5, check_interval=0.05, read_your_writes=60)
+
+
+def token() -> str:
+    return client_key(f"Bearer {uuid4().hex}")
+
+
+def test_writer_is_pinned_to_the_primary_in_every_worker(tmp_path):
+    worker, other_worker = make_router(tmp_path), make_router(tmp_path)
+    writer, reader = token(), token()
+
+    async def scenario():
+        assert await worker.engine_for_read(writer) is worker.replicas[0].engine
+        await worker.note_write(writer)
+        assert await worker.engine_for_read(writer) is worker.primary
+        # The marker lives in the shared cache, not in the worker that took the write
+        assert await other_worker.engine_for_read(writer) is other_worker.primary
+        assert await other_worker.engine_for_read(reader) is other_worker.replicas[0].engine
+
+    asyncio.run(scenario())
+
+
+def test_unreachable_replica_is_dropped_by_the_background_check(tmp_path):
+    router = make_router(tmp_path, "sqlite:////nonexistent/dir/replica.db")
+
+    async def scenario():
+        await router.start()
+        try:
+            deadline = time.monotonic() + 2
+            while router.replicas[0].healthy and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            assert await router.engine_for_read(token()) is router.primary
+            assert router.status()[0]["healthy"] is False
+        finally:
+            await router.stop()
+
+    asyncio.run(scenario())
+
+
+def test_committed_write_pins_the_client_before_the_response(client, tmp_path):
+    router = make_router(tmp_path)
+    api = FastAPI()
+    api.add_middleware(ReadYourWritesMiddleware, router=router)
+
+    @api.post("/write")
+    async def write(db: Session = Depends(get_db)):
+        db.add(Category(name="Pinned", slug=f"pinned-{uuid4().hex[:8]}"))
+        db.commit()
+        return {}
+
+    @api.post("/read")
+    async def read(db: Session = Depends(get_db)):
+        db.query(Category).first()
+        db.commit()
+        return {}
+
+    writer, reader = f"Bearer {uuid4().hex}", f"Bearer {uuid4().hex}"
+    with TestClient(api) as test_client:
+        test_client.post("/write", headers={"Authorization": writer})
+        test_client.post("/read", headers={"Authorization": reader})
+
+    assert asyncio.run(router.wrote_recently(client_key(writer)))
+    assert not asyncio.run(router.wrote_recently(client_key(reader)))
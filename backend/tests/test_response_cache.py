@@ -0,0 +1,93 @@
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Product
+
+
+@pytest.fixture
+def products(client, admin):
+    category = client.post("/api/categories/", json={"name": "Cache", "slug": f"cache-{uuid4().hex[:8]}"}).json()
+    created = [
+        client.post("/api/products/", json={
+            "name": f"Cached {i}", "slug": f"cached-{uuid4().hex[:8]}", "price": "100.00",
+            "category_id": category["id"],
+        }).json()
+        for i in range(3)
+    ]
+    client.portal.call(cache.invalidate, "products")
+    return created
+
+
+def burst(client, path: str, count: int, params=None) -> list:
+    """Send count identical GETs concurrently on the app's event loop"""
+    async def send():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(http.get(path, params=params) for _ in range(count)))
+    return client.portal.call(send)
+
+
+def test_concurrent_cold_misses_run_one_query(client, products, count_queries):
+    product_queries = count_queries("FROM products")
+
+    responses = burst(client, "/api/products/", 20, params={"limit": 50})
+
+    assert {response.status_code for response in responses} == {200}
+    assert {response.headers["x-cache"] for response in responses} == {"MISS"}
+    assert len({response.content for response in responses}) == 1
+    assert product_queries() == 1
+
+
+def test_query_order_shares_an_entry(client, products, count_queries):
+    product_queries = count_queries("FROM products")
+
+    assert client.get("/api/products/?limit=50&skip=0").headers["x-cache"] == "MISS"
+    assert client.get("/api/products/?skip=0&limit=50").headers["x-cache"] == "HIT"
+    assert product_queries() == 1
+
+
+def test_write_invalidates(client, products, admin):
+    client.get("/api/products/")
+    client.put(f"/api/products/{products[0]['id']}", json={"name": "Renamed"})
+
+    response = client.get("/api/products/")
+    assert response.headers["x-cache"] == "MISS"
+    assert "Renamed" in response.text
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(client, products, count_queries, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_TTL_SECONDS", 0.2)
+    product_queries = count_queries("FROM products")
+    first = client.get("/api/products/")
+    assert first.headers["x-cache"] == "MISS"
+
+    # Change the data behind the cache's back, then let the entry go stale
+    with SessionLocal() as db:
+        db.query(Product).filter(Product.id == UUID(products[0]["id"])).update({"name": "Edited directly"})
+        db.commit()
+    time.sleep(0.3)
+
+    stale = burst(client, "/api/products/", 10)
+    assert {response.headers["x-cache"] for response in stale} == {"STALE"}
+    assert {response.content for response in stale} == {first.content}
+
+    deadline = time.monotonic() + 2
+    while product_queries() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    refreshed = client.get("/api/products/")
+    assert refreshed.headers["x-cache"] == "HIT"
+    assert "Edited directly" in refreshed.text
+    assert product_queries() == 2
+
+
+def test_uncached_reads_do_not_invalidate(client):
+    before = client.portal.call(cache.generation, "offers")
+    client.get("/api/offers/active")
+    assert client.portal.call(cache.generation, "offers") == before
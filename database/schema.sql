@@ -1,6 +1,11 @@
 -- =====================================================
 -- NELLUSORU MANUFACTURERS AND SERVICES
 -- Database Schema for Supabase (PostgreSQL)
+--
+-- Reference schema. The backend tracks its own schema version in the
+-- schema_version table and applies changes from backend/app/migrations
+-- (indexes and triggers are declared on the ORM models). After loading
+-- this file, run `python -m app.migrations upgrade` from backend/.
 -- =====================================================
 
 -- Enable UUID extension
@@ -53,6 +58,7 @@ CREATE TABLE products (
     description TEXT,
     specifications TEXT,
     image_url VARCHAR(500),
+    image_variants JSONB,
     price DECIMAL(12, 2),
     unit VARCHAR(50),
     min_order_quantity INTEGER DEFAULT 1,
@@ -84,6 +90,7 @@ CREATE TABLE customers (
     gst_number VARCHAR(20),
     notes TEXT,
     is_active BOOLEAN DEFAULT TRUE,
+    deleted_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -91,6 +98,7 @@ CREATE TABLE customers (
 -- Create indexes
 CREATE INDEX idx_customers_phone ON customers(phone);
 CREATE INDEX idx_customers_email ON customers(email);
+CREATE INDEX idx_customers_live_created ON customers(created_at) WHERE deleted_at IS NULL;
 
 -- =====================================================
 -- INVOICES TABLE
@@ -110,15 +118,24 @@ CREATE TABLE invoices (
     notes TEXT,
     terms TEXT,
     created_by UUID REFERENCES users(id),
+    version INTEGER NOT NULL DEFAULT 1,
+    deleted_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create indexes
 CREATE INDEX idx_invoices_number ON invoices(invoice_number);
-CREATE INDEX idx_invoices_customer ON invoices(customer_id);
+-- Composite index also serves plain customer_id lookups
+CREATE INDEX idx_invoices_customer_date ON invoices(customer_id, invoice_date);
 CREATE INDEX idx_invoices_date ON invoices(invoice_date);
 CREATE INDEX idx_invoices_status ON invoices(status);
+-- Partial covering index for the receivables ageing report
+CREATE INDEX idx_invoices_unpaid_due ON invoices(customer_id, due_date)
+    INCLUDE (invoice_date, total_amount)
+    WHERE status = 'pending' AND deleted_at IS NULL;
+-- Soft-deleted rows are skipped by every default listing
+CREATE INDEX idx_invoices_live_created ON invoices(created_at) WHERE deleted_at IS NULL;
 
 -- =====================================================
 -- INVOICE ITEMS TABLE
@@ -159,6 +176,16 @@ CREATE TABLE offers (
 -- Create index
 CREATE INDEX idx_offers_active ON offers(is_active) WHERE is_active = TRUE;
 
+-- Categories and products an offer's discount applies to
+CREATE TABLE offer_targets (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    offer_id UUID NOT NULL REFERENCES offers(id) ON DELETE CASCADE,
+    category_id UUID REFERENCES categories(id) ON DELETE CASCADE,
+    product_id UUID REFERENCES products(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_offer_targets_offer ON offer_targets(offer_id);
+
 -- =====================================================
 -- CONTACT ENQUIRIES TABLE
 -- =====================================================
@@ -173,6 +200,7 @@ CREATE TABLE enquiries (
     product_id UUID REFERENCES products(id) ON DELETE SET NULL,
     status VARCHAR(50) DEFAULT 'new',
     notes TEXT,
+    deleted_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -180,6 +208,7 @@ CREATE TABLE enquiries (
 -- Create indexes
 CREATE INDEX idx_enquiries_status ON enquiries(status);
 CREATE INDEX idx_enquiries_created ON enquiries(created_at);
+CREATE INDEX idx_enquiries_live_created ON enquiries(created_at) WHERE deleted_at IS NULL;
 
 -- =====================================================
 -- BUSINESS SETTINGS TABLE
@@ -192,6 +221,39 @@ CREATE TABLE settings (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- =====================================================
+-- ANALYTICS ROLLUP TABLES
+-- Maintained incrementally by the invoices API
+-- period is one of 'day', 'week', 'month'
+-- =====================================================
+CREATE TABLE revenue_rollups (
+    period VARCHAR(10) NOT NULL,
+    bucket_start DATE NOT NULL,
+    invoice_count INTEGER NOT NULL DEFAULT 0,
+    billed_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    paid_count INTEGER NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, bucket_start)
+);
+
+CREATE TABLE customer_revenue_rollups (
+    period VARCHAR(10) NOT NULL,
+    bucket_start DATE NOT NULL,
+    customer_id UUID NOT NULL,
+    invoice_count INTEGER NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, bucket_start, customer_id)
+);
+
+CREATE TABLE product_revenue_rollups (
+    period VARCHAR(10) NOT NULL,
+    bucket_start DATE NOT NULL,
+    product_id UUID NOT NULL,
+    quantity DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, bucket_start, product_id)
+);
+
 -- =====================================================
 -- TRIGGERS FOR UPDATED_AT
 -- =====================================================
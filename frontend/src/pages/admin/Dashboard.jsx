@@ -4,6 +4,13 @@ import { FiPackage, FiUsers, FiFileText, FiMessageSquare, FiTag, FiTrendingUp, F
 import { dashboardService } from '../../services/api';
 import { formatCurrency, formatDate, getStatusColor } from '../../utils/helpers';
 
+const RECENT_LIMIT = 5;
+
+// Newest first, replacing any earlier copy of the same row
+const upsert = (rows, row) => [row, ...rows.filter((item) => item.id !== row.id)].slice(0, RECENT_LIMIT);
+const replace = (rows, row) => rows.map((item) => (item.id === row.id ? row : item));
+const remove = (rows, row) => rows.filter((item) => item.id !== row.id);
+
 const Dashboard = () => {
   const [stats, setStats] = useState(null);
   const [recentInvoices, setRecentInvoices] = useState([]);
@@ -11,23 +18,41 @@ const Dashboard = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    const fetchDashboardData = async () => {
+    // A snapshot arrives first (and again after the server asks for a resync),
+    // then incremental events; EventSource reconnects on its own
+    const source = dashboardService.stream();
+    const on = (event, handler) => source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+
+    on('snapshot', (data) => {
+      setStats(data.stats);
+      setRecentInvoices(data.recent_invoices);
+      setRecentEnquiries(data.recent_enquiries);
+      setLoading(false);
+    });
+    on('stats', setStats);
+    on('invoice.created', (invoice) => setRecentInvoices((rows) => upsert(rows, invoice)));
+    on('invoice.updated', (invoice) => setRecentInvoices((rows) => replace(rows, invoice)));
+    on('invoice.deleted', (invoice) => setRecentInvoices((rows) => remove(rows, invoice)));
+    on('enquiry.created', (enquiry) => setRecentEnquiries((rows) => upsert(rows, enquiry)));
+    on('enquiry.updated', (enquiry) => setRecentEnquiries((rows) => replace(rows, enquiry)));
+    on('enquiry.deleted', (enquiry) => setRecentEnquiries((rows) => remove(rows, enquiry)));
+
+    // The stream was refused (e.g. an expired token): load the dashboard once instead
+    source.onerror = async () => {
+      if (source.readyState !== EventSource.CLOSED) return;
       try {
-        const [statsRes, invoicesRes, enquiriesRes] = await Promise.all([
-          dashboardService.getStats(),
-          dashboardService.getRecentInvoices(),
-          dashboardService.getRecentEnquiries()
-        ]);
-        setStats(statsRes.data);
-        setRecentInvoices(invoicesRes.data);
-        setRecentEnquiries(enquiriesRes.data);
+        const [statsData, invoicesData, enquiriesData] = await dashboardService.getAll();
+        setStats(statsData);
+        setRecentInvoices(invoicesData);
+        setRecentEnquiries(enquiriesData);
       } catch (error) {
         console.error('Error fetching dashboard data:', error);
       } finally {
         setLoading(false);
       }
     };
-    fetchDashboardData();
+
+    return () => source.close();
   }, []);
 
   const statCards = stats ? [
@@ -43,10 +43,34 @@ export const authService = {
   me: () => api.get('/auth/me'),
 };
 
+// Several GETs in one round-trip; resolves to the response bodies in order
+// and rejects with the first failed sub-request's status and body.
+export const batchService = {
+  get: async (requests) => {
+    const response = await api.post('/batch/', {
+      requests: requests.map((request, index) =>
+        typeof request === 'string'
+          ? { id: String(index), path: `/api${request}` }
+          : { id: String(index), path: `/api${request.path}`, params: request.params || {} }
+      ),
+    });
+    const failed = response.data.responses.find((result) => result.status >= 400);
+    if (failed) {
+      return Promise.reject({ response: { status: failed.status, data: failed.body } });
+    }
+    return response.data.responses.map((result) => result.body);
+  },
+};
+
 export const dashboardService = {
   getStats: () => api.get('/dashboard/stats'),
   getRecentInvoices: () => api.get('/dashboard/recent-invoices'),
   getRecentEnquiries: () => api.get('/dashboard/recent-enquiries'),
+  getAll: () => batchService.get(['/dashboard/stats', '/dashboard/recent-invoices', '/dashboard/recent-enquiries']),
+  // Server-sent events; EventSource cannot send the Authorization header, so the token goes in the query
+  stream: () => new EventSource(
+    `${api.defaults.baseURL}/dashboard/stream?access_token=${encodeURIComponent(localStorage.getItem('token') || '')}`
+  ),
 };
 
 export const categoryService = {